@@ -0,0 +1,38 @@
+# ==============================================================================
+# COVID_EDA - PIPELINE DE ANÁLISIS EXPLORATORIO COVID-19
+# Etapas independientes: fetch → transform → analyze → render → report
+# ==============================================================================
+"""
+Paquete reutilizable del análisis exploratorio COVID-19.
+
+Importar el paquete no ejecuta nada: no descarga datos, no escribe archivos y
+no importa matplotlib, seaborn, plotly, scipy ni requests. Cada etapa importa
+sus dependencias pesadas sólo cuando se ejecuta.
+
+Uso desde la línea de comandos::
+
+    python -m covid_eda                          # pipeline completo
+    python -m covid_eda --stages transform       # sólo transformación
+    python -m covid_eda --stages render --figures temporal_evolution
+"""
+
+from covid_eda.fetch import get_covid_data
+from covid_eda.transform import process_us_data, process_states_data, load_clean_data
+from covid_eda.analyze import detect_outliers_iqr, detect_outliers_zscore, analyze_skewness
+from covid_eda.outliers import detect_outliers
+from covid_eda.anomalies import detect_anomalies
+from covid_eda.pipeline import STAGES, run_pipeline
+
+__all__ = [
+    'get_covid_data',
+    'process_us_data',
+    'process_states_data',
+    'load_clean_data',
+    'detect_outliers_iqr',
+    'detect_outliers_zscore',
+    'detect_outliers',
+    'detect_anomalies',
+    'analyze_skewness',
+    'STAGES',
+    'run_pipeline',
+]
@@ -0,0 +1,5 @@
+import sys
+
+from covid_eda.cli import main
+
+sys.exit(main())
@@ -0,0 +1,122 @@
+# ==============================================================================
+# ETAPA ANALYZE - OUTLIERS, ANOMALÍAS, ASIMETRÍA Y ESTADÍSTICAS FINALES
+# ==============================================================================
+#
+# La detección de outliers de varias columnas va por el motor vectorizado de
+# covid_eda/outliers.py (y la de anomalías de las series diarias por
+# covid_eda/anomalies.py); detect_outliers_iqr / detect_outliers_zscore quedan
+# como atajos para una sola serie. Los reportes de consola imprimen el resumen
+# estadístico de covid_eda/summary.py, el mismo que lee el informe PDF.
+
+from covid_eda.outliers import detect_outliers
+
+
+def detect_outliers_iqr(data):
+    """
+    Detectar outliers con el método del rango intercuartílico (IQR)
+
+    Args:
+        data (pd.Series): Serie numérica a analizar
+
+    Returns:
+        tuple: (outliers, lower_bound, upper_bound)
+    """
+    masks, stats = detect_outliers(data.to_frame('value'), methods=('iqr',))
+    bounds = stats.loc['value']
+    return data[masks[('iqr', 'value')]], bounds['iqr_lower'], bounds['iqr_upper']
+
+
+def detect_outliers_zscore(data, threshold=2):
+    """Detectar outliers con Z-score (|z| > threshold)"""
+    masks, _ = detect_outliers(data.to_frame('value'), methods=('zscore',), z_threshold=threshold)
+    return data[masks[('zscore', 'value')]]
+
+
+def analyze_skewness(data):
+    """
+    Calcular la asimetría de una serie y describirla
+
+    Returns:
+        tuple: (skew, descripción en texto)
+    """
+    from scipy import stats
+
+    skew = stats.skew(data.dropna())
+    if abs(skew) < 0.5:
+        skew_desc = "aproximadamente simétrica"
+    elif skew > 0.5:
+        skew_desc = "asimétrica hacia la derecha"
+    else:
+        skew_desc = "asimétrica hacia la izquierda"
+    return skew, skew_desc
+
+
+def print_outlier_report(summary):
+    """Imprimir el reporte detallado de outliers y asimetría por estados (ver covid_eda.summary)"""
+    states = summary.get('states') if summary else None
+    if not states:
+        return
+
+    print("\n🔍 REPORTE DETALLADO DE OUTLIERS")
+    print("=" * 60)
+
+    sections = [
+        ('cases_per_100k', '📈 CASOS PER CÁPITA'),
+        ('deaths_per_100k', '💀 MUERTES PER CÁPITA'),
+    ]
+    distributions = states['distributions']
+    for column, title in sections:
+        if column not in distributions:
+            continue
+        stats = distributions[column]
+        mean, median = stats['mean'], stats['median']
+        outlier_states = stats['outliers_iqr']
+
+        print(f"\n{title}:")
+        print(f"   • Media: {mean:.1f}")
+        print(f"   • Mediana: {median:.1f}")
+        print(f"   • Diferencia Media-Mediana: {abs(mean - median):.1f}")
+        print(f"   • Outliers (IQR): {len(outlier_states)} estados")
+        print(f"   • Outliers (Z-score > 2): {len(stats['outliers_zscore'])} estados")
+
+        if outlier_states:
+            print(f"   • Estados outliers: {', '.join(outlier_states[:5])}")
+
+    print(f"\n📊 ANÁLISIS DE ASIMETRÍA:")
+    for column, stats in distributions.items():
+        print(f"   • Asimetría {column}: {stats['skew']:.3f} ({stats['skew_desc']})")
+
+
+def print_anomaly_report(summary, limit=5):
+    """Imprimir las anomalías de las series diarias nacionales (ver covid_eda.anomalies)"""
+    national = summary.get('national') if summary else None
+    anomalies = national.get('anomalies') if national else None
+    if not anomalies:
+        return
+
+    print("\n🚨 ANOMALÍAS EN LAS SERIES DIARIAS (EE.UU.)")
+    print("=" * 60)
+    for column, counts in anomalies['counts'].items():
+        print(f"   • {column}: " + ', '.join(f"{method} {n}" for method, n in counts.items()))
+    for row in anomalies['top'][:limit]:
+        print(f"   • {row['date']} {row['column']}: {row['value']:,.0f} "
+              f"(esperado {row['expected'] or 0:,.0f}, z = {row['score']:+.1f}, {row['method']})")
+    for row in anomalies['change_points']:
+        if row['column'] == 'new_cases':
+            print(f"   • Cambio de nivel {row['date']}: {row['expected']:,.0f} → {row['value']:,.0f} casos/día")
+
+
+def print_final_summary(summary):
+    """Imprimir las estadísticas finales del análisis (ver covid_eda.summary)"""
+    national = summary.get('national') if summary else None
+    states = summary.get('states') if summary else None
+    if not national or not states:
+        return
+
+    print(f"\n📈 ESTADÍSTICAS FINALES:")
+    print(f"   • Casos totales EE.UU.: {national['total_cases']:,}")
+    print(f"   • Muertes totales EE.UU.: {national['total_deaths']:,}")
+    print(f"   • Tasa de letalidad final: {national['fatality_rate']:.2f}%")
+    print(f"   • Estados analizados: {states['count']}")
+    print(f"   • Estado más afectado: {states['most_affected']['state']}")
+    print(f"   • Período analizado: {national['start_date']} a {national['end_date']}")
@@ -0,0 +1,328 @@
+# ==============================================================================
+# MOTOR DE ANOMALÍAS EN SERIES DIARIAS - PICOS, CORRECCIONES Y CAMBIOS DE NIVEL
+# ==============================================================================
+#
+# covid_eda.outliers compara estados entre sí (una foto); aquí se revisa cada
+# serie diaria (new_cases, new_deaths) frente a su propio pasado:
+#
+#   negative       correcciones: días con variación negativa del acumulado
+#   rolling_z      Z-score robusto (filtro de Hampel): mediana y MAD de la
+#                  ventana de ROLLING_WINDOW días centrada en cada día. Una
+#                  subida sostenida (el inicio de una ola) desplaza la mediana
+#                  con ella; un pico aislado, no
+#   seasonal       residuo de una descomposición al estilo STL con ciclo
+#                  semanal: tendencia (mediana de los 6 vecinos de la semana
+#                  centrada, primero de la serie y después de la serie
+#                  desestacionalizada) + patrón semanal (mediana del mismo
+#                  día de la semana en las SEASONAL_WEEKS semanas de cada
+#                  lado) + residuo. Los estados que sólo publican unos días a
+#                  la semana no generan falsos picos, y junto a un cambio de
+#                  nivel cada día se compara con los de su lado del salto
+#   change_point   cambios de nivel: medias de log(1 + casos) en las
+#                  CHANGE_WINDOW jornadas anteriores y posteriores a cada día;
+#                  se marca el máximo local de cada salto suficientemente grande
+#
+# Las series se colocan en una matriz (serie x día de calendario) rellenada
+# con NaN, y cada estadístico de ventana es una reducción de NumPy sobre una
+# vista deslizante, sin bucles por región ni por día. Las regiones se procesan
+# por bloques de ANOMALY_BLOCK elementos de ventana como mucho, así que la
+# memoria no crece con el número de regiones.
+
+import numpy as np
+import pandas as pd
+
+from covid_eda.outliers import MAD_SCALE, _sorted_quantiles
+
+METHODS = ('negative', 'rolling_z', 'seasonal', 'change_point')
+ANOMALY_COLUMNS = ('new_cases', 'new_deaths')
+
+ROLLING_WINDOW = 28          # días de la ventana centrada con la que se compara cada día
+ROLLING_Z = 6.0              # umbral de |z| robusto
+SEASONAL_PERIOD = 7          # ciclo semanal de publicación
+SEASONAL_WEEKS = 4           # semanas a cada lado para el patrón de cada día de la semana
+SEASONAL_Z = 6.0             # umbral de |z| del residuo
+CHANGE_WINDOW = 14           # días a cada lado del cambio de nivel (múltiplo del ciclo)
+CHANGE_RATIO = 2.0           # el nivel medio se multiplica o divide al menos por esto
+CHANGE_T = 4.0               # y el salto es significativo (t de las dos ventanas)
+ANOMALY_BLOCK = 2 ** 21      # elementos por vista deslizante de un bloque (16 MB en float64)
+
+MEAN_AD_SCALE = 1.2533       # desviación media absoluta -> desviación típica bajo normalidad
+
+# Columnas del resultado (además de la de grupo)
+FLAG_COLUMNS = ['date', 'column', 'method', 'value', 'expected', 'score', 'direction']
+
+
+# ==============================================================================
+# NÚCLEO VECTORIZADO
+# ==============================================================================
+
+def _windows(values, window, before, after):
+    """
+    Vista deslizante (series, días, window): la ventana del día t empieza en
+    t - before; lo que cae fuera de la serie es NaN
+    """
+    padded = np.pad(values, ((0, 0), (before, after)), constant_values=np.nan)
+    return np.lib.stride_tricks.sliding_window_view(padded, window, axis=-1)[:, :values.shape[1]]
+
+
+def _nanmean(windows, count=None):
+    """Media de cada ventana ignorando NaN (NaN si está vacía), sin los avisos de np.nanmean"""
+    valid = ~np.isnan(windows)
+    count = valid.sum(axis=-1) if count is None else count
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(valid, windows, 0).sum(axis=-1) / count
+
+
+def _robust_location(windows, min_count):
+    """
+    Mediana y escala robusta de cada ventana (último eje), ignorando NaN
+
+    La escala es la MAD normalizada; si es 0 (p.ej. semanas de ceros con un
+    único día de publicación) se usa la desviación media absoluta, como en el
+    Z-score modificado. Sin min_count valores: NaN.
+    """
+    count = (~np.isnan(windows)).sum(axis=-1)
+    median, = _sorted_quantiles(np.sort(windows, axis=-1), count, (0.5,))
+    deviation = np.abs(windows - median[..., None])
+    mad, = _sorted_quantiles(np.sort(deviation, axis=-1), count, (0.5,))
+    scale = np.where(mad > 0, MAD_SCALE * mad, MEAN_AD_SCALE * _nanmean(deviation, count))
+    enough = count >= min_count
+    return np.where(enough, median, np.nan), np.where(enough, scale, np.nan)
+
+
+def _z(residual, scale):
+    """residuo / escala, con 0 donde la escala es 0 o NaN (sin dispersión no hay anomalía)"""
+    out = np.zeros_like(residual)
+    np.divide(residual, scale, out=out, where=(scale > 0) & ~np.isnan(residual))
+    return out
+
+
+def _rolling(values, window=ROLLING_WINDOW):
+    """Mediana y escala de la ventana de `window` días centrada en cada día"""
+    return _robust_location(_windows(values, window, window // 2, window - 1 - window // 2), window // 2)
+
+
+def _centre_out(windows):
+    """Copia de ventanas centradas sin su valor central (lo esperado no depende del propio día)"""
+    windows = windows.copy()
+    windows[..., windows.shape[-1] // 2] = np.nan
+    return windows
+
+
+def _cycle(values, period=SEASONAL_PERIOD, weeks=SEASONAL_WEEKS):
+    """
+    Mismo día de la semana en las `weeks` semanas de cada lado (sin el propio día)
+
+    Returns:
+        np.ndarray: (series, días, 2 * weeks) con NaN fuera de la serie
+    """
+    days = values.shape[1]
+    cycle = np.full((2 * weeks,) + values.shape, np.nan)
+    shifts = [shift for shift in range(-weeks, weeks + 1) if shift != 0]
+    for layer, shift in enumerate(shifts):
+        offset = shift * period
+        if abs(offset) < days:
+            source = slice(max(offset, 0), days + min(offset, 0))
+            target = slice(max(-offset, 0), days - max(offset, 0))
+            cycle[layer, :, target] = values[:, source]
+    return np.moveaxis(cycle, 0, -1)
+
+
+def _seasonal(values, period=SEASONAL_PERIOD, weeks=SEASONAL_WEEKS, window=ROLLING_WINDOW):
+    """
+    Descomposición al estilo STL: tendencia + patrón semanal + residuo
+
+    Cada día se compara con lo que predicen sus vecinos: la tendencia y el
+    patrón se calculan sin el propio día, así un pico no se sube a sí mismo
+    (ni a los días de alrededor) lo esperado.
+
+    Returns:
+        tuple: (esperado = tendencia + patrón, escala robusta del residuo)
+    """
+    half = period // 2
+    trend, _ = _robust_location(_centre_out(_windows(values, period, half, half)), half + 1)
+
+    # Patrón: mediana del mismo día de la semana en las semanas de alrededor
+    cycle = _cycle(values - trend, period, weeks)
+    count = (~np.isnan(cycle)).sum(axis=-1)
+    seasonal, = _sorted_quantiles(np.sort(cycle, axis=-1), count, (0.5,))
+    seasonal = np.where(count >= weeks, seasonal, 0)
+
+    # Segunda pasada: tendencia de la serie sin el patrón semanal, con la mediana
+    # de la semana centrada (una media arrastraría hacia un pico a todos los
+    # días de su ventana) y, en un cambio de nivel, con la de los días del
+    # mismo lado del salto: se queda la más cercana al valor
+    deseasonalized = values - seasonal
+    windows = _centre_out(_windows(deseasonalized, period, half, half))
+    centred, _ = _robust_location(windows, half + 1)
+    residual = values - (centred + seasonal)
+    candidates = np.stack([centred,
+                           _robust_location(windows[..., :half], half)[0],
+                           _robust_location(windows[..., half + 1:], half)[0]], axis=-1)
+    distance = np.abs(deseasonalized[..., None] - candidates)
+    closest = np.argmin(np.where(np.isnan(distance), np.inf, distance), axis=-1)
+    expected = np.take_along_axis(candidates, closest[..., None], axis=-1)[..., 0] + seasonal
+
+    # Escala del residuo centrado: la de la ventana de `window` días o, si es
+    # mayor, la del mismo día de la semana (con publicación semanal, el residuo
+    # de los días con datos varía mucho más que el de los días a cero)
+    _, scale = _rolling(residual, window)
+    _, weekday_scale = _robust_location(_cycle(residual, period, weeks), weeks)
+    return expected, np.fmax(scale, weekday_scale)
+
+
+def _change_points(values, window=CHANGE_WINDOW, ratio=CHANGE_RATIO, t_threshold=CHANGE_T):
+    """
+    Cambios de nivel entre las `window` jornadas anteriores y las posteriores a cada día
+
+    Returns:
+        tuple: (máscara de cambios, nivel anterior, nivel posterior, t del salto)
+    """
+    logs = np.log1p(np.clip(values, 0, None))
+    before = _windows(logs, window, window, 0)
+    after = _windows(logs, window, 0, window - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        complete = ~(np.isnan(before).any(axis=-1) | np.isnan(after).any(axis=-1))
+        mean_before, mean_after = before.mean(axis=-1), after.mean(axis=-1)
+        pooled = np.sqrt((before.var(axis=-1, ddof=1) + after.var(axis=-1, ddof=1)) / window)
+        jump = mean_after - mean_before
+        t = _z(jump, pooled)
+    strength = np.where(complete & (np.abs(jump) >= np.log(ratio)) & (np.abs(t) >= t_threshold),
+                        np.abs(jump), 0)
+    # Un único día por cambio: el máximo local del salto dentro de ±window días
+    local_max = np.nanmax(_windows(strength, 2 * window + 1, window, window), axis=-1)
+    mask = (strength > 0) & (strength == local_max)
+    return mask, np.expm1(mean_before), np.expm1(mean_after), t
+
+
+def _detect_block(values, methods):
+    """
+    Anomalías de un bloque de series (series, días)
+
+    Returns:
+        dict: método -> (máscara, valor, esperado, score)
+    """
+    results = {}
+    if 'negative' in methods or 'rolling_z' in methods:
+        median, scale = _rolling(values)
+        score = _z(values - median, scale)
+        if 'negative' in methods:
+            results['negative'] = (values < 0, values, median, score)
+        if 'rolling_z' in methods:
+            results['rolling_z'] = (np.abs(score) > ROLLING_Z, values, median, score)
+    if 'seasonal' in methods:
+        expected, scale = _seasonal(values)
+        score = _z(values - expected, scale)
+        results['seasonal'] = (np.abs(score) > SEASONAL_Z, values, expected, score)
+    if 'change_point' in methods:
+        mask, level_before, level_after, t = _change_points(values)
+        results['change_point'] = (mask, level_after, level_before, t)
+    return results
+
+
+# ==============================================================================
+# DETECCIÓN SOBRE DATAFRAMES
+# ==============================================================================
+
+def _block_size(days):
+    """Series por bloque para que la vista deslizante más ancha quepa en ANOMALY_BLOCK elementos"""
+    width = max(ROLLING_WINDOW, 2 * SEASONAL_WEEKS + 1, 2 * CHANGE_WINDOW + 1)
+    return max(1, ANOMALY_BLOCK // max(days * width, 1))
+
+
+def detect_anomalies(df, columns=ANOMALY_COLUMNS, by=None, methods=METHODS):
+    """
+    Detectar anomalías en series diarias (una o muchas regiones a la vez)
+
+    Args:
+        df (pd.DataFrame): Formato largo con 'date', las columnas y, si se da, `by`.
+            Los días que faltan en una región se tratan como sin dato
+        columns (iterable): Columnas diarias a revisar
+        by (str): Columna de región (None = una sola serie)
+        methods (iterable): Subconjunto de METHODS
+
+    Returns:
+        pd.DataFrame: Una fila por (día, columna, método) marcado, con [by], date,
+            column, method, value, expected, score (z robusto, o t del salto en
+            change_point) y direction ('up' / 'down'), ordenado por región y fecha
+    """
+    unknown = [method for method in methods if method not in METHODS]
+    if unknown:
+        raise ValueError(f"Métodos de anomalías desconocidos: {', '.join(unknown)}")
+    columns = [column for column in columns if column in df.columns]
+    output = ([by] if by is not None else []) + FLAG_COLUMNS
+    if df.empty or not columns:
+        return pd.DataFrame(columns=output)
+
+    dates = pd.to_datetime(df['date']).to_numpy()
+    first = dates.min()
+    day = ((dates - first) // np.timedelta64(1, 'D')).astype(np.int64)
+    days = int(day.max()) + 1
+    if by is None:
+        codes, groups = np.zeros(len(df), dtype=np.int64), np.array([None], dtype=object)
+    else:
+        codes, groups = pd.factorize(df[by], sort=True)
+        groups = np.asarray(groups, dtype=object)
+    raw = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # Bloques de regiones contiguas: cada una aporta una serie por columna
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(groups) + 1))
+    per_block = max(1, _block_size(days) // len(columns))
+    flags = []
+    for start in range(0, len(groups), per_block):
+        stop = min(start + per_block, len(groups))
+        rows = order[bounds[start]:bounds[stop]]
+        values = np.full((stop - start, len(columns), days), np.nan)
+        values[codes[rows] - start, :, day[rows]] = raw[rows]
+        values = values.reshape(-1, days)
+
+        for method, (mask, value, expected, score) in _detect_block(values, methods).items():
+            series, position = np.nonzero(mask & ~np.isnan(values))
+            if not len(series):
+                continue
+            block = pd.DataFrame({
+                'date': first + position.astype('timedelta64[D]'),
+                'column': np.asarray(columns, dtype=object)[series % len(columns)],
+                'method': method,
+                'value': value[series, position],
+                'expected': expected[series, position],
+                'score': score[series, position],
+            })
+            block['direction'] = np.where(block['value'] >= block['expected'], 'up', 'down')
+            if by is not None:
+                block.insert(0, by, groups[start + series // len(columns)])
+            flags.append(block)
+
+    if not flags:
+        return pd.DataFrame(columns=output)
+    flags = pd.concat(flags, ignore_index=True)
+    method_order = pd.Categorical(flags['method'], categories=METHODS, ordered=True)
+    sort_by = ([by] if by is not None else []) + ['date', 'column']
+    return flags.assign(_method=method_order).sort_values(
+        sort_by + ['_method'], kind='stable').drop(columns='_method').reset_index(drop=True)
+
+
+def anomaly_summary(flags, limit=10):
+    """
+    Resumen para el JSON del análisis: recuento por columna y método y las
+    `limit` anomalías puntuales con mayor |score|, más los cambios de nivel
+
+    Returns:
+        dict: counts {columna: {método: n}}, top y change_points (listas de dicts)
+    """
+    counts = {column: {method: int(n) for method, n in rows.groupby('method').size().items()}
+              for column, rows in flags.groupby('column')}
+
+    def records(rows):
+        return [{'date': row.date.date().isoformat(), 'column': row.column, 'method': row.method,
+                 'value': float(row.value), 'expected': None if np.isnan(row.expected) else float(row.expected),
+                 'score': float(row.score), 'direction': row.direction}
+                for row in rows.itertuples()]
+
+    points = flags[flags['method'] != 'change_point']
+    # Un mismo día puede marcarlo más de un método: se queda el de mayor |score|
+    points = points.assign(_abs=points['score'].abs()).sort_values('_abs', ascending=False, kind='stable')
+    points = points.drop_duplicates(['date', 'column']).head(limit)
+    return {'counts': counts, 'top': records(points),
+            'change_points': records(flags[flags['method'] == 'change_point'])}
@@ -0,0 +1,337 @@
+# ==============================================================================
+# INFORMES POR REGIÓN EN LOTE - UN PDF POR ESTADO O PAÍS
+# ==============================================================================
+#
+# generate_region_reports genera un informe ejecutivo por región de un
+# histórico multi-región (countries_historical, us_states_historical):
+#   - el dataset se lee una sola vez y se indexa por región;
+#   - las figuras comunes (p.ej. la evolución nacional) se escalan una vez
+#     (covid_eda/report_images.py) y todos los informes las reutilizan;
+#   - las anomalías de las series diarias (covid_eda/anomalies.py) se
+#     detectan en lote, para todas las regiones a la vez, antes de repartir;
+#   - la figura de cada región y su PDF se generan en un pool de procesos,
+#     cada uno con su estilo de matplotlib y sus estilos de ReportLab creados
+#     una sola vez al arrancar.
+# Como en la etapa render, con 'fork' los procesos heredan el DataFrame sin
+# copiarlo y cada tarea sólo recibe el nombre de la región.
+#
+# Cada lote deja en su directorio batch_timings.json con el tiempo y el tamaño
+# de cada informe.
+
+import io
+import json
+import multiprocessing
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from covid_eda.cache import _atomic_write
+from covid_eda.config import IMAGES_DIR, RENDER_WORKERS, REPORT_IMAGE_DPI, REPORTS_DIR
+
+REGION_REPORTS_DIR = os.path.join(REPORTS_DIR, 'regions')
+TIMINGS_FILE = 'batch_timings.json'
+
+# Columnas que leen los informes por región
+REGION_REPORT_COLUMNS = ['region', 'date', 'cases', 'deaths', 'new_cases', 'cases_7day_avg',
+                         'new_deaths', 'deaths_7day_avg', 'fatality_rate']
+
+# Figuras de images/ que se incluyen en todos los informes de cada tipo de región
+COMMON_FIGURES = {
+    'us-states': [
+        ('temporal_evolution.png', 'Contexto Nacional: Evolución en EE.UU.',
+         """Evolución de casos y muertes en el conjunto de Estados Unidos, como referencia
+         para comparar la trayectoria del estado."""),
+    ],
+    'countries': [],
+}
+
+# Estado de cada proceso del pool (heredado con fork o recibido al arrancar)
+_BATCH = {}
+
+
+def _slug(name):
+    """Nombre de archivo para una región ('New York' -> 'new_york', 'Côte d'Ivoire' -> 'cote_d_ivoire')"""
+    ascii_name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', ascii_name.lower()).strip('_') or 'region'
+
+
+def _file_names(regions):
+    """
+    región -> nombre del PDF, sin colisiones: si dos regiones dan el mismo slug
+    ('Côte d'Ivoire' y 'Cote d Ivoire'), las siguientes llevan sufijo (_2, _3...)
+    """
+    slugs = {region: _slug(region) for region in regions}
+    reserved = set(slugs.values())
+    used, names = set(), {}
+    for region in regions:
+        candidate, suffix = slugs[region], 1
+        # Un sufijo que coincida con el slug de otra región tampoco vale
+        while candidate in used or (suffix > 1 and candidate in reserved):
+            suffix += 1
+            candidate = f"{slugs[region]}_{suffix}"
+        used.add(candidate)
+        names[region] = f"{candidate}.pdf"
+    return names
+
+
+def _display_name(name):
+    """Los estados llegan en minúsculas desde la API ('new york' -> 'New York')"""
+    name = str(name)
+    return name.title() if name.islower() else name
+
+
+def plot_region_figure(df, title, box_inches, dpi=REPORT_IMAGE_DPI, anomalies=None):
+    """
+    Figura 2x2 de una región, dibujada directamente a su tamaño de impresión
+
+    Args:
+        anomalies (pd.DataFrame): Días marcados de la región (detect_anomalies)
+
+    Returns:
+        io.BytesIO: PNG en RGB (sin canal alfa)
+    """
+    from PIL import Image
+
+    from covid_eda.render import _mark_anomalies, _plot_bars, _plot_line, _pyplot
+
+    plt = _pyplot()
+    # El doble de pulgadas a la mitad de dpi: mismos píxeles, letra legible al reducir
+    figure_dpi = dpi / 2
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(box_inches[0] * 2, box_inches[1] * 2),
+                                                 dpi=figure_dpi)
+    fig.suptitle(f'📊 COVID-19 {title}: Evolución Temporal', fontsize=16, fontweight='bold')
+
+    _plot_line(ax1, df['date'], df['cases'], figure_dpi, color='blue', linewidth=2)
+    ax1.set_title('🦠 Casos Acumulados', fontsize=12, fontweight='bold')
+    _plot_line(ax2, df['date'], df['deaths'], figure_dpi, color='red', linewidth=2)
+    ax2.set_title('☠️ Muertes Acumuladas', fontsize=12, fontweight='bold')
+
+    _plot_bars(ax3, df['date'], df['new_cases'], figure_dpi, alpha=0.6, color='blue', label='Casos Diarios')
+    _plot_line(ax3, df['date'], df['cases_7day_avg'], figure_dpi, color='red', linewidth=2,
+               label='Promedio 7d')
+    if anomalies is not None:
+        _mark_anomalies(ax3, anomalies, 'new_cases')
+    ax3.set_title('📈 Casos Diarios y Promedio Móvil', fontsize=12, fontweight='bold')
+    ax3.legend()
+
+    rates = df[df['cases'] > 1000]
+    if not rates.empty:
+        _plot_line(ax4, rates['date'], rates['fatality_rate'], figure_dpi, color='darkred', linewidth=2)
+    ax4.set_title('💀 Tasa de Letalidad (%)', fontsize=12, fontweight='bold')
+
+    for ax in [ax1, ax2, ax3, ax4]:
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(axis='x', rotation=45)
+
+    fig.tight_layout()
+    fig.canvas.draw()
+    image = Image.frombuffer('RGBA', fig.canvas.get_width_height(), fig.canvas.buffer_rgba())
+    plt.close(fig)
+
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, format='PNG')
+    buffer.seek(0)
+    return buffer
+
+
+def build_region_report(region, df, output_path, common_figures=(), anomalies=None):
+    """
+    Generar el informe PDF de una región
+
+    Args:
+        region (str): Nombre de la región
+        df (pd.DataFrame): Histórico de la región (ordenado por fecha)
+        output_path (str): PDF a generar
+        common_figures (iterable): (ruta escalada, (ancho, alto), título, descripción)
+        anomalies (pd.DataFrame): Días marcados de la región (detect_anomalies)
+
+    Returns:
+        bool: True si el PDF se generó
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
+    from reportlab.lib.units import inch
+
+    from covid_eda.report import REPORT_IMAGE_BOX, _format_date, report_styles
+    from covid_eda.summary import series_summary
+
+    styles = report_styles()
+    name = _display_name(region)
+    summary = series_summary(df)
+    if summary is None:
+        return False
+
+    doc = SimpleDocTemplate(output_path, pagesize=A4, rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18)
+    story = [
+        Paragraph("📊 INFORME COVID-19", styles['title']),
+        Paragraph(name.upper(), styles['title']),
+        Paragraph("1. ESTADÍSTICAS CLAVE", styles['heading']),
+    ]
+
+    stats_text = f"""
+    <b>Casos Totales:</b> {summary['total_cases']:,} casos confirmados<br/>
+    <b>Muertes Totales:</b> {summary['total_deaths']:,} fallecimientos<br/>
+    <b>Tasa de Letalidad:</b> {summary['fatality_rate']:.2f}%<br/>
+    <b>Pico de Casos Diarios:</b> {summary.get('peak_daily_cases', 0):,}
+    ({_format_date(summary['peak_date']) if 'peak_date' in summary else '-'})<br/>
+    <b>Período de Análisis:</b> {_format_date(summary['start_date'])} al
+    {_format_date(summary['end_date'])} ({summary['days']} días)
+    """
+    if anomalies is not None:
+        cases = anomalies[anomalies['column'] == 'new_cases']
+        shifts = cases[cases['method'] == 'change_point']
+        stats_text += f"""<br/>
+    <b>Días Anómalos en Casos Diarios:</b> {cases.loc[cases['method'] != 'change_point', 'date'].nunique()}
+    · <b>Cambios de Nivel:</b> {', '.join(_format_date(date.date().isoformat()) for date in shifts['date']) or '-'}
+    """
+    story.append(Paragraph(stats_text, styles['body']))
+
+    story.append(Paragraph("2. EVOLUCIÓN TEMPORAL", styles['heading']))
+    figure = plot_region_figure(df, name, REPORT_IMAGE_BOX, anomalies=anomalies)
+    story.append(Image(figure, width=REPORT_IMAGE_BOX[0] * inch, height=REPORT_IMAGE_BOX[1] * inch))
+
+    for scaled_path, (width, height), title, description in common_figures:
+        story.append(PageBreak())
+        story.append(Paragraph(title, styles['subheading']))
+        story.append(Paragraph(description, styles['body']))
+        story.append(Image(scaled_path, width=width * inch, height=height * inch))
+
+    story.append(Spacer(1, 30))
+    story.append(Paragraph(f"Informe generado automáticamente el "
+                           f"{datetime.now().strftime('%d/%m/%Y %H:%M')} · Fuente: Disease.sh API "
+                           f"(Johns Hopkins University)", styles['footer']))
+    doc.build(story)
+    return True
+
+
+def _init_worker(batch):
+    """Inicializar un proceso del pool: datos compartidos, estilo de figuras y de párrafos"""
+    from covid_eda.render import set_style
+    from covid_eda.report import report_styles
+
+    if batch is not None:
+        _BATCH.update(batch)
+    set_style()
+    report_styles()
+
+
+def _build_one(region):
+    """Informe de una región con los datos del proceso; devuelve (región, ruta, ok, segundos)"""
+    start = time.perf_counter()
+    df = _BATCH['df'].iloc[_BATCH['groups'][region]]
+    anomalies = _BATCH['anomalies'].iloc[_BATCH['anomaly_groups'].get(region, [])]
+    path = os.path.join(_BATCH['output_dir'], _BATCH['files'][region])
+    try:
+        ok = build_region_report(region, df, path, _BATCH['common'], anomalies)
+    except Exception as e:
+        print(f"❌ {region}: {e}")
+        ok = False
+    return region, path, ok, time.perf_counter() - start
+
+
+def _progress(done, total, region, elapsed):
+    """Una línea cada ~5% del lote (y siempre la última)"""
+    if done % max(total // 20, 1) == 0 or done == total:
+        print(f"   [{done}/{total}] {_display_name(region)} ({elapsed:.2f} s)")
+
+
+def generate_region_reports(region_kind, names=None, output_dir=None, images_dir=IMAGES_DIR,
+                            workers=RENDER_WORKERS):
+    """
+    Generar un informe PDF por región de un histórico multi-región
+
+    Args:
+        region_kind (str): Clave de pipeline.REGIONS ('countries', 'us-states')
+        names (list): Regiones a incluir; None = todas las del dataset
+        output_dir (str): Directorio de los PDF (por defecto reports/regions/<tipo>/)
+        images_dir (str): Directorio de las figuras comunes
+        workers (int): Procesos en paralelo (1 = secuencial en este proceso)
+
+    Returns:
+        list: Rutas de los informes generados
+    """
+    from covid_eda.anomalies import detect_anomalies
+    from covid_eda.pipeline import REGIONS
+    from covid_eda.report import REPORT_IMAGE_BOX
+    from covid_eda.report_images import prepare_images
+    from covid_eda.storage import dataset_exists, read_dataset
+
+    dataset = REGIONS[region_kind][1]
+    if not dataset_exists(dataset):
+        print(f"⚠️ Sin datos de {region_kind}: ejecuta primero fetch,transform --regions {region_kind}")
+        return []
+    filters = [('region', 'in', list(names))] if names else None
+    df = read_dataset(dataset, columns=REGION_REPORT_COLUMNS, filters=filters)
+    groups = df.groupby('region', observed=True, sort=True).indices
+    if names:
+        missing = [name for name in names if name not in groups]
+        if missing:
+            print(f"⚠️ Regiones sin datos: {', '.join(missing)}")
+    regions = list(groups)
+    if not regions:
+        print(f"⚠️ Sin regiones que procesar en {dataset}")
+        return []
+
+    output_dir = output_dir or os.path.join(REGION_REPORTS_DIR, region_kind)
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Figuras comunes: se escalan una vez para todo el lote
+    figures = COMMON_FIGURES.get(region_kind, [])
+    paths = [os.path.join(images_dir, filename) for filename, _, _ in figures]
+    prepared = prepare_images(paths, REPORT_IMAGE_BOX)
+    common = [(*prepared[path], title, description)
+              for path, (_, title, description) in zip(paths, figures) if path in prepared]
+
+    workers = max(1, min(workers, len(regions)))
+    print(f"\n📄 Generando {len(regions)} informes de {region_kind} en {workers} "
+          f"proceso{'s' if workers > 1 else ''}...")
+
+    # Todas las regiones en una pasada; cada informe recibe sólo sus filas
+    anomalies = detect_anomalies(df, by='region')
+    anomaly_groups = anomalies.groupby('region', sort=False).indices
+
+    _BATCH.update(df=df, groups=groups, files=_file_names(regions), output_dir=output_dir,
+                  common=common, anomalies=anomalies, anomaly_groups=anomaly_groups)
+    results = {}
+    start = time.perf_counter()
+    try:
+        if workers > 1:
+            if 'fork' in multiprocessing.get_all_start_methods():
+                context, batch = multiprocessing.get_context('fork'), None
+            else:
+                context, batch = multiprocessing.get_context(), dict(_BATCH)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(batch,)) as pool:
+                futures = [pool.submit(_build_one, region) for region in regions]
+                for future in as_completed(futures):
+                    region, path, ok, elapsed = future.result()
+                    results[region] = (path, ok, elapsed)
+                    _progress(len(results), len(regions), region, elapsed)
+        else:
+            _init_worker(None)
+            for region in regions:
+                region, path, ok, elapsed = _build_one(region)
+                results[region] = (path, ok, elapsed)
+                _progress(len(results), len(regions), region, elapsed)
+    finally:
+        _BATCH.clear()
+    wall = time.perf_counter() - start
+
+    reports = {str(region): {'file': os.path.basename(path), 'ok': ok, 'seconds': round(elapsed, 3),
+                             'bytes': os.path.getsize(path) if ok else 0}
+               for region, (path, ok, elapsed) in results.items()}
+    busy = sum(elapsed for _, _, elapsed in results.values())
+    timings = {'region_kind': region_kind, 'dataset': dataset, 'workers': workers,
+               'finished_at': time.time(), 'wall_seconds': round(wall, 3),
+               'busy_seconds': round(busy, 3), 'reports': reports}
+    _atomic_write(os.path.join(output_dir, TIMINGS_FILE),
+                  json.dumps(timings, indent=2, ensure_ascii=False).encode('utf-8'))
+
+    generated = [path for path, ok, _ in results.values() if ok]
+    print(f"✅ {len(generated)}/{len(regions)} informes en {output_dir} · {wall:.1f} s "
+          f"({busy / len(regions):.2f} s por informe, {busy / wall if wall else 0:.1f}x en paralelo)")
+    return sorted(generated)
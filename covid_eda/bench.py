@@ -0,0 +1,463 @@
+# ==============================================================================
+# BENCHMARKS - TIEMPO Y MEMORIA DE CADA ETAPA CON DATOS SINTÉTICOS
+# ==============================================================================
+#
+# Uso:
+#   python -m covid_eda.bench                           # escala actual (52 estados, ~1.100 días)
+#   python -m covid_eda.bench --scale current,medium,large
+#   python -m covid_eda.bench --only transform,figure:temporal_evolution --repeat 5
+#   python -m covid_eda.bench --compare data/bench/bench-abc1234.json
+#
+# Los generadores producen datos con el mismo formato que la API (timeline,
+# endpoint states) o que los datasets en formato largo, escalables hasta
+# decenas de miles de regiones y 10 años de días. No hace falta red.
+#
+# Cada benchmark se ejecuta `repeat` veces midiendo tiempo real y de CPU, más
+# una ejecución aparte con tracemalloc para el pico de memoria (tracemalloc
+# ralentiza, así que no se mezcla con los tiempos). Todo se ejecuta en un
+# directorio temporal, así que data/, images/ y reports/ no se tocan. El
+# resultado es un JSON por ejecución con el commit, las versiones y una
+# entrada por (benchmark, escala); --compare lo contrasta con otro.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from covid_eda.config import BENCH_DIR
+
+BENCH_VERSION = 1
+
+# states: filas del endpoint states; days: días del histórico de EE.UU.;
+# regions x region_days: histórico largo (kernel de métricas y outliers por región);
+# raw_regions: regiones del histórico en formato API (diccionarios de Python, más caro en memoria)
+SCALES = {
+    'current': {'states': 52, 'days': 1143, 'regions': 52, 'raw_regions': 52, 'region_days': 1143},
+    'medium': {'states': 1000, 'days': 1826, 'regions': 1000, 'raw_regions': 200, 'region_days': 1826},
+    'large': {'states': 10000, 'days': 3652, 'regions': 2000, 'raw_regions': 500, 'region_days': 3652},
+}
+
+STAGE_NAMES = ('transform', 'analyze', 'render', 'report')
+
+
+# ==============================================================================
+# GENERADORES DE DATOS SINTÉTICOS
+# ==============================================================================
+
+def _daily_waves(rng, n_series, days, scale=1000.0):
+    """Casos diarios con varias olas y ruido de Poisson, forma (n_series, days)"""
+    t = np.arange(days)
+    phases = rng.uniform(0, 2 * np.pi, size=(n_series, 1))
+    periods = rng.uniform(150, 300, size=(n_series, 1))
+    sizes = rng.lognormal(np.log(scale), 1.0, size=(n_series, 1))
+    intensity = sizes * (1.2 + np.sin(2 * np.pi * t / periods + phases)) ** 2
+    return rng.poisson(intensity).astype('int64')
+
+
+def _api_dates(days, start='2020-01-22'):
+    """Fechas en el formato m/d/yy de la API"""
+    dates = pd.date_range(start, periods=days, freq='D')
+    return [f"{d.month}/{d.day}/{d.year % 100:02d}" for d in dates]
+
+
+def synthetic_us_raw(days, seed=0):
+    """Respuesta sintética de historical/USA (timeline cases/deaths/recovered)"""
+    rng = np.random.default_rng(seed)
+    cases = np.cumsum(_daily_waves(rng, 1, days, scale=50000)[0])
+    deaths = np.cumsum(rng.binomial(_daily_waves(rng, 1, days, scale=50000)[0], 0.012))
+    dates = _api_dates(days)
+    return {'country': 'USA', 'province': ['mainland'], 'timeline': {
+        'cases': dict(zip(dates, cases.tolist())),
+        'deaths': dict(zip(dates, deaths.tolist())),
+        'recovered': dict.fromkeys(dates, 0),
+    }}
+
+
+def synthetic_states_raw(n_states, seed=0):
+    """Respuesta sintética del endpoint states (una fila por estado)"""
+    rng = np.random.default_rng(seed)
+    population = rng.lognormal(np.log(4e6), 1.0, n_states).astype('int64') + 1000
+    cases = (population * rng.uniform(0.15, 0.45, n_states)).astype('int64')
+    deaths = (cases * rng.uniform(0.004, 0.02, n_states)).astype('int64')
+    return [{'state': f'State {i:05d}', 'updated': 1678000000000 + i, 'cases': int(c),
+             'deaths': int(d), 'recovered': 0,
+             'casesPerOneMillion': int(c / p * 1e6), 'deathsPerOneMillion': int(d / p * 1e6),
+             'population': int(p)}
+            for i, (c, d, p) in enumerate(zip(cases, deaths, population))]
+
+
+def synthetic_histories(n_regions, days, seed=0):
+    """Históricos sintéticos por región en el formato de la API (región -> timeline)"""
+    rng = np.random.default_rng(seed)
+    cases = np.cumsum(_daily_waves(rng, n_regions, days), axis=1)
+    deaths = np.cumsum(rng.binomial(_daily_waves(rng, n_regions, days), 0.012), axis=1)
+    dates = _api_dates(days)
+    return {f'Region {i:05d}': {'cases': dict(zip(dates, cases[i].tolist())),
+                                'deaths': dict(zip(dates, deaths[i].tolist()))}
+            for i in range(n_regions)}
+
+
+def synthetic_regional_frame(n_regions, days, seed=0):
+    """Histórico sintético en formato largo (region, date, cases, deaths), sin pasar por dicts"""
+    rng = np.random.default_rng(seed)
+    cases = np.cumsum(_daily_waves(rng, n_regions, days), axis=1)
+    deaths = np.cumsum(rng.binomial(_daily_waves(rng, n_regions, days), 0.012), axis=1)
+    names = pd.Categorical.from_codes(np.repeat(np.arange(n_regions), days),
+                                      categories=[f'Region {i:05d}' for i in range(n_regions)])
+    return pd.DataFrame({
+        'region': names,
+        'date': np.tile(pd.date_range('2020-01-22', periods=days, freq='D').to_numpy(), n_regions),
+        'cases': cases.ravel(),
+        'deaths': deaths.ravel(),
+    })
+
+
+# ==============================================================================
+# MEDICIÓN
+# ==============================================================================
+
+def measure(run, repeat=3, setup=None, memory=True):
+    """
+    Tiempo real, tiempo de CPU y pico de memoria de `run`
+
+    Args:
+        run (callable): Función a medir (sin argumentos)
+        repeat (int): Repeticiones cronometradas
+        setup (callable): Preparación sin cronometrar antes de cada ejecución
+        memory (bool): Ejecución adicional con tracemalloc para el pico de memoria
+
+    Returns:
+        dict: seconds (min/median/mean), cpu_seconds (mediana) y peak_mb
+    """
+    wall, cpu = [], []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start, start_cpu = time.perf_counter(), time.process_time()
+        run()
+        wall.append(time.perf_counter() - start)
+        cpu.append(time.process_time() - start_cpu)
+
+    peak_mb = None
+    if memory:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            run()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+
+    return {'seconds': {'min': min(wall), 'median': statistics.median(wall),
+                        'mean': statistics.fmean(wall)},
+            'cpu_seconds': statistics.median(cpu),
+            'peak_mb': peak_mb}
+
+
+# ==============================================================================
+# BENCHMARKS
+# ==============================================================================
+
+def _prepare(params):
+    """Datos sintéticos de una escala y sus versiones procesadas (sin cronometrar)"""
+    from covid_eda.compact import compact_frame
+    from covid_eda.storage import save_dataset
+    from covid_eda.transform import compute_regional_metrics, process_states_data, process_us_data
+
+    data = {
+        'us_raw': synthetic_us_raw(params['days']),
+        'states_raw': synthetic_states_raw(params['states']),
+        'histories': synthetic_histories(params['raw_regions'], params['region_days']),
+        'regional': synthetic_regional_frame(params['regions'], params['region_days']),
+    }
+    data['df_us'] = compact_frame(process_us_data(data['us_raw']), 'us_historical', report=False)
+    data['df_states'] = compact_frame(process_states_data(data['states_raw']), 'states', report=False)
+    data['regional_metrics'] = compute_regional_metrics(data['regional'].copy())
+    # Las consultas (covid_eda.query) leen el histórico guardado en el directorio de trabajo
+    save_dataset(data['regional_metrics'], 'countries_historical')
+    return data
+
+
+def _forget_correlations():
+    """Sin correlaciones ya calculadas: cada repetición paga el cálculo completo"""
+    import shutil
+    from covid_eda.config import CORRELATION_CACHE_DIR
+    from covid_eda.correlation import clear_memo
+
+    clear_memo()
+    shutil.rmtree(CORRELATION_CACHE_DIR, ignore_errors=True)
+
+
+def benchmarks(data):
+    """
+    Benchmarks disponibles sobre unos datos preparados
+
+    Returns:
+        list: Tuplas (nombre, etapa, filas, run, setup)
+    """
+    from covid_eda.anomalies import detect_anomalies
+    from covid_eda.config import FIGURE_DPI, IMAGES_DIR
+    from covid_eda.correlation import compute_correlations, lagged_correlations
+    from covid_eda.outliers import detect_outliers
+    from covid_eda.query import ranking, windowed
+    from covid_eda.ranking import RankingIndex
+    from covid_eda.render import FIGURES, set_style
+    from covid_eda.report import REPORT_FIGURES, create_covid_report
+    from covid_eda.snapshots import SnapshotStore
+    from covid_eda.storage import read_dataset
+    from covid_eda.summary import CORRELATION_COLUMNS, build_summary, compute_summary
+    from covid_eda.transform import (compute_regional_metrics, process_country_histories,
+                                     process_states_data, process_us_data)
+
+    df_us, df_states = data['df_us'], data['df_states']
+    n_us, n_states, n_regional = len(df_us), len(df_states), len(data['regional'])
+    n_histories = sum(len(timeline['cases']) for timeline in data['histories'].values())
+    outlier_columns = ['new_cases', 'new_deaths', 'cases_7day_avg', 'deaths_7day_avg']
+    ranking_metrics = ['cases', 'cases_per_100k', 'deaths', 'fatality_rate']
+    index = RankingIndex(df_states, 'state', ranking_metrics)
+
+    def forget_snapshots():
+        import shutil
+        from covid_eda.config import STATES_SNAPSHOT_DIR
+
+        shutil.rmtree(STATES_SNAPSHOT_DIR, ignore_errors=True)
+
+    def store_snapshot():
+        """Foto ya guardada: has_new sólo consulta el índice"""
+        forget_snapshots()
+        SnapshotStore().append(df_states)
+
+    items = [
+        ('process_us_data', 'transform', n_us, lambda: process_us_data(data['us_raw']), None),
+        ('process_states_data', 'transform', n_states,
+         lambda: process_states_data(data['states_raw']), None),
+        ('process_country_histories', 'transform', n_histories,
+         lambda: process_country_histories(data['histories']), None),
+        ('compute_regional_metrics', 'transform', n_regional,
+         lambda: compute_regional_metrics(data['regional'].copy()), None),
+        ('detect_outliers_states', 'analyze', n_states,
+         lambda: detect_outliers(df_states, columns=['cases_per_100k', 'deaths_per_100k', 'fatality_rate']),
+         None),
+        ('detect_outliers_regions', 'analyze', n_regional,
+         lambda: detect_outliers(data['regional_metrics'], columns=outlier_columns, by='region'), None),
+        ('anomalies_us', 'analyze', n_us, lambda: detect_anomalies(df_us), None),
+        ('anomalies_regions', 'analyze', n_regional,
+         lambda: detect_anomalies(data['regional_metrics'], by='region'), None),
+        ('compute_summary', 'analyze', n_us + n_states, lambda: compute_summary(df_us, df_states),
+         _forget_correlations),
+        ('correlations_states', 'analyze', n_states,
+         lambda: compute_correlations(df_states[CORRELATION_COLUMNS].to_numpy(dtype=np.float64)), None),
+        ('lagged_correlations', 'analyze', n_regional,
+         lambda: lagged_correlations(data['regional_metrics']), None),
+        ('ranking_regions:query', 'analyze', n_regional,
+         lambda: ranking('countries_historical', 'cases', k=15), None),
+        ('ranking_regions:pandas', 'analyze', n_regional, lambda: pandas_ranking(), None),
+        ('windowed_regions:query', 'analyze', n_regional,
+         lambda: windowed('countries_historical', ['new_cases'], freq='W'), None),
+        ('ranking_index:build', 'analyze', n_states,
+         lambda: RankingIndex(df_states, 'state', ranking_metrics), None),
+        ('ranking_index:top', 'analyze', n_states,
+         lambda: index.top('fatality_rate', 10, where=[('cases', '>', 10000)]), None),
+        ('ranking_index:nlargest', 'analyze', n_states,
+         lambda: df_states[df_states['cases'] > 10000].nlargest(10, 'fatality_rate'), None),
+        ('snapshots:append', 'transform', n_states, lambda: SnapshotStore().append(df_states),
+         forget_snapshots),
+        ('snapshots:unchanged', 'transform', n_states,
+         lambda: SnapshotStore().has_new(data['states_raw']), store_snapshot),
+    ]
+
+    def pandas_ranking():
+        """Referencia: cargar el histórico entero y ordenar en pandas"""
+        df = read_dataset('countries_historical')
+        last = df.loc[df.groupby('region', observed=True)['date'].idxmax()]
+        return last.nlargest(15, 'cases')
+
+    def figure(name):
+        filename, plot, _ = FIGURES[name]
+        path = os.path.join(IMAGES_DIR, filename)
+        return lambda: plot(df_us, df_states, path, dpi=FIGURE_DPI)
+
+    set_style()
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    for name in FIGURES:
+        rows = n_us if name in ('temporal_evolution', 'fatality_rate_evolution', 'interactive_dashboard') \
+            else n_states
+        items.append((f'figure:{name}', 'render', rows, figure(name), None))
+
+    def report_inputs(cold):
+        """El informe necesita el resumen y sus figuras; en frío, sin caché de imágenes escaladas"""
+        import shutil
+        from covid_eda.config import REPORT_IMAGE_CACHE_DIR
+
+        for filename, _, _ in REPORT_FIGURES:
+            if not os.path.exists(os.path.join(IMAGES_DIR, filename)):
+                figure(next(key for key, value in FIGURES.items() if value[0] == filename))()
+        build_summary(df_us, df_states)
+        if cold:
+            shutil.rmtree(REPORT_IMAGE_CACHE_DIR, ignore_errors=True)
+        elif not os.path.isdir(REPORT_IMAGE_CACHE_DIR):
+            create_covid_report()
+
+    items.append(('create_covid_report:cold', 'report', n_us + n_states, create_covid_report,
+                  lambda: report_inputs(cold=True)))
+    items.append(('create_covid_report:warm', 'report', n_us + n_states, create_covid_report,
+                  lambda: report_inputs(cold=False)))
+    return items
+
+
+def _selected(name, stage, only):
+    """--only admite etapas (transform) o prefijos de nombre (figure:, figure:temporal)"""
+    return not only or any(item == stage or name.startswith(item) for item in only)
+
+
+def run_benchmarks(scales=('current',), only=None, repeat=3, memory=True, overrides=None):
+    """
+    Ejecutar los benchmarks seleccionados en cada escala
+
+    Args:
+        scales (iterable): Claves de SCALES
+        only (list): Etapas o prefijos de nombre a ejecutar (None = todos)
+        repeat (int): Repeticiones cronometradas por benchmark
+        memory (bool): Medir también el pico de memoria
+        overrides (dict): Parámetros de escala a sustituir (p.ej. {'regions': 10000})
+
+    Returns:
+        dict: Resultado con metadatos y una entrada por (benchmark, escala)
+    """
+    results = []
+    origin = os.getcwd()
+    for scale in scales:
+        params = {**SCALES[scale], **(overrides or {})}
+        print(f"\n⏱️ Escala {scale}: {params}")
+        with tempfile.TemporaryDirectory(prefix='covid_eda_bench_') as workdir:
+            # Las rutas de config son relativas: todo se escribe dentro de workdir
+            os.chdir(workdir)
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        data = _prepare(params)
+                        items = benchmarks(data)
+                    for name, stage, rows, run, setup in items:
+                        if not _selected(name, stage, only):
+                            continue
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            stats = measure(run, repeat=repeat, setup=setup, memory=memory)
+                        results.append({'name': name, 'stage': stage, 'scale': scale,
+                                        'params': params, 'rows': rows, 'repeat': repeat, **stats})
+                        peak = f"{stats['peak_mb']:8.1f} MB" if stats['peak_mb'] is not None else ''
+                        print(f"   {name:32s} {rows:>10,} filas  {stats['seconds']['median']:8.3f} s  {peak}")
+            finally:
+                os.chdir(origin)
+
+    return {'version': BENCH_VERSION, 'commit': _git_commit(), 'created_at': time.time(),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'cpu_count': os.cpu_count(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'results': results}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Comparar dos resultados por (benchmark, escala) usando la mediana
+
+    Returns:
+        list: Benchmarks más lentos que la base por encima de `threshold`
+    """
+    base = {(item['name'], item['scale']): item for item in baseline['results']}
+    regressions = []
+    print(f"\n📊 Comparación con {baseline.get('commit') or 'base'} (mediana, umbral +{threshold:.0%}):")
+    for item in current['results']:
+        old = base.get((item['name'], item['scale']))
+        if old is None:
+            continue
+        ratio = item['seconds']['median'] / old['seconds']['median'] if old['seconds']['median'] else float('inf')
+        flag = '⚠️' if ratio > 1 + threshold else ('🚀' if ratio < 1 - threshold else '  ')
+        print(f"   {flag} {item['name']:32s} {item['scale']:8s} {old['seconds']['median']:8.3f} s → "
+              f"{item['seconds']['median']:8.3f} s  ({ratio:.2f}x)")
+        if ratio > 1 + threshold:
+            regressions.append(item['name'])
+    return regressions
+
+
+# ==============================================================================
+# LÍNEA DE COMANDOS
+# ==============================================================================
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _override(value):
+    key, _, number = value.partition('=')
+    if key not in SCALES['current'] or not number.isdigit():
+        raise argparse.ArgumentTypeError(f"se espera clave=entero con clave en {', '.join(SCALES['current'])}")
+    return key, int(number)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m covid_eda.bench',
+                                     description='Benchmarks de las etapas con datos sintéticos')
+    parser.add_argument('--scale', type=_split, default=['current'],
+                        help=f"Escalas separadas por comas ({','.join(SCALES)}). Por defecto: current")
+    parser.add_argument('--only', type=_split, default=None,
+                        help=f"Etapas ({','.join(STAGE_NAMES)}) o prefijos de nombre (figure:temporal)")
+    parser.add_argument('--set', type=_override, action='append', default=[], metavar='CLAVE=N',
+                        help='Sustituir un parámetro de escala, p.ej. --set regions=10000')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por benchmark (por defecto 3)')
+    parser.add_argument('--no-memory', action='store_true', help='No medir el pico de memoria')
+    parser.add_argument('--output', default=None,
+                        help=f'Archivo JSON de resultados (por defecto {BENCH_DIR}/bench-<commit>.json)')
+    parser.add_argument('--compare', default=None, help='Resultado anterior con el que comparar')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Ralentización relativa que cuenta como regresión (por defecto 0.10)')
+    args = parser.parse_args(argv)
+
+    unknown = [scale for scale in args.scale if scale not in SCALES]
+    if unknown:
+        parser.error(f"escalas desconocidas: {', '.join(unknown)}")
+    if args.repeat < 1:
+        parser.error("--repeat debe ser al menos 1")
+
+    output = os.path.abspath(args.output or os.path.join(
+        BENCH_DIR, f"bench-{_git_commit() or time.strftime('%Y%m%d-%H%M%S')}.json"))
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print("🚀 BENCHMARKS COVID-19 EDA")
+    result = run_benchmarks(args.scale, only=args.only, repeat=args.repeat,
+                            memory=not args.no_memory, overrides=dict(args.set))
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    print(f"\n💾 Resultados guardados: {output}")
+
+    if baseline is not None and compare(baseline, result, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,219 @@
+# ==============================================================================
+# CACHÉ LOCAL DE RESPUESTAS HTTP
+# ==============================================================================
+#
+# Guarda en disco el cuerpo de cada respuesta de la API junto con sus cabeceras
+# ETag / Last-Modified. Mientras una entrada es "fresca" (edad < TTL) se sirve
+# sin tocar la red; cuando caduca se revalida con una petición condicional
+# (If-None-Match / If-Modified-Since) y un 304 sólo renueva la entrada.
+#
+# El tamaño total está acotado: al superar max_bytes se eliminan las entradas
+# usadas hace más tiempo (LRU). Un acierto sólo anota la hora de acceso en
+# memoria; el índice se guarda al escribir una entrada, al renovarla o con
+# flush() (también al salir del proceso). Una respuesta más grande que
+# max_bytes no se guarda.
+#
+# Una misma instancia se puede compartir entre los hilos del fetcher concurrente
+# (covid_eda/ingest.py): el índice se protege con un lock.
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+
+from covid_eda.config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL
+
+
+def _atomic_write(path, data):
+    """Escribir un archivo de forma atómica (tmp + rename)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+# Cachés abiertas: un único hook de salida guarda lo pendiente de las que
+# sigan vivas, sin mantenerlas en memoria
+_open_caches = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_caches():
+    for cache in list(_open_caches):
+        cache.flush()
+
+
+class ResponseCache:
+    """
+    Caché de respuestas HTTP en disco con TTL, revalidación y desalojo LRU
+
+    Args:
+        cache_dir (str): Directorio donde se guardan las respuestas
+        ttl (float): Segundos durante los que una respuesta se sirve sin revalidar
+        max_bytes (int): Tamaño máximo de los cuerpos guardados
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._index = None
+        self._dirty = False
+        self._lock = threading.RLock()
+        _open_caches.add(self)
+
+    # --------------------------------------------------------------------------
+    # Índice de entradas
+    # --------------------------------------------------------------------------
+
+    @property
+    def index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_FILE)
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _atomic_write(self.index_path, json.dumps(self._load_index()).encode('utf-8'))
+        self._dirty = False
+
+    def flush(self):
+        """Guardar las horas de acceso pendientes (aciertos desde el último guardado)"""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    @staticmethod
+    def key_for(url):
+        """Clave de la entrada para una URL"""
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.body")
+
+    # --------------------------------------------------------------------------
+    # API pública
+    # --------------------------------------------------------------------------
+
+    def lookup(self, url):
+        """
+        Buscar la entrada de una URL
+
+        Returns:
+            dict | None: Metadatos de la entrada (etag, last_modified, fetched_at,
+            size) más 'fresh' (bool); None si no existe o su cuerpo se perdió
+        """
+        with self._lock:
+            key = self.key_for(url)
+            entry = self._load_index().get(key)
+            if entry is None or not os.path.exists(self._body_path(key)):
+                return None
+
+            entry = dict(entry)
+            entry['fresh'] = (time.time() - entry['fetched_at']) < self.ttl
+            return entry
+
+    def load(self, url):
+        """Leer el cuerpo guardado de una URL y marcarlo como usado (LRU)"""
+        with self._lock:
+            key = self.key_for(url)
+            with open(self._body_path(key), 'rb') as f:
+                body = f.read()
+
+            entry = self._load_index().get(key)
+            if entry is not None:
+                entry['last_access'] = time.time()
+                self._dirty = True
+            return body
+
+    def store(self, url, body, etag=None, last_modified=None):
+        """
+        Guardar la respuesta de una URL y aplicar el límite de tamaño
+
+        Returns:
+            bool: False si el cuerpo supera max_bytes y no se guarda (la copia
+            anterior de la URL, ya obsoleta, se descarta)
+        """
+        with self._lock:
+            key = self.key_for(url)
+            if len(body) > self.max_bytes:
+                self._remove(key)
+                self._save_index()
+                return False
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            _atomic_write(self._body_path(key), body)
+
+            now = time.time()
+            self._load_index()[key] = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'fetched_at': now,
+                'last_access': now,
+                'size': len(body),
+            }
+            self._evict()
+            self._save_index()
+            return True
+
+    def touch(self, url):
+        """Renovar una entrada revalidada con 304 Not Modified"""
+        with self._lock:
+            entry = self._load_index().get(self.key_for(url))
+            if entry is not None:
+                entry['fetched_at'] = entry['last_access'] = time.time()
+                self._save_index()
+
+    def conditional_headers(self, entry):
+        """Cabeceras para revalidar una entrada caducada"""
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def total_bytes(self):
+        return sum(entry['size'] for entry in self._load_index().values())
+
+    def _evict(self):
+        """Eliminar las entradas menos usadas hasta respetar max_bytes"""
+        index = self._load_index()
+        total = self.total_bytes()
+        for key in sorted(index, key=lambda k: index[k]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= index[key]['size']
+            self._remove(key)
+
+    def _remove(self, key):
+        """Eliminar una entrada del índice y su cuerpo"""
+        self._load_index().pop(key, None)
+        try:
+            os.remove(self._body_path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Vaciar la caché"""
+        with self._lock:
+            for key in list(self._load_index()):
+                try:
+                    os.remove(self._body_path(key))
+                except OSError:
+                    pass
+            self._index = {}
+            self._save_index()
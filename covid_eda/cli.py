@@ -0,0 +1,116 @@
+# ==============================================================================
+# CLI - EJECUTAR CUALQUIER SUBCONJUNTO DE ETAPAS DEL PIPELINE
+# ==============================================================================
+
+import argparse
+import warnings
+
+from covid_eda.config import API_BASE_URL, FETCH_MAX_WORKERS, RENDER_WORKERS, STREAM_CHUNK_DAYS
+from covid_eda.pipeline import REGIONS, STAGES, print_final_report, run_pipeline
+from covid_eda.profiling import PROFILERS
+from covid_eda.schema import SchemaError
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m covid_eda',
+        description='Pipeline de análisis exploratorio COVID-19 (EE.UU.)'
+    )
+    parser.add_argument('--stages', type=_split, default=list(STAGES),
+                        help=f"Etapas separadas por comas ({','.join(STAGES)}). Por defecto: todas")
+    parser.add_argument('--figures', type=_split, default=None,
+                        help='Figuras a generar en la etapa render, separadas por comas. Por defecto: todas')
+    parser.add_argument('--offline', action='store_true',
+                        help='Etapa fetch sin red: servir sólo desde la caché local')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignorar la caché local de respuestas HTTP')
+    parser.add_argument('--base-url', default=API_BASE_URL,
+                        help=f'URL base de la API (por defecto {API_BASE_URL})')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Histórico EE.UU.: descargar y procesar sólo los días nuevos')
+    parser.add_argument('--regions', type=_split, default=[],
+                        help=f"Históricos multi-región a descargar/procesar ({','.join(REGIONS)})")
+    parser.add_argument('--countries', type=_split, default=None,
+                        help='Países (nombre o ISO) para --regions countries. Por defecto: todos')
+    parser.add_argument('--workers', type=int, default=FETCH_MAX_WORKERS,
+                        help=f'Peticiones simultáneas en la descarga multi-región (por defecto {FETCH_MAX_WORKERS})')
+    parser.add_argument('--stream', action='store_true',
+                        help='Procesar los históricos por trozos de fechas (memoria acotada)')
+    parser.add_argument('--chunk-days', type=int, default=STREAM_CHUNK_DAYS,
+                        help=f'Días por trozo con --stream (por defecto {STREAM_CHUNK_DAYS})')
+    parser.add_argument('--render-workers', type=int, default=RENDER_WORKERS,
+                        help=f'Procesos para generar las figuras (por defecto {RENDER_WORKERS}, 1 = secuencial)')
+    parser.add_argument('--force-render', action='store_true',
+                        help='Regenerar todas las figuras aunque sus datos no hayan cambiado')
+    parser.add_argument('--region-reports', type=_split, default=[],
+                        help=f"Etapa report: un PDF por región de estos históricos ({','.join(REGIONS)}), "
+                             f"en --render-workers procesos")
+    parser.add_argument('--profile', choices=PROFILERS, default=None,
+                        help='Perfilar cada etapa (cprofile: .prof, sample: pilas plegadas .folded) '
+                             'en data/profiles/<run_id>/')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='tracemalloc en las etapas transform y analyze (.tracemalloc, .alloc.folded)')
+    parser.add_argument('--no-compact', action='store_true',
+                        help='No reducir los tipos en memoria de los datasets')
+    parser.add_argument('--list-figures', action='store_true',
+                        help='Mostrar las figuras disponibles y salir')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    unknown = [stage for stage in args.stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"etapas desconocidas: {', '.join(unknown)}")
+
+    if args.list_figures:
+        from covid_eda.render import FIGURES
+        for name, (filename, _, _) in FIGURES.items():
+            print(f"{name:30s} {filename}")
+        return 0
+
+    print("🚀 INICIANDO ANÁLISIS EXPLORATORIO COVID-19")
+    print(f"🔧 Etapas: {', '.join(stage for stage in STAGES if stage in args.stages)}")
+    print("=" * 80)
+
+    unknown = [region for region in args.regions + args.region_reports if region not in REGIONS]
+    if unknown:
+        parser.error(f"regiones desconocidas: {', '.join(unknown)}")
+
+    if args.chunk_days < 1:
+        parser.error("--chunk-days debe ser al menos 1")
+
+    if args.offline and args.no_cache:
+        parser.error("--offline necesita la caché: no se puede combinar con --no-cache")
+
+    try:
+        ctx = run_pipeline(args.stages, figure_names=args.figures,
+                           use_cache=not args.no_cache, offline=args.offline,
+                           incremental=args.incremental, regions=args.regions,
+                           countries=args.countries, max_workers=args.workers,
+                           compact=not args.no_compact, render_workers=args.render_workers,
+                           force_render=args.force_render, stream=args.stream,
+                           chunk_days=args.chunk_days, region_reports=args.region_reports,
+                           profile=args.profile, profile_memory=args.profile_memory,
+                           base_url=args.base_url.rstrip('/'))
+    except SchemaError as exc:
+        # Un dataset guardado que no cumple el esquema: se arregla con la etapa transform
+        print(f"\n❌ {exc}")
+        return 1
+
+    if 'render' in args.stages or 'report' in args.stages:
+        print_final_report(ctx)
+
+    if ctx.get('report_ok') is False:
+        print("\n❌ Error en la generación del informe")
+        return 1
+
+    print(f"\n🎉 PIPELINE COMPLETADO")
+    return 0
@@ -0,0 +1,111 @@
+# ==============================================================================
+# COMPACTACIÓN DE TIPOS - DATAFRAMES EN MEMORIA
+# ==============================================================================
+#
+# process_us_data / process_states_data dejan todo en int64, float64 u object.
+# compact_frame aplica el esquema canónico de cada dataset (covid_eda.schema):
+#   - 'count'    -> el entero con signo más pequeño que contiene los valores
+#   - 'rate'     -> float32
+#   - 'category' -> categórica (nombres de estado / región)
+#   - 'datetime' -> datetime64
+# Las columnas que no están en el esquema se eliminan. Si un conteo tiene NaN o decimales, o una tasa
+# no cabe en float32, se lanza ValueError en lugar de perder valores.
+
+import numpy as np
+import pandas as pd
+
+from covid_eda.schema import COLUMNS, kinds
+
+# Tipo lógico de cada columna según el esquema canónico (covid_eda.schema)
+COMPACT_SCHEMAS = {name: kinds(name) for name in COLUMNS}
+
+_INT_TYPES = (np.int8, np.int16, np.int32, np.int64)
+_FLOAT32_MAX = np.finfo(np.float32).max
+
+
+def _downcast_count(series):
+    """Entero con signo más pequeño que representa la serie sin pérdidas"""
+    values = series.to_numpy()
+    if series.isna().any():
+        raise ValueError(f"Columna '{series.name}': hay valores nulos en un conteo")
+    if values.dtype.kind == 'f' and not np.array_equal(values, np.round(values)):
+        raise ValueError(f"Columna '{series.name}': hay decimales en un conteo")
+    if values.dtype.kind not in 'iuf':
+        raise ValueError(f"Columna '{series.name}': tipo {values.dtype} no numérico")
+
+    if len(values) == 0:
+        return series.astype(np.int8)
+    low, high = values.min(), values.max()
+    for int_type in _INT_TYPES:
+        info = np.iinfo(int_type)
+        if info.min <= low and high <= info.max:
+            return series.astype(int_type)
+    raise ValueError(f"Columna '{series.name}': valores fuera del rango de int64")
+
+
+def _downcast_rate(series):
+    """float32, comprobando que los valores finitos no desbordan"""
+    values = pd.to_numeric(series).to_numpy(dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    if finite.size and np.abs(finite).max() > _FLOAT32_MAX:
+        raise ValueError(f"Columna '{series.name}': valores fuera del rango de float32")
+    return series.astype(np.float32)
+
+
+def memory_bytes(df):
+    """Memoria real ocupada por un DataFrame (incluye cadenas)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _format_bytes(n):
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024:
+            return f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def compact_frame(df, name, report=True):
+    """
+    Reducir la memoria de un dataset según COMPACT_SCHEMAS[name]
+
+    Args:
+        df (pd.DataFrame): Dataset procesado (no se modifica)
+        name (str): Clave de COMPACT_SCHEMAS
+        report (bool): Imprimir la memoria antes y después
+
+    Returns:
+        pd.DataFrame: Copia compactada, sólo con las columnas del esquema
+
+    Raises:
+        ValueError: Si alguna conversión perdería valores
+    """
+    if df.empty:
+        return df
+
+    schema = COMPACT_SCHEMAS[name]
+    before = memory_bytes(df)
+    dropped = [column for column in df.columns if column not in schema]
+
+    compacted = {}
+    for column, kind in schema.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if kind == 'count':
+            compacted[column] = _downcast_count(series)
+        elif kind == 'rate':
+            compacted[column] = _downcast_rate(series)
+        elif kind == 'category':
+            compacted[column] = series.astype('category')
+        else:
+            compacted[column] = pd.to_datetime(series)
+
+    result = pd.DataFrame(compacted, index=df.index)
+    if report:
+        after = memory_bytes(result)
+        saved = 100 * (1 - after / before) if before else 0
+        print(f"🗜️ {name}: {_format_bytes(before)} → {_format_bytes(after)} (-{saved:.0f}%)")
+        if dropped:
+            print(f"   • Columnas eliminadas: {', '.join(dropped)}")
+    return result
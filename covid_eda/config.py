@@ -0,0 +1,66 @@
+# ==============================================================================
+# CONFIGURACIÓN - RUTAS Y CONSTANTES DEL PROYECTO
+# ==============================================================================
+
+import os
+
+# API pública de COVID-19 (datos de Johns Hopkins University)
+API_BASE_URL = "https://disease.sh/v3/covid-19"
+API_TIMEOUT = 30
+
+# Endpoints utilizados por el pipeline
+US_HISTORICAL_ENDPOINT = "historical/USA?lastdays=all"
+US_HISTORICAL_WINDOW_ENDPOINT = "historical/USA?lastdays={days}"
+STATES_ENDPOINT = "states"
+COUNTRIES_ENDPOINT = "countries"
+COUNTRY_HISTORICAL_ENDPOINT = "historical/{countries}?lastdays={days}"   # admite lotes "A,B,C"
+US_STATES_LIST_ENDPOINT = "historical/usacounties"
+US_STATE_HISTORICAL_ENDPOINT = "historical/usacounties/{state}?lastdays={days}"
+
+# Descarga concurrente (ver covid_eda/ingest.py)
+FETCH_MAX_WORKERS = 16       # peticiones simultáneas (= tamaño del pool de conexiones)
+FETCH_RATE_LIMIT = 20        # peticiones por segundo como máximo
+FETCH_RETRIES = 3            # reintentos con backoff exponencial
+COUNTRY_BATCH_SIZE = 40      # países por petición en el endpoint por lotes
+
+# Directorios de salida
+DATA_DIR = 'data'
+RAW_DIR = os.path.join(DATA_DIR, 'raw')
+PARQUET_DIR = os.path.join(DATA_DIR, 'parquet')
+IMAGES_DIR = 'images'
+REPORTS_DIR = 'reports'
+
+# Archivos de datos
+US_HISTORICAL_RAW = os.path.join(RAW_DIR, 'us_historical.json')
+US_HISTORICAL_WINDOW_RAW = os.path.join(RAW_DIR, 'us_historical_window.json')
+STATES_RAW = os.path.join(RAW_DIR, 'states.json')
+COUNTRIES_HISTORICAL_RAW = os.path.join(RAW_DIR, 'countries_historical.json')
+US_STATES_HISTORICAL_RAW = os.path.join(RAW_DIR, 'us_states_historical.json')
+US_HISTORICAL_CSV = os.path.join(DATA_DIR, 'us_historical_clean.csv')
+STATES_CSV = os.path.join(DATA_DIR, 'states_clean.csv')
+SUMMARY_JSON = os.path.join(DATA_DIR, 'summary_stats.json')   # ver covid_eda/summary.py
+BENCH_DIR = os.path.join(DATA_DIR, 'bench')                    # resultados de covid_eda/bench.py
+RUNS_DIR = os.path.join(DATA_DIR, 'runs')                      # eventos JSON-lines de cada ejecución
+RUN_MANIFEST = os.path.join(DATA_DIR, 'run_manifest.json')     # resumen de la última ejecución
+PROFILE_DIR = os.path.join(DATA_DIR, 'profiles')               # perfiles de --profile (covid_eda/profiling.py)
+STATES_SNAPSHOT_DIR = os.path.join(DATA_DIR, 'snapshots', 'states')   # fotos del endpoint states (covid_eda/snapshots.py)
+SNAPSHOT_COMPACT_SEGMENTS = 8  # segmentos pequeños que disparan la compactación en segundo plano
+
+# Procesamiento por trozos (ver covid_eda/stream.py)
+STREAM_CHUNK_DAYS = 90       # días por trozo: acota la memoria del modo --stream
+
+# Informe PDF
+REPORT_PDF = os.path.join(REPORTS_DIR, 'COVID19_Executive_Report.pdf')
+REPORT_IMAGE_DPI = 200      # resolución de impresión de las figuras (ver covid_eda/report_images.py)
+REPORT_IMAGE_CACHE_DIR = os.path.join(DATA_DIR, 'cache', 'report')   # figuras ya escaladas
+
+# Caché local de respuestas HTTP (ver covid_eda/cache.py)
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, 'cache', 'http')
+CORRELATION_CACHE_DIR = os.path.join(DATA_DIR, 'cache', 'correlations')   # ver covid_eda/correlation.py
+HTTP_CACHE_TTL = 6 * 3600                # segundos sin revalidar
+HTTP_CACHE_MAX_BYTES = 256 * 1024 ** 2   # límite para el desalojo LRU
+
+# Resolución de las figuras estáticas
+FIGURE_DPI = 300
+RENDER_WORKERS = os.cpu_count() or 1     # procesos para generar figuras en paralelo
+DASHBOARD_MAX_POINTS = 1000              # puntos por serie en el dashboard (~ancho de un panel)
@@ -0,0 +1,361 @@
+# ==============================================================================
+# MOTOR DE CORRELACIONES - PEARSON, SPEARMAN, SIGNIFICACIÓN Y CACHÉ
+# ==============================================================================
+#
+# correlation_matrix calcula en una sola pasada, para todas las parejas de
+# columnas, los coeficientes de Pearson y de Spearman, su p-valor (t de
+# Student con n-2 grados de libertad, como scipy.stats) y un intervalo de
+# confianza bootstrap por percentiles. Los datos se estandarizan en float64 y
+# el resto (productos matriciales por parejas, remuestreos) va en float32.
+#
+# Los NaN se tratan por parejas (como DataFrame.corr): cada pareja usa las
+# filas en las que ambas columnas tienen valor. Los rangos de Spearman se
+# calculan una vez por columna; con NaN eso difiere ligeramente de pandas, que
+# vuelve a ordenar cada pareja.
+#
+# El resultado se guarda en data/cache/correlations/ con el hash de las
+# columnas y de los parámetros: el mapa de calor, las anotaciones de los
+# scatter plots y el resumen del informe lo calculan una sola vez.
+#
+# lagged_correlations mide el adelanto o retraso de cada serie regional frente
+# a una referencia (por defecto la suma de todas): una pasada vectorizada por
+# desfase, sobre todas las regiones a la vez.
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from covid_eda.cache import _atomic_write
+from covid_eda.config import CORRELATION_CACHE_DIR
+
+CORRELATION_VERSION = 1
+METHODS = ('pearson', 'spearman')
+BOOTSTRAP_SAMPLES = 1000
+CONFIDENCE = 0.95
+BOOTSTRAP_BLOCK = 2 ** 24        # elementos float32 por bloque de remuestreos (~64 MB)
+LAG_MAX_DAYS = 28
+LAG_MIN_OVERLAP = 30             # días en común mínimos para un desfase
+
+# Resultados ya calculados en este proceso (los hijos del pool los heredan)
+_MEMO = {}
+
+
+# ==============================================================================
+# NÚCLEO VECTORIZADO
+# ==============================================================================
+
+def _standardize(values):
+    """
+    Centrar y escalar cada columna en float64 y pasar a float32
+
+    Acepta (filas, columnas) o un lote (remuestreos, filas, columnas).
+
+    Returns:
+        tuple: (valores con 0 donde no hay dato, máscara de válidos)
+    """
+    valid = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(values, axis=-2, keepdims=True)
+        std = np.nanstd(values, axis=-2, keepdims=True)
+        scaled = (values - mean) / np.where(std > 0, std, 1)
+    return np.where(valid, scaled, 0).astype(np.float32), valid.astype(np.float32)
+
+
+def _pairwise_pearson(x, valid, weights=None):
+    """
+    Pearson de todas las parejas de columnas, por parejas de filas válidas
+
+    Args:
+        x (np.ndarray): (..., filas, columnas) con 0 donde no hay dato
+        valid (np.ndarray): Misma forma, 1 donde hay dato
+        weights (np.ndarray): (remuestreos, filas) veces que entra cada fila
+            en cada remuestreo bootstrap (None = una vez)
+
+    Returns:
+        tuple: (r, n) de forma (..., columnas, columnas)
+    """
+    if weights is None:
+        xw, vw = x, valid
+    else:
+        xw, vw = x * weights[..., None], valid * weights[..., None]
+    xt, vt = np.swapaxes(xw, -1, -2), np.swapaxes(vw, -1, -2)
+    n = vt @ valid
+    sx = xt @ valid                     # sx[i, j]: suma de x_i donde x_j también es válido
+    sxx = (xt * np.swapaxes(x, -1, -2)) @ valid
+    sxy = xt @ x
+    sy, syy = np.swapaxes(sx, -1, -2), np.swapaxes(sxx, -1, -2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sxy - sx * sy / n
+        denominator = np.sqrt(np.clip(sxx - sx * sx / n, 0, None) * np.clip(syy - sy * sy / n, 0, None))
+        r = np.clip(cov / denominator, -1, 1)
+    return r, n
+
+
+def _ranks(values):
+    """Rangos medios por columna (..., filas, columnas); los NaN siguen siendo NaN"""
+    from scipy.stats import rankdata
+
+    missing = np.isnan(values)
+    # Los NaN pasan a +inf: quedan los últimos y no alteran los rangos de los válidos
+    ranks = rankdata(np.where(missing, np.inf, values), axis=-2)
+    return np.where(missing, np.nan, ranks)
+
+
+def _p_values(r, n):
+    """p-valor bilateral de H0: r = 0 (t de Student con n-2 grados de libertad)"""
+    from scipy.special import stdtr
+
+    dof = n - 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = r * np.sqrt(dof / np.clip(1 - r * r, 1e-15, None))
+        p = 2 * stdtr(dof, -np.abs(t))
+    return np.where(dof > 0, p, np.nan)
+
+
+def _weighted_ranks(values, weights):
+    """
+    Rangos medios de cada fila dentro de cada remuestreo, sin reordenar
+
+    Un remuestreo bootstrap es la muestra original con cada fila repetida
+    weights[b, fila] veces. Con el orden original de cada columna, el rango de
+    una fila en el remuestreo es el peso acumulado de las filas menores más la
+    mitad de su grupo de empates: una suma acumulada en vez de una ordenación.
+
+    Returns:
+        np.ndarray: (remuestreos, filas, columnas) en float32, centrado y escalado
+    """
+    rows, columns = values.shape
+    ranks = np.empty((len(weights), rows, columns), dtype=np.float32)
+    for column in range(columns):
+        order = np.argsort(values[:, column], kind='stable')       # NaN al final
+        ordered = values[order, column]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        ends = np.r_[starts[1:], rows]
+        group = np.cumsum(np.r_[True, ordered[1:] != ordered[:-1]]) - 1
+        cumulative = np.zeros((len(weights), rows + 1), dtype=np.float32)
+        np.cumsum(weights[:, order], axis=1, out=cumulative[:, 1:])
+        below = cumulative[:, starts]
+        rank = below + (cumulative[:, ends] - below + 1) / 2
+        ranks[:, order, column] = (rank[:, group] - (rows + 1) / 2) / rows
+    return ranks
+
+
+def _bootstrap(values, methods, samples, confidence, seed):
+    """
+    Intervalos por percentiles de r para cada método
+
+    Cada remuestreo se representa con el número de veces que entra cada fila
+    en él, así que no se copian filas ni se vuelve a estandarizar ni a
+    ordenar: las sumas por parejas se ponderan con esos pesos.
+    """
+    rng = np.random.default_rng(seed)
+    rows, columns = values.shape
+    block = max(1, BOOTSTRAP_BLOCK // max(rows * columns, 1))
+    x, valid = _standardize(values)
+    draws = {method: [] for method in methods}
+    for start in range(0, samples, block):
+        size = min(block, samples - start)
+        drawn = rng.integers(0, rows, size=(size, rows)) + np.arange(size)[:, None] * rows
+        weights = np.bincount(drawn.ravel(), minlength=size * rows).reshape(size, rows).astype(np.float32)
+        for method in methods:
+            if method == 'spearman':
+                ranks = np.where(valid > 0, _weighted_ranks(values, weights), 0)
+                draws[method].append(_pairwise_pearson(ranks, valid, weights)[0])
+            else:
+                draws[method].append(_pairwise_pearson(x, valid, weights)[0])
+
+    tail = (1 - confidence) / 2 * 100
+    intervals = {}
+    for method in methods:
+        stacked = np.concatenate(draws[method])
+        percentile = np.nanpercentile if np.isnan(stacked).any() else np.percentile
+        intervals[method] = percentile(stacked, [tail, 100 - tail], axis=0)
+    return intervals
+
+
+def compute_correlations(values, methods=METHODS, bootstrap=BOOTSTRAP_SAMPLES,
+                         confidence=CONFIDENCE, seed=0):
+    """
+    Correlaciones de todas las parejas de columnas de una matriz
+
+    Args:
+        values (np.ndarray): (filas, columnas), NaN = sin dato
+        methods (iterable): Subconjunto de METHODS
+        bootstrap (int): Remuestreos para los intervalos (0 = sin intervalos)
+        confidence (float): Nivel de los intervalos
+        seed (int): Semilla de los remuestreos (resultados reproducibles)
+
+    Returns:
+        dict: método -> {'r', 'p', 'ci_low', 'ci_high'} (matrices) y 'n' (filas por pareja)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    results = {}
+    for method in methods:
+        data = _ranks(values) if method == 'spearman' else values
+        r, n = _pairwise_pearson(*_standardize(data))
+        np.fill_diagonal(r, 1.0)
+        p = _p_values(r, n)
+        np.fill_diagonal(p, np.nan)     # una columna consigo misma no se contrasta
+        results[method] = {'r': r, 'p': p}
+        results['n'] = n
+    if bootstrap:
+        for method, (low, high) in _bootstrap(values, methods, bootstrap, confidence, seed).items():
+            results[method]['ci_low'], results[method]['ci_high'] = low, high
+    return results
+
+
+# ==============================================================================
+# CORRELACIONES DE UN DATAFRAME (CON CACHÉ)
+# ==============================================================================
+
+def _matrix(array):
+    """Matriz de NumPy -> listas de float (NaN -> None) para el JSON, con 6 cifras significativas"""
+    return [[None if np.isnan(value) else float(f"{value:.6g}") for value in row] for row in array]
+
+
+def correlation_key(df, columns, methods=METHODS, bootstrap=BOOTSTRAP_SAMPLES,
+                    confidence=CONFIDENCE, seed=0):
+    """Hash de las columnas y de los parámetros (clave de la caché)"""
+    from covid_eda.figcache import hash_inputs
+
+    params = {'version': CORRELATION_VERSION, 'columns': list(columns), 'methods': list(methods),
+              'bootstrap': bootstrap, 'confidence': confidence, 'seed': seed}
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8'))
+    digest.update(hash_inputs({'df': df}, {'df': list(columns)}).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def correlation_matrix(df, columns, methods=METHODS, bootstrap=BOOTSTRAP_SAMPLES,
+                       confidence=CONFIDENCE, seed=0, cache_dir=CORRELATION_CACHE_DIR):
+    """
+    Correlaciones entre columnas de un DataFrame, reutilizando las ya calculadas
+
+    Args:
+        df (pd.DataFrame): Datos (una fila por observación)
+        columns (list): Columnas a correlacionar (las que no existen se ignoran)
+        cache_dir (str): Caché en disco (None = sólo la de este proceso)
+
+    Returns:
+        dict: Artefacto JSON con columns, n, bootstrap, confidence y, por método,
+            las matrices r, p, ci_low y ci_high
+    """
+    columns = [column for column in columns if column in df.columns]
+    key = correlation_key(df, columns, methods, bootstrap, confidence, seed)
+    if key in _MEMO:
+        return _MEMO[key]
+
+    path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    if path and os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                _MEMO[key] = json.load(f)
+            return _MEMO[key]
+        except (OSError, ValueError):
+            pass
+
+    values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+    computed = compute_correlations(values, methods, bootstrap, confidence, seed)
+    result = {'version': CORRELATION_VERSION, 'key': key, 'columns': columns,
+              'n': _matrix(computed['n']), 'bootstrap': bootstrap, 'confidence': confidence}
+    for method in methods:
+        result[method] = {stat: _matrix(matrix) for stat, matrix in computed[method].items()}
+
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        _atomic_write(path, json.dumps(result, ensure_ascii=False).encode('utf-8'))
+    _MEMO[key] = result
+    return result
+
+
+def clear_memo():
+    """Olvidar los resultados de este proceso (la caché en disco se mantiene)"""
+    _MEMO.clear()
+
+
+def matrix_frame(result, method='pearson', stat='r'):
+    """Una matriz del resultado como DataFrame etiquetado (p. ej. para el mapa de calor)"""
+    return pd.DataFrame(result[method][stat], index=result['columns'],
+                        columns=result['columns'], dtype=float)
+
+
+def pair(result, x, y, method='pearson'):
+    """r, p e intervalo de una pareja de columnas"""
+    i, j = result['columns'].index(x), result['columns'].index(y)
+    return {stat: matrix[i][j] for stat, matrix in result[method].items()}
+
+
+def strongest_pairs(result, method='pearson', limit=5):
+    """Parejas distintas ordenadas por |r| descendente"""
+    columns = result['columns']
+    pairs = [(columns[i], columns[j], pair(result, columns[i], columns[j], method))
+             for i in range(len(columns)) for j in range(i + 1, len(columns))]
+    pairs = [item for item in pairs if item[2]['r'] is not None]
+    return sorted(pairs, key=lambda item: abs(item[2]['r']), reverse=True)[:limit]
+
+
+# ==============================================================================
+# CORRELACIÓN CRUZADA CON DESFASE ENTRE SERIES REGIONALES
+# ==============================================================================
+
+def lagged_correlations(df, value='cases_7day_avg', by='region', max_lag=LAG_MAX_DAYS,
+                        reference=None, min_overlap=LAG_MIN_OVERLAP):
+    """
+    Desfase de cada serie regional respecto a una serie de referencia
+
+    Un desfase positivo L significa que la región va L días por detrás de la
+    referencia: su valor en t+L se parece al de la referencia en t.
+
+    Args:
+        df (pd.DataFrame): Formato largo con `by`, 'date' y `value`
+        value (str): Columna a comparar
+        by (str): Columna de región
+        max_lag (int): Desfase máximo en días, en ambos sentidos
+        reference (pd.Series): Serie indexada por fecha (None = suma de las regiones)
+        min_overlap (int): Días en común mínimos para considerar un desfase
+
+    Returns:
+        pd.DataFrame: Una fila por región con best_lag, best_r, r_lag0 y overlap_days
+    """
+    wide = df.pivot_table(index='date', columns=by, values=value, aggfunc='sum', observed=True)
+    wide = wide.asfreq('D') if isinstance(wide.index, pd.DatetimeIndex) else wide
+    if reference is None:
+        reference = wide.sum(axis=1, min_count=1)
+    reference = reference.reindex(wide.index).to_numpy(dtype=np.float64, na_value=np.nan)
+    x = wide.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # Estandarizar una vez por serie: las sumas por desfase no pierden precisión en float32
+    x, valid_x = _standardize(x)
+    ref, valid_ref = (array[:, 0] for array in _standardize(reference[:, None]))
+
+    days = len(wide)
+    lags = np.arange(-max_lag, max_lag + 1)
+    r = np.full((len(lags), wide.shape[1]), np.nan, dtype=np.float32)
+    overlap = np.zeros_like(r)
+    for row, lag in enumerate(lags):
+        if abs(lag) >= days:
+            continue
+        a = slice(0, days - lag) if lag >= 0 else slice(-lag, days)
+        b = slice(lag, days) if lag >= 0 else slice(0, days + lag)
+        ra, va, xb, vb = ref[a], valid_ref[a], x[b], valid_x[b]
+        n = va @ vb
+        sa, sb = ra @ vb, va @ xb
+        saa, sbb, sab = (ra * ra) @ vb, va @ (xb * xb), ra @ xb
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = sab - sa * sb / n
+            denominator = np.sqrt(np.clip(saa - sa * sa / n, 0, None) * np.clip(sbb - sb * sb / n, 0, None))
+            r[row] = np.where(n >= min_overlap, cov / denominator, np.nan)
+        overlap[row] = n
+
+    has_value = ~np.isnan(r).all(axis=0)
+    best = np.argmax(np.where(np.isnan(r), -np.inf, r), axis=0)
+    columns = np.arange(r.shape[1])
+    return pd.DataFrame({
+        by: wide.columns.astype(str),
+        'best_lag': np.where(has_value, lags[best], np.nan),
+        'best_r': np.where(has_value, r[best, columns], np.nan),
+        'r_lag0': r[max_lag],
+        'overlap_days': overlap[max_lag].astype(np.int64),
+    })
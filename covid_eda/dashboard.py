@@ -0,0 +1,215 @@
+# ==============================================================================
+# EXPORTADOR DEL DASHBOARD INTERACTIVO
+# ==============================================================================
+#
+# fig.write_html incrusta plotly.js completo (~3.5 MB) en cada archivo y
+# escribe cada fecha y cada valor como texto JSON. Este exportador genera:
+#
+#   images/interactive_dashboard.html      página de entrada
+#   images/dashboard/index.html            la misma página, para servir el directorio
+#   images/dashboard/plotly-<v>.min.js     una única copia local de plotly.js
+#   images/dashboard/panels/<panel>.js     un archivo por panel
+#
+# Los arrays numéricos y de fechas viajan como typed arrays en base64
+# ({"__typed__": "f8", "b64": ...}); las fechas como milisegundos desde epoch
+# sobre un eje de tipo 'date'. Con lazy=True cada panel se carga al entrar en
+# pantalla. Los paneles son .js (no .json) para que la página funcione también
+# abierta como archivo local, donde fetch() no está permitido.
+
+import base64
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+ASSETS_DIR = 'dashboard'
+
+_INT_CODES = (('i1', np.int8), ('i2', np.int16), ('i4', np.int32))
+
+_PAGE = """<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+  body {{ font-family: sans-serif; margin: 24px; }}
+  .grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(560px, 1fr)); gap: 16px; }}
+  .panel {{ min-height: {height}px; }}
+</style>
+<script src="{assets}{plotly_js}"></script>
+</head>
+<body>
+<h1>{title}</h1>
+<div class="grid">
+{divs}
+</div>
+<script>
+var TYPED = {{i1: Int8Array, i2: Int16Array, i4: Int32Array, f4: Float32Array, f8: Float64Array}};
+function decode(value) {{
+  if (Array.isArray(value)) return value.map(decode);
+  if (value === null || typeof value !== 'object') return value;
+  if (value.__typed__) {{
+    var raw = atob(value.b64), bytes = new Uint8Array(raw.length);
+    for (var i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+    return new TYPED[value.__typed__](bytes.buffer);
+  }}
+  var out = {{}};
+  for (var key in value) out[key] = decode(value[key]);
+  return out;
+}}
+function registerPanel(id, spec) {{
+  Plotly.newPlot(id, decode(spec.data), decode(spec.layout), {{responsive: true}});
+}}
+{loader}
+</script>
+</body>
+</html>
+"""
+
+_LAZY_LOADER = """var observer = new IntersectionObserver(function (entries) {{
+  entries.forEach(function (entry) {{
+    if (!entry.isIntersecting) return;
+    observer.unobserve(entry.target);
+    var script = document.createElement('script');
+    script.src = '{assets}panels/' + entry.target.id + '.js';
+    document.body.appendChild(script);
+  }});
+}}, {{rootMargin: '200px'}});
+document.querySelectorAll('.panel').forEach(function (div) {{ observer.observe(div); }});"""
+
+
+def _as_dates(values):
+    """Array de fechas datetime64, o None si los valores no son fechas"""
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        return values
+    if values.dtype == object and len(values) and all(hasattr(v, 'year') for v in values[:5]):
+        try:
+            return pd.to_datetime(values).to_numpy()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _encode_array(values):
+    """Array numérico o de fechas -> typed array en base64 (None si no aplica)"""
+    dates = _as_dates(values)
+    values = np.asarray(values) if dates is None else dates
+    if values.dtype.kind == 'M':
+        # Milisegundos desde epoch: plotly.js los interpreta como fechas en ejes 'date'
+        values = values.astype('datetime64[ms]').astype('int64').astype('float64')
+    elif values.dtype.kind in 'iub':
+        values = values.astype('int64')
+        for code, dtype in _INT_CODES:
+            info = np.iinfo(dtype)
+            if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+                return {'__typed__': code, 'b64': _b64(values.astype(dtype))}
+        values = values.astype('float64')
+    elif values.dtype == np.float32:
+        return {'__typed__': 'f4', 'b64': _b64(values)}
+    elif values.dtype.kind != 'f':
+        return None
+    return {'__typed__': 'f8', 'b64': _b64(values.astype('float64'))}
+
+
+def _b64(values):
+    return base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')
+
+
+def _encode(obj):
+    """Recorrer la especificación de la figura codificando los arrays"""
+    if isinstance(obj, dict):
+        return {key: _encode(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_encode(value) for value in obj]
+    if isinstance(obj, (np.ndarray, pd.Series, pd.Index)):
+        encoded = _encode_array(obj)
+        return encoded if encoded is not None else np.asarray(obj).tolist()
+    return obj
+
+
+def figure_spec(fig):
+    """Especificación {data, layout} de una figura de plotly con arrays compactos"""
+    from plotly.utils import PlotlyJSONEncoder
+
+    spec = fig.to_plotly_json()
+    data = _encode(spec['data'])
+    # Los ejes x con fechas codificadas como números deben declararse de tipo 'date'
+    layout = spec['layout']
+    for trace in spec['data']:
+        if _as_dates(trace.get('x', [])) is not None:
+            axis = 'xaxis' + trace.get('xaxis', 'x')[1:]
+            layout.setdefault(axis, {}).setdefault('type', 'date')
+    return json.dumps({'data': data, 'layout': layout}, cls=PlotlyJSONEncoder, separators=(',', ':'))
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def _ensure_plotly_js(assets_dir):
+    """Copia local compartida de plotly.js (sólo se escribe si falta esa versión)"""
+    from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+    filename = f"plotly-{get_plotlyjs_version()}.min.js"
+    path = os.path.join(assets_dir, filename)
+    if not os.path.exists(path):
+        _write(path, get_plotlyjs())
+    return filename
+
+
+def dashboard_assets(path, panel_ids, lazy=True):
+    """
+    Archivos que export_dashboard escribe junto a la página `path`
+
+    plotly.js se devuelve como patrón glob (el nombre lleva la versión) para no
+    tener que importar plotly sólo para comprobar que existe.
+    """
+    assets_dir = os.path.join(os.path.dirname(path), ASSETS_DIR)
+    assets = [os.path.join(assets_dir, 'index.html'), os.path.join(assets_dir, 'plotly-*.min.js')]
+    if lazy:
+        assets += [os.path.join(assets_dir, 'panels', f"{panel_id}.js") for panel_id in panel_ids]
+    return assets
+
+
+def export_dashboard(panels, path, title, lazy=True, height=420):
+    """
+    Exportar un dashboard de varios paneles con plotly.js compartido
+
+    Args:
+        panels (list): Tuplas (id, go.Figure); el id se usa como nombre de archivo
+        path (str): Página de entrada (p.ej. images/interactive_dashboard.html)
+        title (str): Título de la página
+        lazy (bool): Cargar cada panel al hacerse visible (si no, van en la página)
+        height (int): Altura mínima de cada panel en píxeles
+
+    Returns:
+        list: Rutas escritas
+    """
+    assets_dir = os.path.join(os.path.dirname(path), ASSETS_DIR)
+    os.makedirs(os.path.join(assets_dir, 'panels'), exist_ok=True)
+    plotly_js = _ensure_plotly_js(assets_dir)
+
+    written = []
+    specs = {}
+    for panel_id, fig in panels:
+        specs[panel_id] = figure_spec(fig)
+        if lazy:
+            panel_path = os.path.join(assets_dir, 'panels', f"{panel_id}.js")
+            _write(panel_path, f"registerPanel({json.dumps(panel_id)}, {specs[panel_id]});\n")
+            written.append(panel_path)
+
+    divs = '\n'.join(f'<div class="panel" id="{panel_id}"></div>' for panel_id in specs)
+    for page_path, assets in ((path, f"{ASSETS_DIR}/"), (os.path.join(assets_dir, 'index.html'), '')):
+        if lazy:
+            loader = _LAZY_LOADER.format(assets=assets)
+        else:
+            loader = '\n'.join(f"registerPanel({json.dumps(panel_id)}, {spec});"
+                               for panel_id, spec in specs.items())
+        _write(page_path, _PAGE.format(title=title, height=height, assets=assets,
+                                       plotly_js=plotly_js, divs=divs, loader=loader))
+        written.append(page_path)
+    return written
+
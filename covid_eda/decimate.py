@@ -0,0 +1,123 @@
+# ==============================================================================
+# DECIMACIÓN DE SERIES TEMPORALES PARA EL RENDER
+# ==============================================================================
+#
+# Dibujar más puntos que píxeles tiene el eje sólo añade artistas (y bytes en
+# el HTML) sin cambiar la imagen. Antes de dibujar, cada serie se reduce a
+# aproximadamente el ancho en píxeles del eje:
+#   - lttb_indices:   Largest-Triangle-Three-Buckets, para líneas
+#   - minmax_indices: envolvente mínimo/máximo por bucket, para barras
+# Los dos conservan los picos: LTTB incluye siempre el máximo y el mínimo
+# global y la envolvente conserva el extremo de cada bucket.
+# Con series más cortas que el objetivo los datos se dibujan sin tocar.
+
+import numpy as np
+import pandas as pd
+
+
+def _as_float(values):
+    """Valores numéricos o fechas como float64 (las fechas en nanosegundos)"""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('int64').to_numpy(dtype='float64')
+    return values.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Índices de los puntos que conserva Largest-Triangle-Three-Buckets
+
+    Args:
+        x (array-like): Eje x (numérico o fechas), creciente
+        y (array-like): Valores; los NaN se descartan
+        n_out (int): Número de puntos objetivo
+
+    Returns:
+        np.ndarray: Índices posicionales ordenados
+    """
+    x, y = _as_float(x), _as_float(y)
+    valid = np.flatnonzero(~np.isnan(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+    x, y = x[valid], y[valid]
+
+    # n_out - 2 buckets entre el primer y el último punto, que se conservan siempre
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i == n_out - 3:
+            next_x, next_y = x[-1], y[-1]
+        else:
+            next_hi = edges[i + 2]
+            next_x, next_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        # Área del triángulo (ancla, candidato, media del siguiente bucket)
+        area = np.abs((x[anchor] - next_x) * (y[lo:hi] - y[anchor])
+                      - (x[anchor] - x[lo:hi]) * (next_y - y[anchor]))
+        anchor = lo + int(np.argmax(area))
+        selected[i + 1] = anchor
+
+    peaks = [int(np.argmax(y)), int(np.argmin(y))]
+    return valid[np.union1d(selected, peaks)]
+
+
+def minmax_indices(y, n_buckets):
+    """
+    Índices del mínimo y el máximo de cada bucket (envolvente de la serie)
+
+    Args:
+        y (array-like): Valores; los NaN se ignoran
+        n_buckets (int): Número de buckets (se conservan hasta 2 puntos por bucket)
+
+    Returns:
+        np.ndarray: Índices posicionales ordenados
+    """
+    y = _as_float(y)
+    n = len(y)
+    if n_buckets < 1 or 2 * n_buckets >= n:
+        return np.flatnonzero(~np.isnan(y))
+
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    blocks = np.full(n_buckets * size, np.nan)
+    blocks[:n] = y
+    blocks = blocks.reshape(n_buckets, size)
+    missing = np.isnan(blocks)
+    offsets = np.arange(n_buckets) * size
+    highs = offsets + np.argmax(np.where(missing, -np.inf, blocks), axis=1)
+    lows = offsets + np.argmin(np.where(missing, np.inf, blocks), axis=1)
+
+    indices = np.union1d(highs, lows)
+    return indices[~np.isnan(y[indices])]
+
+
+def decimate(x, y, n_out, method='lttb'):
+    """
+    Reducir una serie a unos n_out puntos antes de dibujarla
+
+    Args:
+        x (pd.Series): Eje x
+        y (pd.Series): Valores
+        n_out (int): Puntos objetivo (p.ej. el ancho en píxeles del eje)
+        method (str): 'lttb' (líneas) o 'minmax' (barras)
+
+    Returns:
+        tuple: (x, y) con las filas conservadas
+    """
+    if method == 'lttb':
+        indices = lttb_indices(x, y, n_out)
+    elif method == 'minmax':
+        indices = minmax_indices(y, n_out // 2)
+    else:
+        raise ValueError(f"Método de decimación desconocido: {method}")
+    if len(indices) == len(y):
+        return x, y
+    return x.iloc[indices], y.iloc[indices]
+
+
+def axis_pixels(ax, dpi):
+    """Ancho en píxeles que tendrá un eje de matplotlib al guardarlo con este dpi"""
+    return max(int(ax.get_position().width * ax.figure.get_figwidth() * dpi), 3)
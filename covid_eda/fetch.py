@@ -0,0 +1,212 @@
+# ==============================================================================
+# ETAPA FETCH - OBTENCIÓN DE DATOS DE LA API COVID-19
+# ==============================================================================
+
+import json
+import os
+import random
+import time
+from datetime import datetime
+
+from covid_eda.cache import ResponseCache
+from covid_eda.config import (API_BASE_URL, API_TIMEOUT, RAW_DIR, STATES_ENDPOINT,
+                              STATES_RAW, US_HISTORICAL_ENDPOINT, US_HISTORICAL_RAW,
+                              US_HISTORICAL_WINDOW_ENDPOINT, US_HISTORICAL_WINDOW_RAW)
+
+
+# Respuestas que merece la pena reintentar (límite de peticiones y errores del servidor)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def send_with_retry(http, url, timeout=API_TIMEOUT, headers=None, retries=0,
+                    backoff=0.5, rate_limiter=None):
+    """
+    Hacer un GET reintentando errores transitorios con backoff exponencial
+
+    Args:
+        http: Módulo requests o una requests.Session (pool de conexiones compartido)
+        url (str): URL completa
+        retries (int): Reintentos tras el primer intento
+        backoff (float): Espera base en segundos; se duplica en cada reintento
+        rate_limiter (RateLimiter): Limitador compartido entre hilos (opcional)
+
+    Returns:
+        requests.Response: Última respuesta obtenida
+    """
+    import requests
+
+    for attempt in range(retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            response = http.get(url, timeout=timeout, headers=headers)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+            # Respetar Retry-After (en segundos) si el servidor lo indica
+            retry_after = response.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else backoff * 2 ** attempt
+
+        # Jitter para que los hilos no reintenten todos a la vez
+        time.sleep(delay * (1 + 0.25 * random.random()))
+
+
+def get_covid_data(endpoint, timeout=API_TIMEOUT, use_cache=True, cache=None,
+                   offline=False, base_url=API_BASE_URL, session=None, retries=0,
+                   rate_limiter=None, verbose=True):
+    """
+    Obtener datos de la API COVID-19
+
+    Con la caché activada, una respuesta fresca se sirve desde disco sin tocar
+    la red; una caducada se revalida con ETag/Last-Modified. En modo offline
+    sólo se sirve desde la caché (aunque la entrada haya caducado).
+
+    Args:
+        endpoint (str): Endpoint de la API, p.ej. "historical/USA?lastdays=all"
+        timeout (int): Tiempo máximo de espera en segundos
+        use_cache (bool): Usar la caché local de respuestas
+        cache (ResponseCache): Caché a usar (por defecto la de data/cache/http)
+        offline (bool): No hacer peticiones de red
+        base_url (str): URL base de la API (configurable para pruebas locales)
+        session (requests.Session): Sesión con pool de conexiones a reutilizar
+        retries (int): Reintentos ante errores transitorios (ver send_with_retry)
+        rate_limiter (RateLimiter): Limitador de peticiones compartido
+        verbose (bool): Imprimir una línea por petición
+
+    Returns:
+        dict | list | None: Respuesta JSON de la API o None si hubo un error
+    """
+    url = f"{base_url}/{endpoint}"
+    if use_cache and cache is None:
+        cache = ResponseCache()
+    entry = cache.lookup(url) if use_cache else None
+
+    if entry is not None and (entry['fresh'] or offline):
+        if verbose:
+            print(f"🗃️ Datos en caché: {endpoint}")
+        return json.loads(cache.load(url))
+
+    if offline:
+        print(f"❌ Modo offline: {endpoint} no está en caché")
+        return None
+
+    # Import diferido: sólo la etapa fetch necesita requests
+    import requests
+
+    try:
+        if verbose:
+            print(f"📡 Obteniendo datos de: {endpoint}")
+        headers = cache.conditional_headers(entry) if use_cache else {}
+        response = send_with_retry(session or requests, url, timeout=timeout, headers=headers,
+                                   retries=retries, rate_limiter=rate_limiter)
+
+        if response.status_code == 304 and entry is not None:
+            if verbose:
+                print(f"🗃️ Sin cambios (304), usando caché: {endpoint}")
+            cache.touch(url)
+            return json.loads(cache.load(url))
+
+        response.raise_for_status()
+        data = response.json()
+        if use_cache:
+            cache.store(url, response.content,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'))
+        return data
+    except Exception as e:
+        print(f"❌ Error ({endpoint}): {e}")
+        if entry is not None:
+            print(f"⚠️ Usando la copia en caché caducada de: {endpoint}")
+            return json.loads(cache.load(url))
+        return None
+
+
+def save_raw(payload, path):
+    """Guardar la respuesta JSON cruda de la API"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f)
+
+
+def load_raw(path):
+    """Cargar una respuesta JSON cruda guardada previamente (None si no existe)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def fetch_us_window(since, use_cache=True, cache=None, offline=False, base_url=API_BASE_URL):
+    """
+    Descargar sólo los días del histórico de EE.UU. posteriores a `since`
+
+    Primero se pide lastdays=1 para conocer la última fecha publicada y después
+    la ventana lastdays=N justa (más un día de solape para comprobar la
+    continuidad con lo guardado).
+
+    Args:
+        since (datetime): Última fecha guardada localmente
+        base_url (str): URL base de la API
+
+    Returns:
+        dict | None: Respuesta de la API con el timeline de la ventana
+    """
+    probe = get_covid_data(US_HISTORICAL_WINDOW_ENDPOINT.format(days=1), use_cache=use_cache,
+                           cache=cache, offline=offline, base_url=base_url)
+    if not probe or 'timeline' not in probe or not probe['timeline']['cases']:
+        return None
+
+    latest = datetime.strptime(list(probe['timeline']['cases'])[-1], '%m/%d/%y')
+    missing = (latest.date() - since.date()).days
+    if missing <= 0:
+        print(f"✅ Histórico EE.UU. al día ({since.date()})")
+        return probe
+
+    print(f"🔄 Descarga incremental: {missing} días nuevos desde {since.date()}")
+    return get_covid_data(US_HISTORICAL_WINDOW_ENDPOINT.format(days=missing + 1),
+                          use_cache=use_cache, cache=cache, offline=offline, base_url=base_url)
+
+
+def fetch_all(use_cache=True, offline=False, since=None, base_url=API_BASE_URL):
+    """
+    Descargar los datos históricos de EE.UU. y los datos actuales por estado
+
+    Las respuestas se guardan en data/raw/ para que la etapa transform pueda
+    ejecutarse por separado sin volver a llamar a la API.
+
+    Args:
+        use_cache (bool): Usar la caché local de respuestas HTTP
+        offline (bool): Servir sólo desde la caché, sin red
+        since (datetime): Si se indica, descargar sólo la ventana de días
+            posteriores (modo incremental) en lugar del histórico completo
+        base_url (str): URL base de la API (configurable para pruebas locales)
+
+    Returns:
+        tuple: (us_historical, states_current) tal como los devuelve la API
+    """
+    os.makedirs(RAW_DIR, exist_ok=True)
+    cache = ResponseCache() if use_cache else None
+
+    if since is not None:
+        us_historical = fetch_us_window(since, use_cache=use_cache, cache=cache, offline=offline,
+                                        base_url=base_url)
+        us_raw_path = US_HISTORICAL_WINDOW_RAW
+    else:
+        us_historical = get_covid_data(US_HISTORICAL_ENDPOINT, use_cache=use_cache,
+                                       cache=cache, offline=offline, base_url=base_url)
+        us_raw_path = US_HISTORICAL_RAW
+    states_current = get_covid_data(STATES_ENDPOINT, use_cache=use_cache,
+                                    cache=cache, offline=offline, base_url=base_url)
+    if cache is not None:
+        cache.flush()
+
+    if us_historical:
+        save_raw(us_historical, us_raw_path)
+    if states_current:
+        save_raw(states_current, STATES_RAW)
+
+    return us_historical, states_current
@@ -0,0 +1,140 @@
+# ==============================================================================
+# CACHÉ DE FIGURAS - RENDER DIRIGIDO POR CONTENIDO
+# ==============================================================================
+#
+# Cada figura tiene una clave formada por dos hashes:
+#   - datos: el contenido de las columnas que la figura lee (FIGURE_INPUTS)
+#   - spec:  nombre, archivo, columnas, dpi, estilo, FIGURE_SPEC_VERSION, código
+#            de la función y de los helpers y módulos que usan las figuras
+# Si la clave coincide con la del último render y el archivo (y sus recursos,
+# p.ej. images/dashboard/) sigue en disco, la figura se reutiliza sin volver a
+# dibujarla. Así, cuando sólo cambia la serie
+# temporal, las figuras por estado no cuestan nada.
+#
+# images/render_manifest.json guarda la clave de cada figura y, para la última
+# ejecución, qué figuras se regeneraron y por qué.
+
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import os
+import time
+
+import pandas as pd
+
+from covid_eda.cache import _atomic_write
+
+MANIFEST_FILE = 'render_manifest.json'
+
+# Versión de la spec: subirla invalida todas las figuras guardadas cuando la
+# salida cambia sin tocar el código (p.ej. al actualizar matplotlib o plotly)
+FIGURE_SPEC_VERSION = 1
+
+# Motivos de regeneración que se registran en el manifiesto
+REASON_NEW = 'sin render previo'
+REASON_MISSING = 'archivo ausente'
+REASON_DATA = 'datos cambiados'
+REASON_SPEC = 'spec cambiada'
+REASON_FORCED = 'forzado'
+
+
+def hash_inputs(frames, inputs):
+    """
+    Hash del contenido de las columnas que lee una figura
+
+    Args:
+        frames (dict): nombre -> DataFrame ('us', 'states')
+        inputs (dict): nombre -> columnas leídas (las que no existen se ignoran)
+    """
+    digest = hashlib.sha256()
+    for frame_name in sorted(inputs):
+        df = frames[frame_name]
+        for column in inputs[frame_name]:
+            if column not in df.columns:
+                continue
+            digest.update(f"{frame_name}.{column}".encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(df[column], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def hash_sources(*objects):
+    """Hash del código fuente de funciones o módulos (una vez por proceso)"""
+    digest = hashlib.sha256()
+    for obj in objects:
+        try:
+            source = inspect.getsource(obj)
+        except (OSError, TypeError):
+            source = getattr(obj, '__qualname__', getattr(obj, '__name__', repr(obj)))
+        digest.update(source.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def hash_spec(name, filename, plot, inputs, dpi, style, helpers=()):
+    """
+    Hash de todo lo que define la figura además de los datos
+
+    Args:
+        helpers (tuple): Funciones y módulos que usa la figura además de `plot`
+    """
+    spec = {'name': name, 'filename': filename, 'inputs': inputs, 'dpi': dpi,
+            'style': style, 'version': FIGURE_SPEC_VERSION, 'source': hash_sources(plot),
+            'helpers': hash_sources(*helpers)}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class RenderManifest:
+    """
+    Manifiesto de figuras generadas en un directorio de salida
+
+    Args:
+        output_dir (str): Directorio de las figuras (el manifiesto vive dentro)
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.figures = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.figures = json.load(f).get('figures', {})
+            except (OSError, ValueError):
+                self.figures = {}
+        self.last_run = {}
+
+    def check(self, name, path, data_hash, spec_hash, force=False, assets=()):
+        """
+        Motivo por el que hay que regenerar la figura, o None si se puede reutilizar
+
+        Args:
+            assets (iterable): Otros archivos (o patrones glob) que la figura
+                necesita además de `path`, p.ej. los de images/dashboard/
+        """
+        entry = self.figures.get(name)
+        if force:
+            return REASON_FORCED
+        if entry is None:
+            return REASON_NEW
+        if not os.path.exists(path) or not all(glob.glob(asset) for asset in assets):
+            return REASON_MISSING
+        if entry['spec_hash'] != spec_hash:
+            return REASON_SPEC
+        if entry['data_hash'] != data_hash:
+            return REASON_DATA
+        return None
+
+    def record(self, name, path, data_hash, spec_hash, status, reason=None, seconds=0.0):
+        """Registrar el resultado de una figura en esta ejecución"""
+        if status == 'rebuilt':
+            self.figures[name] = {'file': os.path.basename(path), 'data_hash': data_hash,
+                                  'spec_hash': spec_hash, 'rendered_at': time.time()}
+        elif status == 'skipped':
+            self.figures.pop(name, None)
+        self.last_run[name] = {'status': status, 'reason': reason, 'seconds': round(seconds, 3)}
+
+    def save(self):
+        manifest = {'figures': self.figures,
+                    'last_run': {'finished_at': time.time(), 'figures': self.last_run}}
+        _atomic_write(self.path, json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
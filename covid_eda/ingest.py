@@ -0,0 +1,212 @@
+# ==============================================================================
+# INGESTA CONCURRENTE - HISTÓRICOS POR PAÍS Y POR ESTADO DE EE.UU.
+# ==============================================================================
+#
+# Las peticiones se reparten en un ThreadPoolExecutor que comparte una única
+# requests.Session (pool de conexiones keep-alive) y un limitador de peticiones
+# por segundo. Cada petición pasa por get_covid_data, así que reutiliza la caché
+# HTTP y los reintentos con backoff. Para los países se usa el endpoint por
+# lotes de la API (historical/A,B,C), con lo que cientos de países son unas
+# pocas peticiones; los estados no tienen endpoint por lotes y van en paralelo.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from covid_eda.cache import ResponseCache
+from covid_eda.config import (API_BASE_URL, COUNTRIES_ENDPOINT, COUNTRY_BATCH_SIZE,
+                              COUNTRY_HISTORICAL_ENDPOINT, FETCH_MAX_WORKERS, FETCH_RATE_LIMIT,
+                              FETCH_RETRIES, US_STATE_HISTORICAL_ENDPOINT, US_STATES_LIST_ENDPOINT)
+from covid_eda.fetch import get_covid_data
+
+
+class RateLimiter:
+    """
+    Token bucket compartido entre hilos: como máximo `rate` peticiones por segundo
+
+    Args:
+        rate (float): Peticiones por segundo
+        burst (int): Peticiones que se pueden hacer seguidas sin esperar
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Esperar hasta que haya un token disponible"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # El token se reserva aunque el saldo quede negativo: cada hilo
+            # espera exactamente lo que le corresponde fuera del lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def make_session(pool_size=FETCH_MAX_WORKERS):
+    """requests.Session con un pool de conexiones del tamaño de la concurrencia"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch_many(endpoints, max_workers=FETCH_MAX_WORKERS, rate=FETCH_RATE_LIMIT,
+               retries=FETCH_RETRIES, use_cache=True, offline=False, base_url=API_BASE_URL):
+    """
+    Descargar varios endpoints en paralelo con concurrencia acotada
+
+    Args:
+        endpoints (list): Endpoints de la API
+        max_workers (int): Peticiones simultáneas como máximo
+        rate (float): Peticiones por segundo como máximo
+        retries (int): Reintentos por petición ante errores transitorios
+        use_cache (bool): Usar la caché local de respuestas HTTP
+        offline (bool): Servir sólo desde la caché
+        base_url (str): URL base de la API
+
+    Returns:
+        dict: endpoint -> respuesta JSON (None si falló)
+    """
+    endpoints = list(dict.fromkeys(endpoints))
+    if not endpoints:
+        return {}
+
+    cache = ResponseCache() if use_cache else None
+    rate_limiter = RateLimiter(rate)
+    session = None if offline else make_session(max_workers)
+
+    results = {}
+    start = time.perf_counter()
+    print(f"📡 Descargando {len(endpoints)} endpoints ({max_workers} en paralelo)...")
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(get_covid_data, endpoint, use_cache=use_cache, cache=cache,
+                                offline=offline, base_url=base_url, session=session,
+                                retries=retries, rate_limiter=rate_limiter, verbose=False): endpoint
+                for endpoint in endpoints
+            }
+            step = max(1, len(futures) // 10)
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]] = future.result()
+                if done % step == 0 or done == len(futures):
+                    print(f"   ⏳ {done}/{len(futures)} completados")
+    finally:
+        if session is not None:
+            session.close()
+        if cache is not None:
+            cache.flush()
+
+    failed = sum(1 for payload in results.values() if payload is None)
+    print(f"✅ {len(endpoints) - failed}/{len(endpoints)} endpoints en "
+          f"{time.perf_counter() - start:.2f}s")
+    return results
+
+
+# ==============================================================================
+# HISTÓRICOS POR PAÍS
+# ==============================================================================
+
+def list_countries(**kwargs):
+    """Códigos ISO3 de todos los países disponibles en la API"""
+    countries = get_covid_data(COUNTRIES_ENDPOINT, use_cache=kwargs.get('use_cache', True),
+                               offline=kwargs.get('offline', False),
+                               base_url=kwargs.get('base_url', API_BASE_URL))
+    if not countries:
+        return []
+    return [c['countryInfo']['iso3'] for c in countries if c.get('countryInfo', {}).get('iso3')]
+
+
+def _as_records(payload):
+    """El endpoint por lotes devuelve una lista; con un solo país, un dict"""
+    if payload is None:
+        return []
+    records = payload if isinstance(payload, list) else [payload]
+    return [record for record in records if isinstance(record, dict) and 'timeline' in record]
+
+
+def fetch_country_histories(countries=None, lastdays='all', batch_size=COUNTRY_BATCH_SIZE, **kwargs):
+    """
+    Descargar el histórico de muchos países usando el endpoint por lotes
+
+    Los países que falten en la respuesta de su lote (el lote falló entero o
+    la API omitió algunos) se reintentan uno a uno, para que un nombre que la
+    API no reconoce no haga perder el resto del lote.
+
+    Args:
+        countries (list): Nombres o códigos ISO de países; None = todos
+        lastdays (int | str): Días a descargar ('all' = histórico completo)
+        batch_size (int): Países por petición
+        **kwargs: Opciones de fetch_many (max_workers, rate, retries, use_cache, ...)
+
+    Returns:
+        dict: país -> timeline {'cases': {...}, 'deaths': {...}, ...}
+    """
+    if countries is None:
+        countries = list_countries(**kwargs)
+
+    batches = [countries[i:i + batch_size] for i in range(0, len(countries), batch_size)]
+    endpoints = {COUNTRY_HISTORICAL_ENDPOINT.format(countries=','.join(batch), days=lastdays): batch
+                 for batch in batches}
+    results = fetch_many(endpoints, **kwargs)
+
+    histories = {}
+    retry_individually = []
+    for endpoint, batch in endpoints.items():
+        records = _as_records(results.get(endpoint))
+        for record in records:
+            histories[record['country']] = record['timeline']
+        if len(batch) > 1:
+            returned = {str(record.get('country', '')).lower() for record in records}
+            retry_individually.extend(country for country in batch if country.lower() not in returned)
+
+    if retry_individually:
+        print(f"🔁 Reintentando uno a uno {len(retry_individually)} países que faltaban en sus lotes")
+        singles = fetch_many([COUNTRY_HISTORICAL_ENDPOINT.format(countries=country, days=lastdays)
+                              for country in retry_individually], **kwargs)
+        for payload in singles.values():
+            for record in _as_records(payload):
+                histories[record['country']] = record['timeline']
+
+    return histories
+
+
+# ==============================================================================
+# HISTÓRICOS POR ESTADO DE EE.UU.
+# ==============================================================================
+
+def fetch_us_state_histories(states=None, lastdays='all', **kwargs):
+    """
+    Descargar el histórico por condados de cada estado de EE.UU. en paralelo
+
+    Args:
+        states (list): Nombres de estado en minúsculas; None = todos
+        lastdays (int | str): Días a descargar ('all' = histórico completo)
+        **kwargs: Opciones de fetch_many (max_workers, rate, retries, use_cache, ...)
+
+    Returns:
+        dict: estado -> lista de registros por condado con su timeline
+    """
+    if states is None:
+        states = get_covid_data(US_STATES_LIST_ENDPOINT, use_cache=kwargs.get('use_cache', True),
+                                offline=kwargs.get('offline', False),
+                                base_url=kwargs.get('base_url', API_BASE_URL)) or []
+
+    endpoints = {US_STATE_HISTORICAL_ENDPOINT.format(state=state, days=lastdays): state
+                 for state in states}
+    results = fetch_many(endpoints, **kwargs)
+
+    return {state: results[endpoint] for endpoint, state in endpoints.items()
+            if isinstance(results.get(endpoint), list)}
@@ -0,0 +1,226 @@
+# ==============================================================================
+# INSTRUMENTACIÓN - TIEMPOS, CPU, MEMORIA Y E/S POR ETAPA Y POR FIGURA
+# ==============================================================================
+#
+# Cada ejecución del pipeline tiene un run_id. Cada etapa y cada figura se
+# miden con span() o counters()/elapsed() y emiten un evento en JSON-lines,
+# que se añade a data/runs/<run_id>.jsonl:
+#   wall_s         tiempo real
+#   cpu_s          CPU del proceso y de sus hijos ya terminados (pool de render)
+#   peak_rss_mb    máximo de memoria residente del proceso hasta ese momento
+#   rss_growth_mb  cuánto subió ese máximo durante el bloque (quién fijó el pico)
+#   read_bytes / written_bytes   E/S del proceso (/proc/self/io; None si no existe)
+#
+# Al terminar, data/run_manifest.json resume la ejecución: totales, una
+# entrada por etapa y por figura, la comparación con la ejecución anterior y
+# los archivos generados. Si una ejecución nocturna se vuelve lenta, el
+# manifiesto dice qué etapa fue sin volver a ejecutar con un profiler.
+# Las figuras generadas en el pool se miden dentro de cada proceso hijo.
+
+import contextlib
+import json
+import os
+import sys
+import time
+import uuid
+
+try:
+    import resource
+except ImportError:     # Windows: sin getrusage
+    resource = None
+
+from covid_eda.config import DATA_DIR, IMAGES_DIR, REPORTS_DIR, RUN_MANIFEST, RUNS_DIR
+
+# Ralentización respecto a la ejecución anterior que se señala al terminar
+SLOWDOWN_RATIO = 1.25
+# ... siempre que la etapa tarde al menos esto (una etapa casi vacía no es una regresión)
+SLOWDOWN_MIN_SECONDS = 1.0
+
+# Estado de la ejecución en curso (None = instrumentación desactivada)
+_RUN = None
+
+
+def _io_bytes():
+    """(leídos, escritos) por el proceso según /proc/self/io, o (None, None)"""
+    try:
+        with open('/proc/self/io', 'r') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def _max_rss_mb():
+    """Máximo de memoria residente del proceso y de sus hijos, en MB"""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux lo da en KB; macOS en bytes
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def counters():
+    """Lectura de los contadores del proceso (punto de partida de elapsed)"""
+    if resource is not None:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+    else:
+        cpu = time.process_time()
+    read, written = _io_bytes()
+    return {'wall': time.perf_counter(), 'cpu': cpu, 'rss': _max_rss_mb(),
+            'read': read, 'written': written}
+
+
+def elapsed(start):
+    """Métricas entre `start` (counters()) y ahora"""
+    end = counters()
+
+    def diff(key):
+        return None if start[key] is None or end[key] is None else end[key] - start[key]
+
+    return {'wall_s': round(end['wall'] - start['wall'], 4),
+            'cpu_s': round(end['cpu'] - start['cpu'], 4),
+            'peak_rss_mb': None if end['rss'] is None else round(end['rss'], 1),
+            'rss_growth_mb': None if diff('rss') is None else round(diff('rss'), 1),
+            'read_bytes': diff('read'),
+            'written_bytes': diff('written')}
+
+
+# ==============================================================================
+# EJECUCIÓN Y EVENTOS
+# ==============================================================================
+
+def start_run(stages, options=None, runs_dir=RUNS_DIR):
+    """Abrir una ejecución instrumentada; los eventos van a <runs_dir>/<run_id>.jsonl"""
+    global _RUN
+    run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    os.makedirs(runs_dir, exist_ok=True)
+    _RUN = {'run_id': run_id, 'started_at': time.time(), 'stages_requested': list(stages),
+            'options': options or {}, 'events_path': os.path.join(runs_dir, f"{run_id}.jsonl"),
+            'start': counters(), 'events': []}
+    return run_id
+
+
+def current_run_id():
+    """run_id de la ejecución en curso (None si no hay ninguna)"""
+    return None if _RUN is None else _RUN['run_id']
+
+
+def emit(kind, name, metrics=None, **attrs):
+    """Registrar un evento (etapa, figura, ...) en la ejecución en curso"""
+    if _RUN is None:
+        return
+    event = {'run_id': _RUN['run_id'], 'ts': round(time.time(), 3), 'kind': kind, 'name': name,
+             **(metrics or {}), **attrs}
+    _RUN['events'].append(event)
+    with open(_RUN['events_path'], 'a', encoding='utf-8') as f:
+        f.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+
+@contextlib.contextmanager
+def span(kind, name, **attrs):
+    """Medir un bloque y emitir su evento, también si falla (status 'error')"""
+    start = counters()
+    status = 'ok'
+    try:
+        yield
+    except BaseException:
+        status = 'error'
+        raise
+    finally:
+        emit(kind, name, elapsed(start), status=status, **attrs)
+
+
+def _outputs(directories):
+    """Archivos generados (ruta, bytes, fecha de modificación) en los directorios de salida"""
+    outputs = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            if entry.is_file():
+                stat = entry.stat()
+                outputs.append({'path': entry.path, 'bytes': stat.st_size,
+                                'modified': round(stat.st_mtime, 3)})
+    return outputs
+
+
+def _previous_stages(manifest_path):
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        return previous.get('run_id'), previous.get('stages', {})
+    except (OSError, ValueError):
+        return None, {}
+
+
+def finish_run(status='ok', manifest_path=RUN_MANIFEST,
+               output_dirs=(DATA_DIR, IMAGES_DIR, REPORTS_DIR)):
+    """
+    Cerrar la ejecución en curso y escribir el manifiesto
+
+    Returns:
+        dict: El manifiesto (None si no había ejecución abierta)
+    """
+    global _RUN
+    if _RUN is None:
+        return None
+    run, _RUN = _RUN, None
+    from covid_eda.cache import _atomic_write
+
+    stages = {event['name']: {key: value for key, value in event.items()
+                              if key not in ('run_id', 'ts', 'kind', 'name')}
+              for event in run['events'] if event['kind'] == 'stage'}
+    figures = {event['name']: {key: value for key, value in event.items()
+                               if key not in ('run_id', 'ts', 'kind', 'name')}
+               for event in run['events'] if event['kind'] == 'figure'}
+
+    # FASES 2-7: tiempo de las figuras agrupado por la fase a la que pertenecen
+    phases = {}
+    for metrics in figures.values():
+        if 'phase' in metrics and 'wall_s' in metrics:
+            phases[metrics['phase']] = round(phases.get(metrics['phase'], 0) + metrics['wall_s'], 4)
+
+    previous_id, previous = _previous_stages(manifest_path)
+    vs_previous = {name: round(metrics['wall_s'] / previous[name]['wall_s'], 2)
+                   for name, metrics in stages.items()
+                   if previous.get(name, {}).get('wall_s')}
+
+    manifest = {
+        'run_id': run['run_id'],
+        'status': status,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(run['started_at'])),
+        'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'stages_requested': run['stages_requested'],
+        'options': run['options'],
+        'totals': elapsed(run['start']),
+        'stages': stages,
+        'figures': figures,
+        'figure_phases': phases,
+        'profiles': {event['name']: event['files'] for event in run['events']
+                     if event['kind'] == 'profile'},
+        'previous_run': previous_id,
+        'vs_previous': vs_previous,
+        'events': run['events_path'],
+        'outputs': _outputs(output_dirs),
+    }
+    os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok=True)
+    _atomic_write(manifest_path, json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
+    print_stage_table(manifest, manifest_path)
+    return manifest
+
+
+def print_stage_table(manifest, manifest_path=RUN_MANIFEST):
+    """Resumen por consola de los tiempos de cada etapa"""
+    if not manifest['stages']:
+        return
+    print("\n⏱️ Etapas (wall / CPU / pico RSS):")
+    for name, metrics in manifest['stages'].items():
+        ratio = manifest['vs_previous'].get(name)
+        slow = ratio and ratio > SLOWDOWN_RATIO and metrics['wall_s'] >= SLOWDOWN_MIN_SECONDS
+        flag = f"  ⚠️ {ratio:.2f}x respecto a la ejecución anterior" if slow else ''
+        rss = f"{metrics['peak_rss_mb']:.0f} MB" if metrics['peak_rss_mb'] is not None else '-'
+        print(f"   {name:10s} {metrics['wall_s']:8.2f} s  {metrics['cpu_s']:8.2f} s  {rss:>8s}{flag}")
+    print(f"   Manifiesto: {manifest_path} · eventos: {manifest['events']}")
@@ -0,0 +1,120 @@
+# ==============================================================================
+# KERNEL DE MÉTRICAS DERIVADAS - SERIES AGRUPADAS (region, date)
+# ==============================================================================
+#
+# derived_metrics calcula en una sola pasada vectorizada, para todas las
+# regiones a la vez:
+#   - new_<col>                     variación diaria del acumulado
+#   - <col>_<w>day_avg              media móvil centrada de la variación diaria
+#   - <col>_<w>day_trailing_avg     media móvil hacia atrás
+#   - <col>_growth_rate             crecimiento diario compuesto (%) del acumulado
+#   - <col>_doubling_time           días para duplicar el acumulado al ritmo actual
+#   - fatality_rate                 deaths / cases * 100
+#
+# Las medias móviles salen de una suma acumulada global: la suma de la ventana
+# es la diferencia de dos sumas acumuladas y sólo se publica cuando la ventana
+# completa cae dentro de la misma región, así que no hay un bucle por región.
+# Las acumulaciones se hacen en float64 y los resultados se guardan en float32.
+# Las filas de cada región deben estar en orden de fecha (como las deja
+# regional_histories_to_frame); las regiones no necesitan ser contiguas.
+
+import numpy as np
+import pandas as pd
+
+WINDOW = 7              # media móvil centrada (la del análisis original)
+TRAILING_WINDOW = 7     # media móvil hacia atrás (la del script optimizado)
+GROWTH_WINDOW = 7       # días sobre los que se mide el crecimiento
+
+
+def lookback_rows(window=WINDOW, trailing_window=TRAILING_WINDOW, growth_window=GROWTH_WINDOW):
+    """Filas anteriores necesarias para recalcular una fila sin el resto de la serie"""
+    return max(trailing_window, growth_window, window - (window - 1) // 2)
+
+
+def _rolling_mean(values, position, group_length, window, shift):
+    """
+    Media móvil de `window` filas desplazada `shift` filas hacia delante
+
+    shift = 0 es la media hacia atrás; shift = (window - 1) // 2 la centrada de
+    pandas (rolling(center=True)). Sin ventana completa dentro del grupo: NaN.
+    """
+    n = len(values)
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    end = np.arange(n) + shift                      # última fila de la ventana
+    valid = (position + shift < group_length) & (position + shift >= window - 1)
+    # Fuera de `valid` los índices sólo tienen que caer dentro del array
+    end = np.where(valid, end + 1, window).clip(0, n)
+    sums = cumulative[end] - cumulative[(end - window).clip(0, n)]
+    return np.where(valid, sums / window, np.nan)
+
+
+def derived_metrics(df, by=None, columns=('cases', 'deaths'), window=WINDOW,
+                    trailing_window=TRAILING_WINDOW, growth_window=GROWTH_WINDOW, dtype='float32'):
+    """
+    Añadir las métricas derivadas de las columnas acumuladas
+
+    Args:
+        df (pd.DataFrame): Serie única (by=None) o formato largo con una columna de grupo
+        by (str): Columna de grupo (p.ej. 'region')
+        columns (iterable): Columnas acumuladas de las que derivar métricas
+        window (int): Ventana de la media móvil centrada
+        trailing_window (int): Ventana de la media móvil hacia atrás
+        growth_window (int): Días del crecimiento / tiempo de duplicación
+        dtype (str): Tipo de las columnas de medias y tasas
+
+    Returns:
+        pd.DataFrame: El mismo df con las columnas añadidas
+    """
+    n = len(df)
+    if by is None:
+        codes = np.zeros(n, dtype=np.int64)
+    else:
+        codes = pd.factorize(df[by], sort=False)[0]
+
+    # Orden estable por grupo: cada región queda contigua sin alterar sus fechas
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = sorted_codes[1:] != sorted_codes[:-1]
+    start_index = np.maximum.accumulate(np.where(starts, np.arange(n), 0))
+    position = np.arange(n) - start_index
+    group_length = np.bincount(sorted_codes)[sorted_codes] if n else np.zeros(0, dtype=np.int64)
+    inverse = np.empty(n, dtype=np.int64)
+    inverse[order] = np.arange(n)
+
+    centered_shift = (window - 1) // 2
+    outputs = {kind: {} for kind in ('new', 'centered', 'trailing', 'growth', 'doubling')}
+    for column in columns:
+        raw = df[column].to_numpy()
+        values = raw[order].astype('float64')
+
+        delta = np.zeros(n)
+        delta[1:] = values[1:] - values[:-1]
+        delta[starts | np.isnan(delta)] = 0
+        if np.issubdtype(raw.dtype, np.integer):
+            outputs['new'][f'new_{column}'] = delta[inverse].astype('int64')
+        else:
+            outputs['new'][f'new_{column}'] = delta[inverse]
+
+        centered = _rolling_mean(delta, position, group_length, window, centered_shift)
+        trailing = _rolling_mean(delta, position, group_length, trailing_window, 0)
+        outputs['centered'][f'{column}_{window}day_avg'] = centered[inverse].astype(dtype)
+        outputs['trailing'][f'{column}_{trailing_window}day_trailing_avg'] = trailing[inverse].astype(dtype)
+
+        previous = np.full(n, np.nan)
+        has_previous = position >= growth_window
+        previous[has_previous] = values[np.flatnonzero(has_previous) - growth_window]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_ratio = np.where((previous > 0) & (values > 0), np.log(values / previous), np.nan)
+            growth = np.expm1(log_ratio / growth_window) * 100
+            doubling = np.where(log_ratio > 0, growth_window * np.log(2) / log_ratio, np.nan)
+        outputs['growth'][f'{column}_growth_rate'] = growth[inverse].astype(dtype)
+        outputs['doubling'][f'{column}_doubling_time'] = doubling[inverse].astype(dtype)
+
+    # Mismo orden de columnas que el análisis original: diarios, medias, ..., letalidad
+    for kind in outputs.values():
+        for name, values in kind.items():
+            df[name] = values
+    if 'cases' in df.columns and 'deaths' in df.columns:
+        df['fatality_rate'] = (df['deaths'] / df['cases'] * 100).fillna(0).astype(dtype)
+    return df
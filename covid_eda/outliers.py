@@ -0,0 +1,138 @@
+# ==============================================================================
+# MOTOR DE OUTLIERS VECTORIZADO
+# ==============================================================================
+#
+# detect_outliers calcula a la vez, para todas las columnas numéricas, los
+# criterios IQR, Z-score, MAD robusta y Z-score modificado, y devuelve una
+# matriz de máscaras booleanas alineada con las filas del DataFrame.
+#
+# Sin agrupar, cada estadístico es una única reducción de NumPy sobre la matriz
+# (filas x columnas). Con `by` (p.ej. 'region' en los históricos por país o por
+# estado) las series se colocan en un array 3D (grupo x posición x columna)
+# rellenado con NaN, así que miles de series se resuelven en las mismas pocas
+# reducciones, sin un bucle por grupo ni por columna.
+
+import numpy as np
+import pandas as pd
+
+METHODS = ('iqr', 'zscore', 'mad', 'modified_z')
+
+MAD_SCALE = 1.4826           # MAD -> desviación típica bajo normalidad
+MODIFIED_Z_SCALE = 0.6745    # Iglewicz y Hoaglin
+
+
+def _sorted_quantiles(ordered, count, quantiles):
+    """
+    Cuantiles (interpolación lineal, como pandas) de datos ya ordenados en el último eje
+
+    Los NaN quedan al final de cada fila al ordenar, así que basta con el número
+    de valores válidos de cada fila; esto evita np.nanpercentile, que recorre
+    las filas una a una cuando hay NaN.
+    """
+    last = np.maximum(count - 1, 0)[..., None]
+    results = []
+    for q in quantiles:
+        position = q * last
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        low_values = np.take_along_axis(ordered, lower, axis=-1)
+        high_values = np.take_along_axis(ordered, upper, axis=-1)
+        value = (low_values + (high_values - low_values) * (position - lower))[..., 0]
+        results.append(np.where(count > 0, value, np.nan))
+    return results
+
+
+def _reduce(values, axis, robust=True):
+    """Estadísticos por columna ignorando NaN a lo largo de `axis` (robust: también la MAD)"""
+    values = np.ascontiguousarray(np.moveaxis(values, axis, -1))
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=-1)
+    q1, median, q3 = _sorted_quantiles(np.sort(values, axis=-1), count, (0.25, 0.5, 0.75))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Columnas o grupos sin ningún valor: sus estadísticos quedan en NaN
+        mean = np.where(valid, values, 0).sum(axis=-1) / count
+        std = np.sqrt(np.where(valid, (values - mean[..., None]) ** 2, 0).sum(axis=-1) / count)
+    if robust:
+        deviation = np.sort(np.abs(values - median[..., None]), axis=-1)
+        mad, = _sorted_quantiles(deviation, count, (0.5,))
+    else:
+        mad = np.full_like(median, np.nan)
+    return {'count': count, 'mean': mean, 'std': std, 'q1': q1, 'median': median,
+            'q3': q3, 'mad': mad}
+
+
+def _scaled(deviation, scale):
+    """|desviación| / escala, con 0 donde la escala es 0 o NaN (sin dispersión, sin outliers)"""
+    out = np.zeros_like(deviation)
+    np.divide(deviation, scale, out=out, where=(scale > 0) & ~np.isnan(deviation))
+    return out
+
+
+def detect_outliers(df, columns=None, methods=METHODS, by=None, iqr_k=1.5,
+                    z_threshold=2, mad_threshold=3, modified_z_threshold=3.5):
+    """
+    Detectar outliers en varias columnas (y grupos) a la vez
+
+    Args:
+        df (pd.DataFrame): Datos en formato ancho o largo
+        columns (list): Columnas a analizar (None = todas las numéricas salvo `by`)
+        methods (iterable): Subconjunto de METHODS
+        by (str): Columna de agrupación; los estadísticos se calculan por grupo
+        iqr_k (float): Multiplicador del IQR
+        z_threshold (float): Umbral de |z|
+        mad_threshold (float): Umbral en desviaciones robustas (MAD * 1.4826)
+        modified_z_threshold (float): Umbral del Z-score modificado
+
+    Returns:
+        tuple: (masks, stats)
+            masks: DataFrame booleano con columnas (método, columna) y el índice de df
+            stats: DataFrame de estadísticos por columna (o por (grupo, columna))
+    """
+    unknown = [method for method in methods if method not in METHODS]
+    if unknown:
+        raise ValueError(f"Métodos de outliers desconocidos: {', '.join(unknown)}")
+    if columns is None:
+        columns = [column for column in df.select_dtypes('number').columns if column != by]
+    columns = list(columns)
+    values = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+    robust = 'mad' in methods or 'modified_z' in methods
+
+    if by is None:
+        stats = _reduce(values, axis=0, robust=robust)
+        rows = stats
+        stats_index = pd.Index(columns, name='column')
+    else:
+        codes, groups = pd.factorize(df[by], sort=False)
+        positions = df.groupby(codes, sort=False).cumcount().to_numpy()
+        padded = np.full((len(groups), positions.max() + 1 if len(df) else 0, len(columns)), np.nan)
+        padded[codes, positions] = values
+        stats = _reduce(padded, axis=1, robust=robust)
+        # Estadísticos del grupo de cada fila
+        rows = {name: stat[codes] for name, stat in stats.items()}
+        stats = {name: stat.ravel() for name, stat in stats.items()}
+        stats_index = pd.MultiIndex.from_product([groups, columns], names=[by, 'column'])
+
+    deviation = np.abs(values - rows['median'])
+    masks = {}
+    for method in methods:
+        if method == 'iqr':
+            iqr = rows['q3'] - rows['q1']
+            mask = (values < rows['q1'] - iqr_k * iqr) | (values > rows['q3'] + iqr_k * iqr)
+        elif method == 'zscore':
+            mask = _scaled(np.abs(values - rows['mean']), rows['std']) > z_threshold
+        elif method == 'mad':
+            mask = _scaled(deviation, MAD_SCALE * rows['mad']) > mad_threshold
+        else:
+            mask = MODIFIED_Z_SCALE * _scaled(deviation, rows['mad']) > modified_z_threshold
+        masks[method] = mask
+
+    mask_columns = pd.MultiIndex.from_product([list(masks), columns], names=['method', 'column'])
+    masks = pd.DataFrame(np.concatenate(list(masks.values()), axis=1) if masks else
+                         np.empty((len(df), 0), dtype=bool),
+                         index=df.index, columns=mask_columns)
+
+    stats = pd.DataFrame(stats, index=stats_index)
+    iqr = stats['q3'] - stats['q1']
+    stats['iqr_lower'] = stats['q1'] - iqr_k * iqr
+    stats['iqr_upper'] = stats['q3'] + iqr_k * iqr
+    return masks, stats
@@ -0,0 +1,466 @@
+# ==============================================================================
+# PIPELINE - ORQUESTACIÓN DE LAS ETAPAS DEL ANÁLISIS
+# ==============================================================================
+#
+# Cada etapa recibe un contexto (dict) compartido. Si una etapa necesita datos
+# que no produjo una etapa anterior en la misma ejecución, los carga del disco:
+# así se puede ejecutar cualquier subconjunto (p.ej. sólo "render").
+
+import os
+
+from covid_eda.config import (API_BASE_URL, COUNTRIES_HISTORICAL_RAW, DATA_DIR, FETCH_MAX_WORKERS,
+                              IMAGES_DIR, RENDER_WORKERS, STATES_RAW, STREAM_CHUNK_DAYS,
+                              US_HISTORICAL_RAW, US_HISTORICAL_WINDOW_RAW, US_STATES_HISTORICAL_RAW)
+
+STAGES = ('fetch', 'transform', 'analyze', 'render', 'report')
+
+# Históricos multi-región opcionales: nombre -> (json crudo, dataset limpio)
+REGIONS = {
+    'countries': (COUNTRIES_HISTORICAL_RAW, 'countries_historical'),
+    'us-states': (US_STATES_HISTORICAL_RAW, 'us_states_historical'),
+}
+
+# Días hacia atrás con los que se comparan los puestos del ranking regional
+RANK_CHANGE_DAYS = 28
+
+
+def _ensure_clean_data(ctx):
+    """Cargar los datasets limpios del disco si no están en el contexto"""
+    if 'df_us' not in ctx or 'df_states' not in ctx:
+        from covid_eda.transform import load_clean_data
+        ctx['df_us'], ctx['df_states'] = load_clean_data(compact=ctx.get('compact', True))
+    return ctx['df_us'], ctx['df_states']
+
+
+def stage_fetch(ctx):
+    """FASE 1a: descargar los datos crudos de la API"""
+    from covid_eda.fetch import fetch_all
+
+    print("\n📊 FASE 1: OBTENCIÓN DE DATOS")
+    since = None
+    if ctx.get('incremental'):
+        from covid_eda.transform import load_last_stored_date
+        since = load_last_stored_date()
+        if since is None:
+            print("ℹ️ Sin histórico guardado: descarga completa")
+
+    us_raw, ctx['states_raw'] = fetch_all(use_cache=ctx.get('use_cache', True),
+                                          offline=ctx.get('offline', False), since=since,
+                                          base_url=ctx.get('base_url', API_BASE_URL))
+    ctx['us_window_raw' if since is not None else 'us_raw'] = us_raw
+
+    if ctx.get('regions'):
+        _fetch_regions(ctx)
+
+
+def _fetch_regions(ctx):
+    """Descargar en paralelo los históricos multi-región pedidos"""
+    from covid_eda.fetch import save_raw
+    from covid_eda.ingest import fetch_country_histories, fetch_us_state_histories
+
+    options = {'max_workers': ctx.get('max_workers', FETCH_MAX_WORKERS),
+               'use_cache': ctx.get('use_cache', True), 'offline': ctx.get('offline', False),
+               'base_url': ctx.get('base_url', API_BASE_URL)}
+    for region in ctx['regions']:
+        raw_path, _ = REGIONS[region]
+        if region == 'countries':
+            print("\n🌍 Históricos por país")
+            payload = fetch_country_histories(ctx.get('countries'), **options)
+        else:
+            print("\n🇺🇸 Históricos por estado de EE.UU.")
+            payload = fetch_us_state_histories(**options)
+        if payload:
+            save_raw(payload, raw_path)
+        ctx[f'{region}_raw'] = payload
+
+
+def _update_us_incremental(ctx):
+    """
+    Añadir la ventana descargada al final de la serie guardada de EE.UU.
+
+    Sólo se lee el final de la serie que hace falta para recalcular las
+    métricas y sólo se reescriben esas filas (covid_eda.storage.replace_tail).
+
+    Returns:
+        int: Días nuevos; None si no hay serie guardada o ventana descargada
+    """
+    from covid_eda.fetch import load_raw
+    from covid_eda.storage import replace_tail
+    from covid_eda.transform import append_us_data, load_us_tail, timeline_to_frame
+
+    window_raw = ctx['us_window_raw'] if 'us_window_raw' in ctx else load_raw(US_HISTORICAL_WINDOW_RAW)
+    if not window_raw or 'timeline' not in window_raw:
+        return None
+    df_tail = load_us_tail(timeline_to_frame(window_raw)['date'].min())
+    if df_tail.empty:
+        return None
+
+    df_us, n_new = append_us_data(df_tail, window_raw)
+    if df_us is not df_tail:
+        if ctx.get('compact', True):
+            from covid_eda.compact import compact_frame
+            df_us = compact_frame(df_us, 'us_historical')
+        replace_tail(df_us, 'us_historical')
+    print(f"🔄 Histórico incremental: {n_new} días nuevos (hasta {df_us['date'].iloc[-1]:%Y-%m-%d}), "
+          f"{len(df_us)} filas reescritas")
+    return n_new
+
+
+def _stream_us(ctx):
+    """Serie de EE.UU. procesada y escrita por trozos (modo streaming)"""
+    from covid_eda.fetch import load_raw
+    from covid_eda.stream import iter_timeline_chunks, stream_to_dataset
+
+    us_raw = ctx['us_raw'] if 'us_raw' in ctx else load_raw(US_HISTORICAL_RAW)
+    chunks = iter_timeline_chunks(us_raw, ctx.get('chunk_days', STREAM_CHUNK_DAYS))
+    rows = stream_to_dataset(chunks, 'us_historical', export_csv=True)
+    if rows:
+        print(f"💾 Datos históricos EE.UU. guardados por trozos ({rows} registros)")
+    return rows
+
+
+def _process_states(states_raw):
+    """
+    Datos por estado, guardando la foto en el histórico (covid_eda.snapshots)
+
+    Returns:
+        pd.DataFrame: None si la API no ha publicado nada desde la última foto
+            guardada y el dataset de estados ya existe (no hace falta reprocesarlo)
+    """
+    from covid_eda.snapshots import SnapshotStore
+    from covid_eda.storage import dataset_exists
+    from covid_eda.transform import process_states_data
+
+    store = SnapshotStore()
+    if states_raw and not store.has_new(states_raw) and dataset_exists('states'):
+        print(f"⏭️ Estados sin fotos nuevas desde {store.last_updated():%Y-%m-%d %H:%M} (campo 'updated'): "
+              f"se reutiliza el dataset guardado")
+        return None
+
+    df_states = process_states_data(states_raw)
+    appended = store.append(df_states)
+    if appended:
+        print(f"📸 Histórico de estados: {appended} filas nuevas ({store.rows} guardadas, "
+              f"{len(store.index['files'])} archivos)")
+    return df_states
+
+
+def stage_transform(ctx):
+    """FASE 1b: limpiar los datos crudos y calcular métricas derivadas"""
+    from covid_eda.fetch import load_raw
+    from covid_eda.storage import read_dataset
+    from covid_eda.transform import process_us_data, save_clean_data
+
+    streaming = ctx.get('stream') and not ctx.get('incremental')
+    n_new = _update_us_incremental(ctx) if ctx.get('incremental') else None
+    # Serie escrita por trozos o sólo por el final: las etapas siguientes la leen del disco
+    on_disk = streaming or n_new is not None
+    n_us = n_new
+    if streaming:
+        n_us = _stream_us(ctx)
+    elif not on_disk:
+        us_raw = ctx['us_raw'] if 'us_raw' in ctx else load_raw(US_HISTORICAL_RAW)
+        df_us = process_us_data(us_raw)
+        n_us = len(df_us)
+    if on_disk:
+        ctx.pop('df_us', None)
+    states_raw = ctx['states_raw'] if 'states_raw' in ctx else load_raw(STATES_RAW)
+    if n_us == 0 and n_new is None and states_raw is None:
+        print("⚠️ No hay datos crudos en data/raw/: ejecuta primero la etapa fetch")
+
+    df_states = _process_states(states_raw)
+    states_changed = df_states is not None
+    if not states_changed:
+        df_states = read_dataset('states')
+    if ctx.get('compact', True):
+        from covid_eda.compact import compact_frame
+        if not on_disk:
+            df_us = compact_frame(df_us, 'us_historical')
+        df_states = compact_frame(df_states, 'states')
+
+    save_clean_data(None if on_disk else df_us, df_states if states_changed else None)
+    if not on_disk:
+        ctx['df_us'] = df_us
+    ctx['df_states'] = df_states
+    print(f"✅ Datos procesados: {n_us} registros temporales, {len(df_states)} estados")
+
+    for region in ctx.get('regions') or []:
+        _transform_region(ctx, region)
+
+
+def _region_histories(region, payload):
+    """región -> timeline a partir del payload crudo de un histórico multi-región"""
+    if region == 'countries':
+        return payload
+    from covid_eda.transform import sum_county_timelines
+    return {state: sum_county_timelines(records) for state, records in payload.items()}
+
+
+def _transform_region(ctx, region):
+    """Procesar y guardar un histórico multi-región"""
+    from covid_eda.fetch import load_raw
+    from covid_eda.storage import save_dataset
+    from covid_eda.transform import process_country_histories, process_us_state_histories
+
+    raw_path, dataset = REGIONS[region]
+    payload = ctx[f'{region}_raw'] if f'{region}_raw' in ctx else load_raw(raw_path)
+    if ctx.get('stream'):
+        from covid_eda.stream import iter_regional_chunks, stream_to_dataset
+
+        histories = _region_histories(region, payload) if payload else {}
+        chunks = iter_regional_chunks(histories, ctx.get('chunk_days', STREAM_CHUNK_DAYS))
+        rows = stream_to_dataset(chunks, dataset, by='region')
+        if not rows:
+            print(f"⚠️ Sin datos crudos para {region}")
+            return
+        print(f"💾 {region}: {len(histories)} regiones, {rows} registros guardados por trozos")
+        return
+
+    process = process_country_histories if region == 'countries' else process_us_state_histories
+    df = process(payload)
+    if df.empty:
+        print(f"⚠️ Sin datos crudos para {region}")
+        return
+    if ctx.get('compact', True):
+        from covid_eda.compact import compact_frame
+        df = compact_frame(df, dataset)
+
+    save_dataset(df, dataset)
+    ctx[f'df_{region}'] = df
+    print(f"💾 {region}: {df['region'].nunique()} regiones, {len(df)} registros guardados")
+
+
+def stage_analyze(ctx):
+    """Resumen estadístico (data/summary_stats.json) y reporte de outliers, anomalías y asimetría"""
+    from covid_eda.analyze import print_anomaly_report, print_outlier_report
+    from covid_eda.summary import build_summary
+
+    df_us, df_states = _ensure_clean_data(ctx)
+    ctx['summary'] = build_summary(df_us, df_states)
+    print_outlier_report(ctx['summary'])
+    print_anomaly_report(ctx['summary'])
+
+    for region in ctx.get('regions') or []:
+        _region_lags(ctx, region)
+        _region_anomalies(ctx, region)
+        _region_rankings(region)
+
+
+def _region_lags(ctx, region):
+    """Adelanto/retraso de cada serie regional frente al agregado (data/<dataset>_lags.csv)"""
+    from covid_eda.correlation import LAG_MAX_DAYS, lagged_correlations
+    from covid_eda.storage import dataset_exists, read_dataset
+
+    _, dataset = REGIONS[region]
+    columns = ['region', 'date', 'cases_7day_avg']
+    if f'df_{region}' in ctx:
+        df = ctx[f'df_{region}'][columns]
+    elif dataset_exists(dataset):
+        df = read_dataset(dataset, columns=columns)
+    else:
+        print(f"⚠️ Sin histórico {region}: ejecuta antes la etapa transform con --regions {region}")
+        return
+
+    lags = lagged_correlations(df)
+    path = os.path.join(DATA_DIR, f'{dataset}_lags.csv')
+    lags.to_csv(path, index=False)
+    ctx[f'{region}_lags'] = lags
+
+    strong = lags[lags['best_r'] >= 0.5]
+    print(f"\n⏳ DESFASES {region.upper()} (±{LAG_MAX_DAYS} días frente al agregado): {path}")
+    for label, rows in (('Adelantadas', strong[strong['best_lag'] < 0].nsmallest(5, 'best_lag')),
+                        ('Retrasadas', strong[strong['best_lag'] > 0].nlargest(5, 'best_lag'))):
+        regions = ', '.join(f"{row.region} ({row.best_lag:+.0f} d, r={row.best_r:.2f})"
+                            for row in rows.itertuples())
+        print(f"   • {label}: {regions or 'ninguna con r ≥ 0.5'}")
+
+
+def _region_anomalies(ctx, region, k=5):
+    """Anomalías de las series diarias de todas las regiones (data/<dataset>_anomalies.csv)"""
+    from covid_eda.anomalies import ANOMALY_COLUMNS, detect_anomalies
+    from covid_eda.storage import dataset_exists, read_dataset
+
+    _, dataset = REGIONS[region]
+    columns = ['region', 'date', *ANOMALY_COLUMNS]
+    if f'df_{region}' in ctx:
+        df = ctx[f'df_{region}'][columns]
+    elif dataset_exists(dataset):
+        df = read_dataset(dataset, columns=columns)
+    else:
+        return
+
+    flags = detect_anomalies(df, by='region')
+    path = os.path.join(DATA_DIR, f'{dataset}_anomalies.csv')
+    flags.to_csv(path, index=False)
+    ctx[f'{region}_anomalies'] = flags
+
+    print(f"\n🚨 ANOMALÍAS {region.upper()} ({len(flags)} días marcados): {path}")
+    counts = flags.groupby('method', observed=True).size()
+    print("   • " + (', '.join(f"{method} {n}" for method, n in counts.items()) or 'ninguna'))
+    points = flags[(flags['column'] == 'new_cases') & (flags['method'] != 'change_point')]
+    most = points.groupby('region', observed=True)['date'].nunique().nlargest(k)
+    regions = ', '.join(f"{name} ({n})" for name, n in most.items() if n)
+    print(f"   • Más días anómalos en casos: {regions or 'ninguna'}")
+
+
+def _region_rankings(region, k=5):
+    """
+    Ranking de casos y letalidad de cada región y quién más ha subido en
+    casos diarios en los últimos RANK_CHANGE_DAYS días (covid_eda.ranking)
+    """
+    import pandas as pd
+
+    from covid_eda.query import latest
+    from covid_eda.ranking import RankingIndex
+    from covid_eda.storage import dataset_exists
+
+    _, dataset = REGIONS[region]
+    if not dataset_exists(dataset):
+        return
+
+    # Dos fotos (hoy y hace RANK_CHANGE_DAYS días) leídas por lotes del Parquet:
+    # no hace falta cargar el histórico completo. La media móvil centrada no
+    # existe en los últimos días de cada serie: se usa la de 7 días hacia atrás
+    metrics = ['cases', 'fatality_rate', 'cases_7day_trailing_avg']
+    current = latest(dataset, metrics)
+    if current.empty:
+        return
+    last = current['date'].max()
+    before = latest(dataset, metrics, end=last - pd.Timedelta(days=RANK_CHANGE_DAYS))
+    index = RankingIndex(before if not before.empty else current, 'region', metrics, label='before')
+    index.update(current, label='now')
+
+    print(f"\n🏆 RANKING {region.upper()} ({last.date().isoformat()})")
+    for label, metric, where, fmt in (('Casos', 'cases', None, ',.0f'),
+                                      ('Letalidad %, > 10.000 casos', 'fatality_rate',
+                                       [('cases', '>', 10000)], '.2f')):
+        rows = index.top(metric, k, where=where)
+        regions = ', '.join(f"{row.region} ({getattr(row, metric):{fmt}})" for row in rows.itertuples())
+        print(f"   • {label}: {regions or 'sin datos'}")
+    climbers = index.rank_changes('cases_7day_trailing_avg', since='before')
+    climbers = climbers[climbers['change'] > 0].head(k)
+    regions = ', '.join(f"{row.region} ({row.rank_before:.0f}º → {row.rank:.0f}º)"
+                        for row in climbers.itertuples())
+    print(f"   • Más suben en casos diarios ({RANK_CHANGE_DAYS} d): {regions or 'ninguna'}")
+
+
+def stage_render(ctx):
+    """FASES 2-7: visualizaciones estáticas y dashboard interactivo"""
+    from covid_eda.render import render_figures
+
+    df_us, df_states = _ensure_clean_data(ctx)
+    ctx['figures'] = render_figures(df_us, df_states, names=ctx.get('figure_names'),
+                                    workers=ctx.get('render_workers', RENDER_WORKERS),
+                                    force=ctx.get('force_render', False))
+
+
+def stage_report(ctx):
+    """Informe PDF ejecutivo"""
+    from covid_eda.report import create_covid_report
+    from covid_eda.summary import build_summary, load_summary
+
+    # El informe sólo lee el resumen: si falta (p.ej. --stages report), se genera aquí
+    if 'summary' not in ctx and load_summary() is None:
+        ctx['summary'] = build_summary(*_ensure_clean_data(ctx))
+    ctx['report_ok'] = create_covid_report()
+
+    for region in ctx.get('region_reports') or []:
+        from covid_eda.batch_report import generate_region_reports
+        ctx[f'{region}_reports'] = generate_region_reports(
+            region, workers=ctx.get('render_workers', RENDER_WORKERS))
+
+
+STAGE_FUNCTIONS = {
+    'fetch': stage_fetch,
+    'transform': stage_transform,
+    'analyze': stage_analyze,
+    'render': stage_render,
+    'report': stage_report,
+}
+
+
+def print_final_report(ctx):
+    """FASE 8: listar archivos generados y estadísticas finales"""
+    from covid_eda.analyze import print_final_summary
+
+    print("\n📋 REPORTE FINAL DE ANÁLISIS")
+    print("=" * 80)
+
+    if os.path.isdir(IMAGES_DIR):
+        image_files = [f for f in os.listdir(IMAGES_DIR) if f.endswith(('.png', '.html'))]
+        print(f"📊 Visualizaciones generadas ({len(image_files)}):")
+        for img in sorted(image_files):
+            print(f"   ✅ {img}")
+
+    if os.path.isdir(DATA_DIR):
+        data_files = [f for f in os.listdir(DATA_DIR) if f.endswith('.csv')]
+        print(f"\n💾 Datasets generados ({len(data_files)}):")
+        for data in sorted(data_files):
+            print(f"   ✅ {data}")
+
+    if 'summary' not in ctx:
+        from covid_eda.summary import load_summary
+        ctx['summary'] = load_summary()
+    print_final_summary(ctx['summary'])
+
+
+def run_pipeline(stages=STAGES, figure_names=None, use_cache=True, offline=False,
+                 incremental=False, regions=None, countries=None, max_workers=FETCH_MAX_WORKERS,
+                 compact=True, render_workers=RENDER_WORKERS, force_render=False,
+                 stream=False, chunk_days=STREAM_CHUNK_DAYS, region_reports=None,
+                 profile=None, profile_memory=False, base_url=API_BASE_URL):
+    """
+    Ejecutar las etapas indicadas en el orden canónico
+
+    Args:
+        stages (iterable): Subconjunto de STAGES a ejecutar
+        figure_names (list): Figuras a generar en la etapa render (None = todas)
+        use_cache (bool): Usar la caché local de respuestas HTTP en fetch
+        offline (bool): Etapa fetch sin red, sólo desde la caché
+        incremental (bool): Descargar y procesar sólo los días nuevos del histórico
+        regions (list): Históricos multi-región a incluir (claves de REGIONS)
+        countries (list): Países a descargar con 'countries' (None = todos)
+        max_workers (int): Peticiones simultáneas en la descarga multi-región
+        compact (bool): Reducir los tipos en memoria de los datasets (covid_eda.compact)
+        render_workers (int): Procesos para generar las figuras en paralelo
+        force_render (bool): Regenerar las figuras aunque sus entradas no hayan cambiado
+        stream (bool): Procesar los históricos por trozos de fechas, escribiendo según se calculan
+        chunk_days (int): Días por trozo en el modo streaming
+        region_reports (list): Claves de REGIONS con un informe PDF por región en la etapa report
+        profile (str): Perfilar cada etapa con 'cprofile' o 'sample' (covid_eda.profiling)
+        profile_memory (bool): tracemalloc en las etapas transform y analyze
+        base_url (str): URL base de la API en la etapa fetch
+
+    Returns:
+        dict: Contexto con los resultados de cada etapa
+    """
+    unknown = [stage for stage in stages if stage not in STAGE_FUNCTIONS]
+    if unknown:
+        raise ValueError(f"Etapas desconocidas: {', '.join(unknown)}")
+
+    ctx = {'figure_names': figure_names, 'use_cache': use_cache, 'offline': offline,
+           'incremental': incremental, 'regions': regions or [], 'countries': countries,
+           'max_workers': max_workers, 'compact': compact,
+           'render_workers': render_workers, 'force_render': force_render,
+           'stream': stream, 'chunk_days': chunk_days, 'region_reports': region_reports or [],
+           'base_url': base_url}
+    # Cada etapa emite su evento de instrumentación; el manifiesto se escribe también si falla
+    from covid_eda import profiling
+    from covid_eda.instrument import finish_run, span, start_run
+
+    start_run([stage for stage in STAGES if stage in stages],
+              options={**ctx, 'profile': profile, 'profile_memory': profile_memory})
+    profiling.configure(profile, profile_memory)
+    status = 'error'
+    try:
+        for stage in STAGES:
+            if stage in stages:
+                with span('stage', stage), \
+                        profiling.profile(stage, memory=stage in profiling.MEMORY_STAGES):
+                    STAGE_FUNCTIONS[stage](ctx)
+        status = 'ok'
+    finally:
+        profiling.configure(None)
+        ctx['run_manifest'] = finish_run(status)
+
+    return ctx
@@ -0,0 +1,227 @@
+# ==============================================================================
+# PERFILADO - cProfile, MUESTREO Y tracemalloc POR ETAPA (OPCIONAL)
+# ==============================================================================
+#
+# Con --profile el pipeline perfila cada etapa y deja un archivo por etapa en
+# data/profiles/<run_id>/ (el run_id es el de covid_eda.instrument):
+#   cprofile   <etapa>.prof     pstats: snakeviz, flameprof, gprof2dot, pstats
+#   sample     <etapa>.folded   pilas plegadas ("a;b;c N"): flamegraph.pl,
+#                               speedscope, inferno. Muestreo de CPU cada
+#                               SAMPLE_INTERVAL s con SIGPROF: casi sin coste
+# Con --profile-memory, las etapas de MEMORY_STAGES (transform y analyze, la de
+# los outliers) se ejecutan con tracemalloc y dejan:
+#   <etapa>.tracemalloc         instantánea (tracemalloc.Snapshot.load)
+#   <etapa>.alloc.folded        memoria viva al terminar la etapa, por pila,
+#                               en bytes: flamegraph de asignaciones
+#
+# Las figuras que se generan en el pool de render se perfilan dentro de cada
+# proceso hijo (render.<figura>.*). Un perfil no se anida dentro de otro: en
+# render secuencial, el de la etapa ya cubre cada figura.
+
+import collections
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import tracemalloc
+
+from covid_eda.config import PROFILE_DIR
+
+PROFILERS = ('cprofile', 'sample')
+MEMORY_STAGES = ('transform', 'analyze')
+SAMPLE_INTERVAL = 0.005      # segundos de CPU entre muestras
+TRACEMALLOC_FRAMES = 25      # profundidad de las pilas de tracemalloc
+TOP_LINES = 5                # funciones / líneas que se imprimen por perfil
+
+# Configuración de la ejecución en curso (None = perfilado desactivado)
+_PROFILE = None
+# Hay un perfil activo en este proceso (no se anidan)
+_ACTIVE = False
+
+
+def configure(profiler=None, memory=False, output_dir=PROFILE_DIR):
+    """
+    Activar el perfilado para las siguientes llamadas a profile()
+
+    Args:
+        profiler (str): 'cprofile', 'sample' o None (sólo memoria, o nada)
+        memory (bool): tracemalloc en las etapas de MEMORY_STAGES
+        output_dir (str): Directorio de los perfiles (None = desactivar)
+    """
+    global _PROFILE
+    if profiler is not None and profiler not in PROFILERS:
+        raise ValueError(f"Perfilador desconocido: {profiler} (opciones: {', '.join(PROFILERS)})")
+    if profiler == 'sample' and not hasattr(signal, 'setitimer'):
+        print("⚠️ Muestreo no disponible en esta plataforma: se usa cProfile")
+        profiler = 'cprofile'
+    if output_dir is None or (profiler is None and not memory):
+        _PROFILE = None
+        return
+    os.makedirs(output_dir, exist_ok=True)
+    _PROFILE = {'profiler': profiler, 'memory': memory, 'dir': output_dir}
+
+
+def worker_init():
+    """Proceso hijo de un pool: descartar el perfil heredado del padre al hacer fork"""
+    global _ACTIVE
+    _ACTIVE = False
+    sys.setprofile(None)
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+# ==============================================================================
+# PERFILADORES
+# ==============================================================================
+
+def _frame_label(code):
+    # ';' separa marcos en el formato plegado
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(';', ':')
+
+
+class _Sampler:
+    """
+    Perfilador de muestreo: pila del hilo principal en cada SIGPROF
+
+    El temporizador se rearma al final de cada muestra y no es periódico: si
+    una muestra tarda más que el intervalo (p. ej. con tracemalloc activo), el
+    programa sigue avanzando en lugar de encadenar una señal tras otra.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._previous = None
+        self._running = False
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(stack))] += 1
+        if self._running:
+            signal.setitimer(signal.ITIMER_PROF, self.interval)
+
+    def start(self):
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        self._running = True
+        signal.setitimer(signal.ITIMER_PROF, self.interval)
+
+    def stop(self):
+        self._running = False
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous or signal.SIG_DFL)
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def top(self, limit=TOP_LINES):
+        """Funciones con más muestras propias (cima de la pila)"""
+        own = collections.Counter()
+        for stack, count in self.stacks.items():
+            own[stack.rsplit(';', 1)[-1]] += count
+        total = sum(own.values()) or 1
+        return [f"{count / total:6.1%}  {label}" for label, count in own.most_common(limit)]
+
+
+def _cprofile_top(profiler, limit=TOP_LINES):
+    """Funciones con más tiempo propio según cProfile"""
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [f"{tottime:7.3f} s  {function} ({os.path.basename(filename)}:{line})"
+            for (filename, line, function), (_, _, tottime, _, _) in rows]
+
+
+def _write_allocations(snapshot, path):
+    """Memoria viva por pila en formato plegado (bytes)"""
+    snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                       tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+                                       tracemalloc.Filter(False, __file__)))
+    stats = snapshot.statistics('traceback')
+    with open(path, 'w', encoding='utf-8') as f:
+        for stat in stats:
+            # Las pilas de tracemalloc van del marco más antiguo al más reciente
+            stack = ';'.join(f"{os.path.basename(frame.filename)}:{frame.lineno}".replace(';', ':')
+                             for frame in stat.traceback)
+            f.write(f"{stack} {stat.size}\n")
+    return [f"{stat.size / 1024 ** 2:7.1f} MB  {stat.traceback[-1].filename}:{stat.traceback[-1].lineno}"
+            for stat in snapshot.statistics('lineno')[:TOP_LINES]]
+
+
+# ==============================================================================
+# PERFIL DE UN BLOQUE
+# ==============================================================================
+
+@contextlib.contextmanager
+def profile(name, memory=False):
+    """
+    Perfilar un bloque con la configuración activa (sin efecto si no la hay)
+
+    Args:
+        name (str): Nombre de los archivos (etapa o 'render.<figura>')
+        memory (bool): Además, tracemalloc (si se activó con --profile-memory)
+    """
+    global _ACTIVE
+    if _PROFILE is None or _ACTIVE:
+        yield
+        return
+
+    profiler_kind = _PROFILE['profiler']
+    if profiler_kind == 'sample' and threading.current_thread() is not threading.main_thread():
+        profiler_kind = 'cprofile'     # las señales sólo llegan al hilo principal
+    memory = memory and _PROFILE['memory']
+    if profiler_kind is None and not memory:
+        yield
+        return
+
+    from covid_eda.instrument import current_run_id, emit
+
+    output_dir = os.path.join(_PROFILE['dir'], current_run_id() or 'manual')
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, name)
+
+    profiler = cProfile.Profile() if profiler_kind == 'cprofile' else \
+        _Sampler() if profiler_kind == 'sample' else None
+    _ACTIVE = True
+    if memory:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    if profiler is not None:
+        profiler.enable() if profiler_kind == 'cprofile' else profiler.start()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable() if profiler_kind == 'cprofile' else profiler.stop()
+        files, lines, attrs = [], [], {}
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(f"{base}.tracemalloc")
+            lines += _write_allocations(snapshot, f"{base}.alloc.folded")
+            files += [f"{base}.tracemalloc", f"{base}.alloc.folded"]
+            attrs['traced_peak_mb'] = round(peak / 1024 ** 2, 1)
+        if profiler_kind == 'cprofile':
+            profiler.dump_stats(f"{base}.prof")
+            lines = _cprofile_top(profiler) + lines
+            files.insert(0, f"{base}.prof")
+        elif profiler_kind == 'sample':
+            profiler.write(f"{base}.folded")
+            lines = profiler.top() + lines
+            files.insert(0, f"{base}.folded")
+        _ACTIVE = False
+
+        emit('profile', name, files=files, profiler=profiler_kind, **attrs)
+        print(f"🔬 Perfil {name}: {', '.join(os.path.basename(path) for path in files)}"
+              + (f" (pico tracemalloc {attrs['traced_peak_mb']} MB)" if memory else ''))
+        for line in lines:
+            print(f"      {line}")
@@ -0,0 +1,383 @@
+# ==============================================================================
+# CONSULTAS ANALÍTICAS SOBRE LOS DATASETS GUARDADOS
+# ==============================================================================
+#
+# Motor de consultas embebido sobre data/parquet/. Cada consulta recorre el
+# dataset por lotes (pyarrow.dataset) con la proyección y los filtros empujados
+# al lector: sólo se leen las columnas pedidas, y las particiones por año y los
+# row groups que no pueden cumplir el filtro no se abren. Los resultados
+# parciales se combinan lote a lote, así que la memoria depende de BATCH_ROWS y
+# del tamaño del resultado (k filas, una por región o por grupo), no del
+# dataset: un ranking sobre todos los países y todos los años no lo carga entero.
+#
+# Consultas preparadas:
+#   top          k filas con el mayor (o menor) valor de una columna
+#   latest       último registro de cada región (o de la serie nacional)
+#   ranking      top sobre el último registro de cada región / estado
+#   per_capita   métrica por cada `per` habitantes (datasets con población)
+#   aggregate    count / sum / mean / min / max, opcionalmente por grupo
+#   windowed     los mismos agregados por ventana de calendario (semana, mes...)
+#
+# Los filtros usan la sintaxis de read_dataset: [('cases', '>', 10000),
+# ('region', 'in', ['Spain', 'Italy'])]. Sin pyarrow se lee el CSV por trozos
+# con la misma semántica.
+#
+# Uso:
+#   python -m covid_eda.query ranking countries_historical cases --k 15
+#   python -m covid_eda.query per_capita states deaths --where "cases > 10000"
+#   python -m covid_eda.query windowed countries_historical new_cases --freq M --where "region in Spain,Italy"
+
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from covid_eda.config import DATA_DIR, PARQUET_DIR
+from covid_eda.schema import ALIASES, COLUMNS, SchemaError, conform, kinds
+from covid_eda.storage import (CSV_FILES, PARTITIONED, _date_filters, apply_filters, check_columns,
+                               csv_path, dataset_path, has_pyarrow, legacy_names, upgrade_dataset)
+
+BATCH_ROWS = 65_536
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max')
+# Cómo se combinan dos resultados parciales de cada agregado
+_MERGE = {'count': 'sum', 'sum': 'sum', 'min': 'min', 'max': 'max'}
+_WHERE = re.compile(r'^\s*(\w+)\s*(>=|<=|!=|==|=|>|<|not in|in)\s*(.+?)\s*$')
+
+
+def group_key(name):
+    """Columna que identifica la región / estado de un dataset (None en la serie nacional)"""
+    return next((column for column, kind in kinds(name).items() if kind == 'category'), None)
+
+
+def _unique(columns):
+    return list(dict.fromkeys(column for column in columns if column is not None))
+
+
+# ==============================================================================
+# LECTURA POR LOTES
+# ==============================================================================
+
+def scan(name, columns=None, where=None, start=None, end=None,
+         parquet_dir=PARQUET_DIR, data_dir=DATA_DIR, batch_rows=BATCH_ROWS):
+    """
+    Recorrer un dataset por lotes con proyección y filtros empujados al lector
+
+    Args:
+        name (str): Dataset (clave de covid_eda.schema.COLUMNS)
+        columns (list): Columnas a leer (None = todas las del esquema)
+        where (list): Filtros (columna, operador, valor)
+        start, end: Rango de fechas (inclusivo) en datasets históricos
+
+    Yields:
+        pd.DataFrame: Un lote ya filtrado con las columnas pedidas
+    """
+    columns = list(COLUMNS[name]) if columns is None else list(columns)
+    filters = list(where or []) + _date_filters(name, start, end)
+    check_columns(name, columns + [column for column, _, _ in filters])
+    upgrade_dataset(name, parquet_dir, data_dir)
+    path = dataset_path(name, parquet_dir)
+
+    if has_pyarrow() and os.path.isdir(path):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        legacy = legacy_names(name, parquet_dir)
+        dataset = ds.dataset(path, format='parquet',
+                             partitioning='hive' if name in PARTITIONED else None)
+        stored = [legacy.get(column, column) for column in columns
+                  if legacy.get(column, column) in dataset.schema.names]
+        filters = [(legacy.get(column, column), op, value) for column, op, value in filters]
+        expression = pq.filters_to_expression(filters) if filters else None
+        # Cada archivo / row group da sus propios lotes, a menudo pequeños: se
+        # agrupan hasta batch_rows filas para no pagar el coste fijo de pandas por lote
+        pending, rows = [], 0
+        for batch in dataset.to_batches(columns=stored, filter=expression, batch_size=batch_rows):
+            pending.append(batch)
+            rows += batch.num_rows
+            if rows >= batch_rows:
+                yield pa.Table.from_batches(pending).to_pandas().rename(columns=ALIASES)
+                pending, rows = [], 0
+        if rows:
+            yield pa.Table.from_batches(pending).to_pandas().rename(columns=ALIASES)
+        return
+
+    if not os.path.exists(csv_path(name, data_dir)):
+        return
+    # Las columnas de los filtros se leen para filtrar y se descartan después
+    needed = set(columns) | {column for column, _, _ in filters}
+    for chunk in pd.read_csv(csv_path(name, data_dir), chunksize=batch_rows,
+                             usecols=lambda column: ALIASES.get(column, column) in needed):
+        chunk = apply_filters(conform(chunk, name), filters)
+        if len(chunk):
+            yield chunk[[column for column in columns if column in chunk.columns]]
+
+
+def query(name, columns=None, where=None, **scan_args):
+    """Filas que cumplen los filtros (sólo se materializa el resultado)"""
+    batches = list(scan(name, columns, where, **scan_args))
+    if not batches:
+        return pd.DataFrame(columns=list(COLUMNS[name]) if columns is None else list(columns))
+    return pd.concat(batches, ignore_index=True)
+
+
+# ==============================================================================
+# CONSULTAS PREPARADAS
+# ==============================================================================
+
+def _select(df, column, k, ascending):
+    return df.nsmallest(k, column) if ascending else df.nlargest(k, column)
+
+
+def top(name, column, k=15, columns=None, where=None, ascending=False, **scan_args):
+    """
+    k filas con el mayor valor de `column` (el menor con ascending=True)
+
+    Cada lote aporta sus k mejores candidatos: en memoria nunca hay más de
+    un lote y 2k filas.
+    """
+    columns = _unique([group_key(name), 'date' if name in PARTITIONED else None, column,
+                       *(columns or [])])
+    best = None
+    for batch in scan(name, columns, where, **scan_args):
+        candidates = _select(batch, column, k, ascending)
+        best = candidates if best is None else \
+            _select(pd.concat([best, candidates], ignore_index=True), column, k, ascending)
+    if best is None:
+        return pd.DataFrame(columns=columns)
+    return best.reset_index(drop=True)
+
+
+def latest(name, columns=None, where=None, **scan_args):
+    """
+    Último registro de cada región (los datasets sin fecha ya son una foto)
+
+    Los filtros se aplican antes: con ('cases', '>', 10000) se obtiene el
+    último día de cada región en que se superaban 10.000 casos.
+    """
+    key = group_key(name)
+    if name not in PARTITIONED:
+        return query(name, _unique([key, *(columns or COLUMNS[name])]), where, **scan_args)
+
+    columns = _unique([key, 'date', *(columns or COLUMNS[name])])
+    current = None
+    for batch in scan(name, columns, where, **scan_args):
+        frame = batch if current is None else pd.concat([current, batch], ignore_index=True)
+        # Ordenar y quedarse con la última fila por región (idxmax por grupo sobre
+        # fechas recorre los grupos en Python)
+        frame = frame.sort_values('date', kind='stable')
+        current = frame.tail(1) if key is None else frame.drop_duplicates(key, keep='last')
+    if current is None:
+        return pd.DataFrame(columns=columns)
+    return current.sort_values(_unique([key]) or ['date'], kind='stable').reset_index(drop=True)
+
+
+def ranking(name, metric, k=15, where=None, ascending=False, **scan_args):
+    """Las k regiones / estados con mayor `metric` en su último registro"""
+    snapshot = latest(name, [metric], where, **scan_args)
+    return _select(snapshot, metric, k, ascending).reset_index(drop=True)
+
+
+def _per_label(per):
+    if per == 1_000_000:
+        return 'million'
+    return f'{per // 1000}k' if per % 1000 == 0 else str(per)
+
+
+def per_capita(name='states', metric='cases', per=100_000, k=15, where=None, ascending=False,
+               **scan_args):
+    """
+    Ranking de `metric` por cada `per` habitantes
+
+    Returns:
+        pd.DataFrame: clave, metric, population y <metric>_per_<100k|million|...>
+    """
+    if 'population' not in COLUMNS[name]:
+        raise SchemaError(f"{name}: no tiene columna 'population'")
+    snapshot = latest(name, [metric, 'population'], where, **scan_args)
+    snapshot = snapshot[snapshot['population'] > 0].copy()
+    column = f'{metric}_per_{_per_label(per)}'
+    snapshot[column] = snapshot[metric] / snapshot['population'] * per
+    return _select(snapshot, column, k, ascending).reset_index(drop=True)
+
+
+def _partial(batch, metrics, by):
+    """count / sum / min / max de un lote, por grupo"""
+    values = batch[metrics].astype('float64')
+    keys = [batch[column] for column in by] if by else [np.zeros(len(batch), dtype=np.int8)]
+    return values.groupby(keys, observed=True).agg(list(_MERGE))
+
+
+def _combine(partials):
+    frame = pd.concat(partials)
+    levels = list(range(frame.index.nlevels))
+    return frame.groupby(level=levels, observed=True).agg({column: _MERGE[column[1]]
+                                                           for column in frame.columns})
+
+
+def _finish(partial, metrics, by, how, counts):
+    """Agregados finales (mean = sum / count) en columnas <métrica>_<agregado>"""
+    result = pd.DataFrame(index=partial.index)
+    for metric in metrics:
+        for aggregate in how:
+            if aggregate == 'mean':
+                count = partial[(metric, 'count')]
+                values = partial[(metric, 'sum')] / count.where(count > 0)
+            else:
+                values = partial[(metric, aggregate)]
+            # Los conteos del esquema no tienen nulos: su suma, mínimo y máximo son enteros
+            if aggregate == 'count' or (aggregate != 'mean' and metric in counts):
+                values = values.astype('int64')
+            result[f'{metric}_{aggregate}'] = values
+    if not by:
+        return result.reset_index(drop=True)
+    result.index.names = by
+    return result.reset_index()
+
+
+def _aggregate(name, batches, metrics, by, how):
+    unknown = [aggregate for aggregate in how if aggregate not in AGGREGATES]
+    if unknown:
+        raise ValueError(f"Agregados desconocidos: {', '.join(unknown)} (opciones: {', '.join(AGGREGATES)})")
+    partial = None
+    for batch in batches:
+        new = _partial(batch, metrics, by)
+        partial = new if partial is None else _combine([partial, new])
+    if partial is None:
+        return pd.DataFrame(columns=[*by, *(f'{metric}_{aggregate}' for metric in metrics
+                                            for aggregate in how)])
+    counts = {column for column, kind in kinds(name).items() if kind == 'count'}
+    return _finish(partial, metrics, by, how, counts)
+
+
+def aggregate(name, metrics, by=None, where=None, how=AGGREGATES, **scan_args):
+    """
+    count / sum / mean / min / max de una o varias columnas
+
+    Args:
+        metrics (list): Columnas numéricas
+        by (list): Columnas de agrupación (None = un único total)
+        how (iterable): Agregados de AGGREGATES
+    """
+    metrics, by = list(metrics), list(by or [])
+    batches = scan(name, _unique([*by, *metrics]), where, **scan_args)
+    return _aggregate(name, batches, metrics, by, how)
+
+
+def windowed(name, metrics, freq='W', by=None, where=None, how=('mean',), **scan_args):
+    """
+    Agregados por ventana de calendario (semana 'W', mes 'M', trimestre 'Q'...)
+
+    Args:
+        by (list): Agrupación además de la ventana (None = la región del dataset)
+
+    Returns:
+        pd.DataFrame: by, period (inicio de la ventana) y <métrica>_<agregado>
+    """
+    if name not in PARTITIONED:
+        raise SchemaError(f"{name}: no es un histórico con fechas")
+    metrics = list(metrics)
+    by = list(by) if by is not None else _unique([group_key(name)])
+
+    def batches():
+        for batch in scan(name, _unique([*by, 'date', *metrics]), where, **scan_args):
+            batch['period'] = batch['date'].dt.to_period(freq).dt.start_time
+            yield batch
+
+    return _aggregate(name, batches(), metrics, [*by, 'period'], how)
+
+
+QUERIES = {
+    'top': top,
+    'latest': latest,
+    'ranking': ranking,
+    'per_capita': per_capita,
+    'aggregate': aggregate,
+    'windowed': windowed,
+}
+
+
+# ==============================================================================
+# LÍNEA DE COMANDOS
+# ==============================================================================
+
+def _value(kind, text):
+    if kind == 'count':
+        return int(text)
+    if kind == 'rate':
+        return float(text)
+    if kind == 'datetime':
+        return pd.Timestamp(text)
+    return text
+
+
+def parse_where(name, text):
+    """'cases > 10000' o 'region in Spain,Italy' -> filtro (columna, operador, valor)"""
+    match = _WHERE.match(text)
+    if not match:
+        raise ValueError(f"Filtro no válido: {text!r} (se espera 'columna operador valor')")
+    column, op, value = match.groups()
+    check_columns(name, [column])
+    kind = kinds(name).get(column, 'count')     # 'year', la partición
+    if op in ('in', 'not in'):
+        return column, op, [_value(kind, item.strip()) for item in value.split(',')]
+    return column, '==' if op == '=' else op, _value(kind, value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m covid_eda.query',
+                                     description='Consultas sobre los datasets guardados')
+    parser.add_argument('query', choices=list(QUERIES))
+    parser.add_argument('dataset', choices=list(CSV_FILES))
+    parser.add_argument('metrics', nargs='*', help='Columna(s) de la consulta')
+    parser.add_argument('--where', action='append', default=[],
+                        help="Filtro, p.ej. \"cases > 10000\" o \"region in Spain,Italy\" (repetible)")
+    parser.add_argument('--k', type=int, default=15, help='Filas de top / ranking / per_capita')
+    parser.add_argument('--ascending', action='store_true', help='Los menores en lugar de los mayores')
+    parser.add_argument('--by', default=None, help='Columnas de agrupación separadas por comas')
+    parser.add_argument('--how', default=None,
+                        help=f"Agregados separados por comas ({','.join(AGGREGATES)})")
+    parser.add_argument('--freq', default='W', help='Ventana de windowed (W, M, Q...). Por defecto W')
+    parser.add_argument('--per', type=int, default=100_000, help='Habitantes de per_capita')
+    parser.add_argument('--start', default=None, help='Fecha inicial (AAAA-MM-DD)')
+    parser.add_argument('--end', default=None, help='Fecha final (AAAA-MM-DD)')
+    parser.add_argument('--output', default=None, help='Guardar el resultado en CSV')
+    args = parser.parse_args(argv)
+
+    try:
+        where = [parse_where(args.dataset, text) for text in args.where]
+    except (ValueError, SchemaError) as exc:
+        parser.error(str(exc))
+    scan_args = {'start': args.start, 'end': args.end}
+    split = (lambda value: [item.strip() for item in value.split(',') if item.strip()])
+    by = split(args.by) if args.by else None
+    metric = args.metrics[0] if args.metrics else 'cases'
+
+    if args.query in ('top', 'ranking'):
+        result = QUERIES[args.query](args.dataset, metric, k=args.k, where=where,
+                                     ascending=args.ascending, **scan_args)
+    elif args.query == 'per_capita':
+        result = per_capita(args.dataset, metric, per=args.per, k=args.k, where=where,
+                            ascending=args.ascending, **scan_args)
+    elif args.query == 'latest':
+        result = latest(args.dataset, args.metrics or None, where, **scan_args)
+    elif args.query == 'aggregate':
+        result = aggregate(args.dataset, args.metrics or [metric], by=by, where=where,
+                           how=split(args.how) if args.how else AGGREGATES, **scan_args)
+    else:
+        result = windowed(args.dataset, args.metrics or [metric], freq=args.freq, by=by, where=where,
+                          how=split(args.how) if args.how else ('mean',), **scan_args)
+
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"💾 {len(result)} filas guardadas en {args.output}")
+    else:
+        with pd.option_context('display.width', 200, 'display.max_columns', None):
+            print(result.to_string(index=False) if len(result) else '(sin resultados)')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,270 @@
+# ==============================================================================
+# ÍNDICE DE RANKINGS - TOP-K, PERCENTILES Y CAMBIOS DE PUESTO POR REGIÓN
+# ==============================================================================
+#
+# RankingIndex mantiene, para cada métrica, las regiones (estados o países)
+# ya ordenadas de mayor a menor: un top-k es leer los k primeros, y el puesto
+# o el percentil de una región es una búsqueda binaria. Con miles de regiones
+# cada consulta tarda microsegundos, frente a un nlargest por consulta.
+#
+# Cuando llega una nueva foto (update), sólo se recolocan las regiones cuyo
+# valor cambió: se sacan de su posición y se insertan en la nueva con
+# searchsorted. Si cambia más de REBUILD_FRACTION de las regiones (p.ej. un día
+# nuevo de acumulados), se reordena todo de una vez, que entonces es más barato.
+#
+# Cada foto con etiqueta (una fecha) guarda los puestos de ese momento, hasta
+# HISTORY_SNAPSHOTS fotos: rank_changes compara el puesto actual con el de
+# cualquiera de ellas.
+#
+# Convenciones: puesto 1 = valor más alto; los empates comparten puesto (el
+# menor); los NaN no tienen puesto y nunca entran en un top.
+
+import collections
+import operator
+
+import numpy as np
+import pandas as pd
+
+# Regiones cambiadas (fracción) a partir de la cual update reordena todo
+REBUILD_FRACTION = 0.125
+# Fotos cuyos puestos se conservan para rank_changes
+HISTORY_SNAPSHOTS = 90
+
+_OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le,
+              '==': operator.eq, '=': operator.eq, '!=': operator.ne}
+
+
+class RankingIndex:
+    """
+    Rankings pre-ordenados de varias métricas sobre un conjunto de regiones
+
+    Args:
+        frame (pd.DataFrame): Foto inicial, una fila por región
+        key (str): Columna con el nombre de la región ('state', 'region')
+        metrics (list): Columnas numéricas a indexar
+        label: Etiqueta de la foto (p.ej. su fecha) para rank_changes
+    """
+
+    def __init__(self, frame, key, metrics, label=None, history=HISTORY_SNAPSHOTS):
+        self.key = key
+        self.metrics = list(metrics)
+        self.keys = np.array([], dtype=object)
+        self._row = {}
+        self.values = {metric: np.array([], dtype=np.float64) for metric in self.metrics}
+        self._order = {}      # métrica -> filas de mayor a menor (NaN al final)
+        self._sorted = {}     # métrica -> -valor en ese orden (ascendente; NaN -> inf)
+        self._position = {}   # métrica -> posición de cada fila en _order
+        self._history = collections.OrderedDict()
+        self._history_size = history
+        self.label = None
+        self.update(frame, label)
+
+    def __len__(self):
+        return len(self.keys)
+
+    # --------------------------------------------------------------------------
+    # Construcción y actualización
+    # --------------------------------------------------------------------------
+
+    def _rebuild(self, metric):
+        sort_keys = -self.values[metric]
+        sort_keys[np.isnan(sort_keys)] = np.inf
+        order = np.argsort(sort_keys, kind='stable')
+        position = np.empty(len(order), dtype=np.int64)
+        position[order] = np.arange(len(order))
+        self._order[metric], self._sorted[metric] = order, sort_keys[order]
+        self._position[metric] = position
+
+    def _move(self, metric, row):
+        """Recolocar una fila cuyo valor cambió"""
+        order, sorted_keys, position = self._order[metric], self._sorted[metric], self._position[metric]
+        old = position[row]
+        value = -self.values[metric][row]
+        value = np.inf if np.isnan(value) else value
+        order, sorted_keys = np.delete(order, old), np.delete(sorted_keys, old)
+        # Tras los empates: a igual valor, primero la región que ya estaba
+        new = int(np.searchsorted(sorted_keys, value, side='right'))
+        order, sorted_keys = np.insert(order, new, row), np.insert(sorted_keys, new, value)
+        low, high = min(old, new), max(old, new) + 1
+        position[order[low:high]] = np.arange(low, high)
+        self._order[metric], self._sorted[metric] = order, sorted_keys
+
+    def update(self, frame, label=None):
+        """
+        Incorporar una foto nueva (las regiones que no aparecen conservan su valor)
+
+        Args:
+            frame (pd.DataFrame): Filas con key y las métricas indexadas
+            label: Etiqueta de la foto; si se da, se guardan sus puestos
+
+        Returns:
+            int: Regiones nuevas o con algún valor distinto
+        """
+        keys = frame[self.key].astype(str).to_numpy()
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._row]
+        if new_keys:
+            # Regiones nuevas: se añaden con NaN y se reordena todo
+            self._row.update({key: len(self.keys) + i for i, key in enumerate(new_keys)})
+            self.keys = np.concatenate([self.keys, np.array(new_keys, dtype=object)])
+            for metric in self.metrics:
+                self.values[metric] = np.concatenate([self.values[metric],
+                                                      np.full(len(new_keys), np.nan)])
+        rows = np.fromiter((self._row[key] for key in keys), dtype=np.int64, count=len(keys))
+
+        changed = np.zeros(len(self.keys), dtype=bool)
+        updates = {}
+        for metric in self.metrics:
+            values = frame[metric].to_numpy(dtype=np.float64)
+            old = self.values[metric][rows]
+            differs = ~((old == values) | (np.isnan(old) & np.isnan(values)))
+            updates[metric] = (rows[differs], values[differs])
+            changed[rows[differs]] = True
+
+        n_changed = int(changed.sum())
+        rebuild = bool(new_keys) or not self._order or n_changed > REBUILD_FRACTION * len(self.keys)
+        for metric, (metric_rows, values) in updates.items():
+            self.values[metric][metric_rows] = values
+            if rebuild:
+                self._rebuild(metric)
+            else:
+                for row in metric_rows:
+                    self._move(metric, row)
+
+        if label is not None:
+            self.label = label
+            self._history[label] = {metric: self.ranks(metric).astype(np.float32)
+                                    for metric in self.metrics}
+            self._history.move_to_end(label)
+            while len(self._history) > self._history_size:
+                self._history.popitem(last=False)
+        return n_changed
+
+    @classmethod
+    def from_history(cls, df, key, metrics, date='date', history=HISTORY_SNAPSHOTS):
+        """
+        Índice a partir de un histórico largo, aplicando las fotos día a día
+
+        Returns:
+            RankingIndex: Con los puestos de los últimos `history` días
+        """
+        index = None
+        for day, rows in df.sort_values(date, kind='stable').groupby(date, sort=True):
+            label = pd.Timestamp(day).date().isoformat()
+            if index is None:
+                index = cls(rows, key, metrics, label=label, history=history)
+            else:
+                index.update(rows, label=label)
+        return index
+
+    # --------------------------------------------------------------------------
+    # Consultas
+    # --------------------------------------------------------------------------
+
+    def _valid(self, metric):
+        """Número de regiones con valor (los NaN van al final del orden)"""
+        return int(np.searchsorted(self._sorted[metric], np.inf, side='left'))
+
+    def _mask(self, where):
+        mask = np.ones(len(self.keys), dtype=bool)
+        for column, op, value in where or []:
+            if column == self.key:
+                values = np.isin(self.keys, [str(item) for item in value] if op in ('in', 'not in')
+                                 else [str(value)])
+                mask &= ~values if op in ('not in', '!=') else values
+            elif op in ('in', 'not in'):
+                values = np.isin(self.values[column], value)
+                mask &= ~values if op == 'not in' else values
+            else:
+                mask &= _OPERATORS[op](self.values[column], value)
+        return mask
+
+    def ranks(self, metric):
+        """Puesto (1 = mayor valor, empates con el menor) de cada región; NaN si no tiene valor"""
+        sorted_keys = self._sorted[metric]
+        position = self._position[metric]
+        values = sorted_keys[position]
+        ranks = np.searchsorted(sorted_keys, values, side='left').astype(np.float64) + 1
+        ranks[np.isinf(values)] = np.nan
+        return ranks
+
+    def top(self, metric, k=10, where=None, ascending=False):
+        """
+        Las k regiones con mayor valor (menor con ascending) que cumplen los filtros
+
+        Args:
+            where (list): Filtros (columna, operador, valor) sobre la clave o
+                sobre cualquier métrica indexada, p.ej. [('cases', '>', 10000)]
+
+        Returns:
+            pd.DataFrame: rank, key y el valor de la métrica (y de las filtradas)
+        """
+        order = self._order[metric][:self._valid(metric)]
+        if ascending:
+            order = order[::-1]
+        if where:
+            order = order[self._mask(where)[order]]
+        rows = order[:k]
+        sorted_keys = self._sorted[metric]
+        ranks = np.searchsorted(sorted_keys, sorted_keys[self._position[metric][rows]], side='left') + 1
+        columns = {'rank': ranks, self.key: self.keys[rows], metric: self.values[metric][rows]}
+        for column, _, _ in where or []:
+            if column != self.key and column not in columns:
+                columns[column] = self.values[column][rows]
+        return pd.DataFrame(columns)
+
+    def rank(self, key, metric):
+        """Puesto de una región (None si no tiene valor)"""
+        row = self._row[str(key)]
+        value = self._sorted[metric][self._position[metric][row]]
+        if np.isinf(value):
+            return None
+        return int(np.searchsorted(self._sorted[metric], value, side='left')) + 1
+
+    def percentiles(self, metric):
+        """Percentil de cada región: % de regiones con valor menor o igual (NaN sin valor)"""
+        valid = self._valid(metric)
+        sorted_keys = self._sorted[metric][:valid]
+        values = self._sorted[metric][self._position[metric]]
+        at_or_below = valid - np.searchsorted(sorted_keys, values, side='left')
+        result = at_or_below / max(valid, 1) * 100
+        result[np.isinf(values)] = np.nan
+        return pd.Series(result, index=self.keys, name=f'{metric}_percentile')
+
+    def percentile(self, key, metric):
+        """Percentil de una región (None si no tiene valor)"""
+        row = self._row[str(key)]
+        value = self._sorted[metric][self._position[metric][row]]
+        if np.isinf(value):
+            return None
+        valid = self._valid(metric)
+        return float(valid - np.searchsorted(self._sorted[metric][:valid], value, side='left')) / valid * 100
+
+    @property
+    def labels(self):
+        """Etiquetas de las fotos guardadas, de la más antigua a la más reciente"""
+        return list(self._history)
+
+    def rank_changes(self, metric, since=None):
+        """
+        Cambio de puesto de cada región desde una foto anterior
+
+        Args:
+            since: Etiqueta de la foto de referencia (None = la anterior a la actual)
+
+        Returns:
+            pd.DataFrame: key, rank_before, rank y change (positivo = sube),
+                de mayor subida a mayor bajada
+        """
+        labels = self.labels
+        if since is None:
+            if len(labels) < 2:
+                raise KeyError("No hay una foto anterior con la que comparar")
+            since = labels[-2]
+        before = self._history[since][metric]
+        now = self.ranks(metric)
+        # Regiones añadidas después de la foto de referencia: sin puesto anterior
+        before = np.concatenate([before, np.full(len(now) - len(before), np.nan)])
+        changes = pd.DataFrame({self.key: self.keys, 'rank_before': before, 'rank': now,
+                                'change': before - now})
+        return changes.dropna(subset=['change']).sort_values(
+            ['change', 'rank'], ascending=[False, True], kind='stable').reset_index(drop=True)
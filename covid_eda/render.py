@@ -0,0 +1,624 @@
+# ==============================================================================
+# ETAPA RENDER - VISUALIZACIONES ESTÁTICAS E INTERACTIVAS
+# ==============================================================================
+#
+# matplotlib, seaborn y plotly se importan dentro de cada función para que
+# importar este módulo (o ejecutar sólo la etapa transform) no pague su coste.
+#
+# Las figuras son independientes entre sí: render_figures las reparte en un
+# pool de procesos (backend Agg). Los DataFrames no viajan con cada tarea: con
+# 'fork' los procesos heredan los del padre sin copiarlos y, si no hay fork,
+# se envían una sola vez por proceso al arrancarlo.
+#
+# Las figuras cuyas columnas de entrada y spec no han cambiado desde el último
+# render se reutilizan (ver covid_eda/figcache.py).
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from covid_eda.config import DASHBOARD_MAX_POINTS, FIGURE_DPI, IMAGES_DIR, RENDER_WORKERS
+
+# Estilo común de las figuras (forma parte de la clave de la caché de figuras)
+RENDER_STYLE = {'matplotlib': 'default', 'palette': 'husl'}
+
+
+def _pyplot():
+    """Importar pyplot con el backend Agg (sólo se guardan archivos)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def set_style():
+    """Configurar el estilo general de las figuras"""
+    plt = _pyplot()
+    import seaborn as sns
+
+    plt.style.use(RENDER_STYLE['matplotlib'])
+    sns.set_palette(RENDER_STYLE['palette'])
+
+
+def _stars(p):
+    """Marca de significación de un p-valor"""
+    if p is None or np.isnan(p):
+        return ''
+    return '***' if p < 0.001 else '**' if p < 0.01 else '*' if p < 0.05 else ''
+
+
+def _plot_line(ax, x, y, dpi, **kwargs):
+    """Línea decimada con LTTB al ancho en píxeles del eje"""
+    from covid_eda.decimate import axis_pixels, decimate
+    return ax.plot(*decimate(x, y, axis_pixels(ax, dpi)), **kwargs)
+
+
+def _plot_bars(ax, x, y, dpi, **kwargs):
+    """Barras diarias reducidas a la envolvente mín/máx (al menos 2 px por barra)"""
+    from covid_eda.decimate import axis_pixels, decimate
+    x_bars, y_bars = decimate(x, y, axis_pixels(ax, dpi) // 2, method='minmax')
+    if len(x_bars) < len(x):
+        kwargs['width'] = 0.8 * (x.iloc[-1] - x.iloc[0]).days / len(x_bars)
+    return ax.bar(x_bars, y_bars, **kwargs)
+
+
+def _mark_anomalies(ax, flags, column, label=True):
+    """Días anómalos de una serie diaria (covid_eda.anomalies): puntos marcados y cambios de nivel"""
+    rows = flags[flags['column'] == column]
+    points = rows[rows['method'] != 'change_point'].drop_duplicates('date')
+    if not points.empty:
+        ax.scatter(points['date'], points['value'], marker='x', s=40, color='black', zorder=3,
+                   label=f'Anomalías ({len(points)})' if label else None)
+    for i, date in enumerate(rows.loc[rows['method'] == 'change_point', 'date']):
+        ax.axvline(date, color='gray', linestyle=':', linewidth=1.5,
+                   label='Cambio de nivel' if label and i == 0 else None)
+
+
+def _save(plt, path, dpi):
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close()
+
+
+# ==============================================================================
+# FIGURAS POR ESTADOS
+# ==============================================================================
+
+def plot_univariate_distributions(df_us, df_states, path, dpi=FIGURE_DPI):
+    """Histogramas con estadísticas descriptivas de las variables clave"""
+    if df_states.empty:
+        return False
+    plt = _pyplot()
+
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
+    fig.suptitle('📊 Análisis Univariado - Distribuciones de Variables Clave', fontsize=20, fontweight='bold')
+
+    histograms = [
+        (ax1, df_states['cases_per_100k'], 20, 'skyblue', '.0f', '',
+         '📈 Distribución: Casos por 100k Habitantes', 'Casos por 100k Habitantes', 'Frecuencia (Estados)'),
+        (ax2, df_states['deaths_per_100k'], 20, 'lightcoral', '.0f', '',
+         '💀 Distribución: Muertes por 100k Habitantes', 'Muertes por 100k Habitantes', 'Frecuencia (Estados)'),
+        (ax3, df_states['fatality_rate'], 20, 'gold', '.2f', '%',
+         '📊 Distribución: Tasa de Letalidad', 'Tasa de Letalidad (%)', 'Frecuencia (Estados)'),
+    ]
+    # Histograma 4: Casos diarios recientes
+    if not df_us.empty:
+        histograms.append(
+            (ax4, df_us.tail(90)['new_cases'], 25, 'lightgreen', '.0f', '',
+             '🦠 Distribución: Casos Diarios (Últimos 90 días)', 'Casos Nuevos por Día', 'Frecuencia (Días)'))
+
+    for ax, data, bins, color, fmt, unit, title, xlabel, ylabel in histograms:
+        ax.hist(data, bins=bins, alpha=0.7, color=color, edgecolor='black')
+        ax.axvline(data.mean(), color='red', linestyle='--', linewidth=2,
+                   label=f'Media: {data.mean():{fmt}}{unit}')
+        ax.axvline(data.median(), color='orange', linestyle='--', linewidth=2,
+                   label=f'Mediana: {data.median():{fmt}}{unit}')
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    _save(plt, path, dpi)
+    print("✅ Histogramas de distribuciones guardados")
+    return True
+
+
+def plot_outlier_detection_boxplots(df_us, df_states, path, dpi=FIGURE_DPI):
+    """Boxplots con el número de outliers IQR por variable"""
+    if df_states.empty:
+        return False
+    plt = _pyplot()
+    from covid_eda.outliers import detect_outliers
+
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
+    fig.suptitle('📦 Detección de Outliers - Análisis con Boxplots', fontsize=20, fontweight='bold')
+
+    variables = [
+        ('cases_per_100k', 'skyblue', '📈 Casos por 100k'),
+        ('deaths_per_100k', 'lightcoral', '💀 Muertes por 100k'),
+        ('fatality_rate', 'gold', '📊 Tasa de Letalidad'),
+        ('cases', 'lightgreen', '🦠 Casos Totales')
+    ]
+
+    masks, _ = detect_outliers(df_states, columns=[var for var, _, _ in variables], methods=('iqr',))
+
+    for ax, (var, color, title) in zip([ax1, ax2, ax3, ax4], variables):
+        data = df_states[var] if var != 'cases' else df_states[var]/1e6
+        ax.boxplot(data, patch_artist=True, boxprops=dict(facecolor=color, alpha=0.7))
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_ylabel('Millones' if var == 'cases' else ('Por 100k' if 'per_100k' in var else '%'))
+        ax.grid(True, alpha=0.3)
+
+        ax.text(0.02, 0.98, f"Outliers: {masks[('iqr', var)].sum()}", transform=ax.transAxes,
+                fontsize=12, verticalalignment='top',
+                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+
+    _save(plt, path, dpi)
+    print("✅ Boxplots de outliers guardados")
+    return True
+
+
+def plot_bivariate_scatter_plots(df_us, df_states, path, dpi=FIGURE_DPI):
+    """Scatter plots entre variables con sus coeficientes de correlación"""
+    if df_states.empty:
+        return False
+    from covid_eda.correlation import correlation_matrix, pair
+    from covid_eda.summary import CORRELATION_COLUMNS
+
+    plt = _pyplot()
+    correlations = correlation_matrix(df_states, CORRELATION_COLUMNS)
+
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
+    fig.suptitle('🔍 Análisis Bivariado - Relaciones entre Variables', fontsize=20, fontweight='bold')
+
+    population_m = df_states['population']/1e6
+    scatters = [
+        (ax1, population_m, df_states['cases']/1e6, df_states['fatality_rate'], 'Reds',
+         ('population', 'cases'), 'Población (Millones)', 'Casos Totales (Millones)',
+         '👥 Población vs Casos (Color: Tasa Letalidad)', 'Tasa Letalidad (%)'),
+        (ax2, df_states['cases_per_100k'], df_states['deaths_per_100k'], population_m, 'viridis',
+         ('cases_per_100k', 'deaths_per_100k'), 'Casos por 100k', 'Muertes por 100k',
+         '📊 Casos vs Muertes per cápita (Color: Población)', 'Población (M)'),
+        (ax3, df_states['cases']/1e6, df_states['fatality_rate'], population_m, 'plasma',
+         ('cases', 'fatality_rate'), 'Casos (Millones)', 'Tasa Letalidad (%)',
+         '📈 Casos vs Letalidad', 'Población (M)'),
+        (ax4, population_m, df_states['cases_per_100k'], df_states['fatality_rate'], 'coolwarm',
+         ('population', 'cases_per_100k'), 'Población (Millones)', 'Casos por 100k',
+         '🏙️ Población vs Casos per cápita', 'Tasa Letalidad (%)'),
+    ]
+
+    for ax, x, y, c, cmap, (col_x, col_y), xlabel, ylabel, title, cbar_label in scatters:
+        scatter = ax.scatter(x, y, c=c, cmap=cmap, s=100, alpha=0.7)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        plt.colorbar(scatter, ax=ax, label=cbar_label)
+        pearson = pair(correlations, col_x, col_y)
+        spearman = pair(correlations, col_x, col_y, 'spearman')
+        ax.text(0.05, 0.95, f"r = {pearson['r']:.3f} [{pearson['ci_low']:.2f}, {pearson['ci_high']:.2f}]"
+                            f"{_stars(pearson['p'])}\nρ = {spearman['r']:.3f}{_stars(spearman['p'])}",
+                transform=ax.transAxes, fontsize=12, verticalalignment='top',
+                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+
+    _save(plt, path, dpi)
+    print("✅ Scatter plots guardados")
+    return True
+
+
+def plot_correlation_heatmap(df_us, df_states, path, dpi=FIGURE_DPI):
+    """Mapa de calor de correlaciones entre variables por estado"""
+    if df_states.empty:
+        return False
+
+    from covid_eda.correlation import correlation_matrix, matrix_frame
+    from covid_eda.summary import CORRELATION_COLUMNS
+
+    correlations = correlation_matrix(df_states, CORRELATION_COLUMNS)
+    if len(correlations['columns']) <= 2:
+        return False
+
+    plt = _pyplot()
+    import seaborn as sns
+
+    plt.figure(figsize=(12, 10))
+    r, p = matrix_frame(correlations), matrix_frame(correlations, stat='p')
+    mask = np.triu(np.ones_like(r), k=1)
+    labels = r.applymap('{:.3f}'.format) + p.applymap(_stars)
+
+    sns.heatmap(r, mask=mask, annot=labels, cmap='RdBu_r', center=0,
+                square=True, linewidths=0.5, cbar_kws={"shrink": .8}, fmt='')
+
+    plt.title('🔥 Mapa de Correlaciones - Variables COVID-19', fontsize=16, fontweight='bold', pad=20)
+    plt.xlabel('r de Pearson   * p < 0.05   ** p < 0.01   *** p < 0.001', fontsize=10)
+    _save(plt, path, dpi)
+    print("✅ Mapa de correlaciones guardado")
+    return True
+
+
+def plot_states_rankings(df_us, df_states, path, dpi=FIGURE_DPI):
+    """Top 15 estados por casos, casos per cápita, muertes y letalidad"""
+    from covid_eda.ranking import RankingIndex
+
+    if df_states.empty:
+        return False
+    plt = _pyplot()
+
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
+    fig.suptitle('🏆 Rankings de Estados COVID-19', fontsize=18, fontweight='bold')
+
+    rankings = [
+        (ax1, 'cases', 'skyblue', '📊 Top 15 - Casos Totales', 'Casos Totales', lambda x, p: f'{x/1e6:.1f}M'),
+        (ax2, 'cases_per_100k', 'orange', '📊 Top 15 - Casos por 100k', 'Casos por 100k', None),
+        (ax3, 'deaths', 'red', '💀 Top 15 - Muertes', 'Muertes Totales', lambda x, p: f'{x/1e3:.0f}K'),
+        (ax4, 'fatality_rate', 'darkred', '📈 Top 15 - Tasa Letalidad', 'Tasa Letalidad (%)', None),
+    ]
+
+    index = RankingIndex(df_states, 'state', [metric for _, metric, _, _, _, _ in rankings])
+    for ax, metric, color, title, xlabel, formatter in rankings:
+        top15 = index.top(metric, 15)
+        ax.barh(range(len(top15)), top15[metric], color=color, alpha=0.8)
+        ax.set_yticks(range(len(top15)))
+        ax.set_yticklabels(top15['state'])
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_xlabel(xlabel)
+        if formatter is not None:
+            ax.xaxis.set_major_formatter(plt.FuncFormatter(formatter))
+
+    _save(plt, path, dpi)
+    print("✅ Rankings de estados guardados")
+    return True
+
+
+# ==============================================================================
+# FIGURAS TEMPORALES
+# ==============================================================================
+
+def plot_temporal_evolution(df_us, df_states, path, dpi=FIGURE_DPI):
+    """Evolución temporal completa: acumulados, diarios con sus anomalías y promedios móviles"""
+    if df_us.empty:
+        return False
+    plt = _pyplot()
+    from covid_eda.anomalies import detect_anomalies
+
+    flags = detect_anomalies(df_us)
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
+    fig.suptitle('📊 COVID-19 EE.UU.: Evolución Temporal Completa', fontsize=20, fontweight='bold')
+
+    # Casos acumulados
+    _plot_line(ax1, df_us['date'], df_us['cases'], dpi, color='blue', linewidth=2.5)
+    ax1.set_title('🦠 Casos Acumulados', fontsize=14, fontweight='bold')
+    ax1.set_ylabel('Casos Totales')
+    ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x/1e6:.1f}M'))
+    ax1.grid(True, alpha=0.3)
+
+    # Muertes acumuladas
+    _plot_line(ax2, df_us['date'], df_us['deaths'], dpi, color='red', linewidth=2.5)
+    ax2.set_title('☠️ Muertes Acumuladas', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Muertes Totales')
+    ax2.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x/1e3:.0f}K'))
+    ax2.grid(True, alpha=0.3)
+
+    # Casos diarios
+    _plot_bars(ax3, df_us['date'], df_us['new_cases'], dpi, alpha=0.6, color='blue', label='Casos Diarios')
+    _plot_line(ax3, df_us['date'], df_us['cases_7day_avg'], dpi, color='red', linewidth=3, label='Promedio 7d')
+    _mark_anomalies(ax3, flags, 'new_cases')
+    ax3.set_title('📈 Casos Diarios y Promedio Móvil', fontsize=14, fontweight='bold')
+    ax3.set_ylabel('Casos Nuevos/Día')
+    ax3.legend()
+    ax3.grid(True, alpha=0.3)
+
+    # Muertes diarias
+    _plot_bars(ax4, df_us['date'], df_us['new_deaths'], dpi, alpha=0.6, color='red', label='Muertes Diarias')
+    _plot_line(ax4, df_us['date'], df_us['deaths_7day_avg'], dpi, color='darkred', linewidth=3,
+               label='Promedio 7d')
+    _mark_anomalies(ax4, flags, 'new_deaths')
+    ax4.set_title('📈 Muertes Diarias y Promedio Móvil', fontsize=14, fontweight='bold')
+    ax4.set_ylabel('Muertes Nuevas/Día')
+    ax4.legend()
+    ax4.grid(True, alpha=0.3)
+
+    # Formatear fechas en todos los ejes x
+    for ax in [ax1, ax2, ax3, ax4]:
+        ax.tick_params(axis='x', rotation=45)
+
+    _save(plt, path, dpi)
+    print("✅ Evolución temporal guardada")
+    return True
+
+
+def plot_fatality_rate_evolution(df_us, df_states, path, dpi=FIGURE_DPI):
+    """Evolución de la tasa de letalidad (a partir de 1.000 casos)"""
+    if df_us.empty:
+        return False
+    df_filtered = df_us[df_us['cases'] > 1000]
+    if df_filtered.empty:
+        return False
+    plt = _pyplot()
+
+    from covid_eda.decimate import axis_pixels, decimate
+
+    plt.figure(figsize=(16, 8))
+    dates, rates = decimate(df_filtered['date'], df_filtered['fatality_rate'], axis_pixels(plt.gca(), dpi))
+    plt.plot(dates, rates, linewidth=3, color='darkred')
+    plt.fill_between(dates, rates, alpha=0.3, color='red')
+    plt.title('💀 Evolución de la Tasa de Letalidad COVID-19', fontsize=16, fontweight='bold')
+    plt.xlabel('Fecha')
+    plt.ylabel('Tasa de Letalidad (%)')
+    plt.grid(True, alpha=0.3)
+    plt.xticks(rotation=45)
+    _save(plt, path, dpi)
+    print("✅ Evolución de letalidad guardada")
+    return True
+
+
+# Paneles del dashboard: (columna = id del panel, título, leyenda, color)
+DASHBOARD_PANELS = (
+    ('new_cases', '📈 Casos Diarios', 'Casos Diarios', 'blue'),
+    ('new_deaths', '☠️ Muertes Diarias', 'Muertes Diarias', 'red'),
+    ('cases', '📊 Casos Acumulados', 'Casos Totales', 'green'),
+    ('fatality_rate', '💀 Tasa Letalidad', 'Tasa Letalidad', 'purple'),
+)
+
+
+def plot_interactive_dashboard(df_us, df_states, path, dpi=FIGURE_DPI):
+    """Dashboard interactivo de Plotly con las series temporales"""
+    if df_us.empty:
+        return False
+
+    try:
+        import plotly.graph_objects as go
+        from covid_eda.dashboard import export_dashboard
+        from covid_eda.decimate import decimate
+
+        # Un panel por serie (decimada con LTTB al ancho aproximado del panel)
+        figures = []
+        for column, title, name, color in DASHBOARD_PANELS:
+            dates, values = decimate(df_us['date'], df_us[column], DASHBOARD_MAX_POINTS)
+            fig = go.Figure(go.Scatter(x=dates.to_numpy(), y=values.to_numpy(), mode='lines',
+                                       name=name, line=dict(color=color)))
+            fig.update_layout(title_text=title, height=400, margin=dict(t=50, b=40, l=60, r=20))
+            figures.append((column, fig))
+
+        export_dashboard(figures, path, "🦠 COVID-19 EE.UU.: Dashboard Interactivo")
+        print("✅ Dashboard interactivo guardado")
+        return True
+    except Exception as e:
+        print(f"⚠️ Error creando dashboard interactivo: {e}")
+        return False
+
+
+# ==============================================================================
+# REGISTRO DE FIGURAS
+# ==============================================================================
+
+# nombre -> (archivo de salida, función, fase del análisis)
+FIGURES = {
+    'univariate_distributions': ('univariate_distributions.png', plot_univariate_distributions,
+                                 '📊 FASE 2: ANÁLISIS UNIVARIADO'),
+    'outlier_detection_boxplots': ('outlier_detection_boxplots.png', plot_outlier_detection_boxplots,
+                                   '🔍 FASE 3: DETECCIÓN DE OUTLIERS'),
+    'bivariate_scatter_plots': ('bivariate_scatter_plots.png', plot_bivariate_scatter_plots,
+                                '🔗 FASE 4: ANÁLISIS BIVARIADO'),
+    'correlation_heatmap': ('correlation_heatmap.png', plot_correlation_heatmap,
+                            '🔗 FASE 4: ANÁLISIS BIVARIADO'),
+    'temporal_evolution': ('temporal_evolution.png', plot_temporal_evolution,
+                           '📈 FASE 5: ANÁLISIS TEMPORAL'),
+    'fatality_rate_evolution': ('fatality_rate_evolution.png', plot_fatality_rate_evolution,
+                                '📈 FASE 5: ANÁLISIS TEMPORAL'),
+    'states_rankings': ('states_rankings.png', plot_states_rankings,
+                        '🏆 FASE 6: RANKINGS DE ESTADOS'),
+    'interactive_dashboard': ('interactive_dashboard.html', plot_interactive_dashboard,
+                              '📱 FASE 7: DASHBOARD INTERACTIVO'),
+}
+
+
+# nombre -> columnas que lee la figura de cada DataFrame (clave de la caché de figuras)
+FIGURE_INPUTS = {
+    'univariate_distributions': {
+        'states': ['cases_per_100k', 'deaths_per_100k', 'fatality_rate'],
+        'us': ['new_cases'],
+    },
+    'outlier_detection_boxplots': {
+        'states': ['cases_per_100k', 'deaths_per_100k', 'fatality_rate', 'cases'],
+    },
+    'bivariate_scatter_plots': {
+        'states': ['population', 'cases', 'fatality_rate', 'cases_per_100k', 'deaths_per_100k'],
+    },
+    'correlation_heatmap': {
+        'states': ['cases', 'deaths', 'population', 'cases_per_100k', 'deaths_per_100k', 'fatality_rate'],
+    },
+    'temporal_evolution': {
+        'us': ['date', 'cases', 'deaths', 'new_cases', 'new_deaths', 'cases_7day_avg', 'deaths_7day_avg'],
+    },
+    'fatality_rate_evolution': {
+        'us': ['date', 'cases', 'fatality_rate'],
+    },
+    'states_rankings': {
+        'states': ['state', 'cases', 'cases_per_100k', 'deaths', 'fatality_rate'],
+    },
+    'interactive_dashboard': {
+        'us': ['date', 'new_cases', 'new_deaths', 'cases', 'fatality_rate'],
+    },
+}
+
+
+# Código que usan las figuras además de su función: helpers de este módulo y
+# módulos importados al dibujar (su fuente forma parte de la clave de la caché)
+FIGURE_HELPERS = (_pyplot, set_style, _stars, _plot_line, _plot_bars, _mark_anomalies, _save,
+                  'covid_eda.anomalies', 'covid_eda.correlation', 'covid_eda.dashboard',
+                  'covid_eda.decimate', 'covid_eda.outliers', 'covid_eda.ranking', 'covid_eda.summary')
+
+# Ajustes de config.py que cambian el resultado de alguna figura
+FIGURE_SETTINGS = {'dashboard_max_points': DASHBOARD_MAX_POINTS}
+
+
+def _dashboard_assets(path):
+    from covid_eda.dashboard import dashboard_assets
+    return dashboard_assets(path, [panel[0] for panel in DASHBOARD_PANELS])
+
+
+# nombre -> archivos que escribe la figura además del principal (ruta -> lista)
+FIGURE_ASSETS = {
+    'interactive_dashboard': _dashboard_assets,
+}
+
+
+# ==============================================================================
+# PLANIFICADOR DE RENDER
+# ==============================================================================
+
+# DataFrames de entrada del proceso actual (ver _init_worker)
+_FRAMES = {}
+
+
+def _init_worker(frames):
+    """Inicializar un proceso del pool: backend Agg, estilo y DataFrames compartidos"""
+    from covid_eda.profiling import worker_init
+
+    worker_init()
+    if frames is not None:
+        _FRAMES.update(frames)
+    set_style()
+
+
+def _render_one(name, path, dpi):
+    """Generar una figura con los DataFrames del proceso; devuelve (nombre, ok, métricas)"""
+    from covid_eda.instrument import counters, elapsed
+    from covid_eda.profiling import profile
+
+    _, plot, _ = FIGURES[name]
+    start = counters()
+    with profile(f"render.{name}"):
+        ok = plot(_FRAMES['df_us'], _FRAMES['df_states'], path, dpi=dpi)
+    return name, ok, elapsed(start)
+
+
+def _render_parallel(names, paths, dpi, workers):
+    """Repartir las figuras en un pool de procesos; devuelve {nombre: (ok, métricas)}"""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Los hijos heredan _FRAMES del padre: nada que serializar
+        context, frames = multiprocessing.get_context('fork'), None
+    else:
+        context, frames = multiprocessing.get_context(), dict(_FRAMES)
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(frames,)) as pool:
+        futures = [pool.submit(_render_one, name, paths[name], dpi) for name in names]
+        for future in as_completed(futures):
+            name, ok, metrics = future.result()
+            results[name] = (ok, metrics)
+    return results
+
+
+def _helpers():
+    """FIGURE_HELPERS con los módulos importados (sólo para calcular su hash)"""
+    import importlib
+    return tuple(importlib.import_module(helper) if isinstance(helper, str) else helper
+                 for helper in FIGURE_HELPERS)
+
+
+def figure_key(name, df_us, df_states, dpi=FIGURE_DPI):
+    """(hash de datos, hash de spec) de una figura para la caché de figuras"""
+    from covid_eda.figcache import hash_inputs, hash_spec
+
+    filename, plot, _ = FIGURES[name]
+    inputs = FIGURE_INPUTS[name]
+    data_hash = hash_inputs({'us': df_us, 'states': df_states}, inputs)
+    spec_hash = hash_spec(name, filename, plot, inputs, dpi, {**RENDER_STYLE, **FIGURE_SETTINGS},
+                          helpers=_helpers())
+    return data_hash, spec_hash
+
+
+def render_figures(df_us, df_states, names=None, output_dir=IMAGES_DIR, dpi=FIGURE_DPI,
+                   workers=RENDER_WORKERS, force=False):
+    """
+    Generar las figuras indicadas (todas por defecto)
+
+    Las figuras cuyas entradas y spec coinciden con las del último render se
+    reutilizan; el motivo de cada regeneración queda en el manifiesto.
+
+    Args:
+        df_us (pd.DataFrame): Serie histórica nacional
+        df_states (pd.DataFrame): Datos actuales por estado
+        names (list): Nombres de FIGURES a generar; None = todas
+        output_dir (str): Directorio de salida
+        dpi (int): Resolución de las figuras estáticas
+        workers (int): Procesos en paralelo (1 = secuencial en este proceso)
+        force (bool): Regenerar aunque la figura esté al día
+
+    Returns:
+        list: Rutas de los archivos generados o reutilizados
+    """
+    from covid_eda.figcache import RenderManifest
+    from covid_eda.instrument import emit
+
+    names = list(FIGURES) if names is None else names
+    unknown = [name for name in names if name not in FIGURES]
+    if unknown:
+        raise ValueError(f"Figuras desconocidas: {', '.join(unknown)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, FIGURES[name][0]) for name in names}
+
+    manifest = RenderManifest(output_dir)
+    keys = {name: figure_key(name, df_us, df_states, dpi) for name in names}
+    reasons = {name: manifest.check(name, paths[name], *keys[name], force=force,
+                                    assets=FIGURE_ASSETS[name](paths[name]) if name in FIGURE_ASSETS else ())
+               for name in names}
+    pending = [name for name in names if reasons[name] is not None]
+    for name in names:
+        if reasons[name] is None:
+            manifest.record(name, paths[name], *keys[name], status='reused')
+
+    workers = max(1, min(workers, len(pending)))
+    _FRAMES.update(df_us=df_us, df_states=df_states)
+    start = time.perf_counter()
+    try:
+        if not pending:
+            results = {}
+        elif workers > 1:
+            print(f"\n🎨 Generando {len(pending)} figuras en {workers} procesos...")
+            results = _render_parallel(pending, paths, dpi, workers)
+        else:
+            set_style()
+            results = {}
+            current_phase = None
+            for name in pending:
+                phase = FIGURES[name][2]
+                if phase != current_phase:
+                    print(f"\n{phase}")
+                    current_phase = phase
+                results[name] = _render_one(name, paths[name], dpi)[1:]
+    finally:
+        _FRAMES.clear()
+    total = time.perf_counter() - start
+
+    for name in names:
+        phase = FIGURES[name][2]
+        if name in results:
+            ok, metrics = results[name]
+            status = 'rebuilt' if ok else 'skipped'
+            manifest.record(name, paths[name], *keys[name], status=status,
+                            reason=reasons[name], seconds=metrics['wall_s'])
+            emit('figure', name, metrics, status=status, reason=reasons[name], phase=phase)
+        else:
+            emit('figure', name, status='reused', phase=phase)
+    manifest.save()
+
+    print("\n⏱️ Tiempos de render:")
+    for name in names:
+        if name in results:
+            ok, metrics = results[name]
+            print(f"   {'✅' if ok else '⏭️'} {name:30s} {metrics['wall_s']:6.2f} s  ({reasons[name]})")
+        else:
+            print(f"   ♻️ {name:30s}   0.00 s  (sin cambios)")
+    print(f"   Total: {total:.2f} s ({len(pending)} regeneradas, {len(names) - len(pending)} reutilizadas, "
+          f"{workers} proceso{'s' if workers > 1 else ''})")
+
+    return [paths[name] for name in names if name not in results or results[name][0]]
@@ -0,0 +1,436 @@
+# ==============================================================================
+# ETAPA REPORT - INFORME PDF EJECUTIVO
+# Genera un informe ejecutivo profesional en PDF con todas las visualizaciones
+# ==============================================================================
+#
+# reportlab se importa dentro de las funciones para que el resto del
+# pipeline no dependa de él. Las cifras vienen del resumen estadístico
+# (covid_eda/summary.py); el informe no vuelve a leer los datasets.
+
+import functools
+import os
+from datetime import datetime
+
+from covid_eda.config import IMAGES_DIR, REPORT_PDF, SUMMARY_JSON
+from covid_eda.report_images import prepare_images
+from covid_eda.summary import load_summary
+
+# Espacio máximo de cada figura en la página, en pulgadas (ancho, alto)
+REPORT_IMAGE_BOX = (6, 4.5)
+
+# Figuras del análisis visual: (archivo en images/, título, descripción)
+REPORT_FIGURES = [
+    ('temporal_evolution.png',
+     '4.1 Evolución Temporal de la Pandemia',
+     """Esta visualización muestra la evolución de casos acumulados, muertes, casos diarios
+        y tasa de letalidad a lo largo del tiempo. Se pueden identificar claramente las diferentes
+        olas de la pandemia y cómo la tasa de letalidad ha evolucionado. Las cruces marcan los días
+        anómalos de las series diarias y las líneas punteadas, los cambios de nivel."""),
+    ('correlation_heatmap.png',
+     '4.2 Matriz de Correlaciones',
+     """El mapa de calor muestra las correlaciones entre diferentes variables del dataset.
+        Las correlaciones fuertes (cercanas a 1 o -1) indican relaciones lineales significativas
+        entre variables, mientras que valores cercanos a 0 indican poca relación lineal."""),
+    ('states_rankings.png',
+     '4.3 Rankings Comparativos por Estado',
+     """Esta visualización presenta los top 10 estados en diferentes métricas: casos totales,
+        muertes totales, casos por millón de habitantes y tasa de letalidad. Permite identificar
+        los estados más afectados desde diferentes perspectivas analíticas."""),
+]
+
+
+def _format_date(iso_date):
+    """'2020-01-22' -> '22/01/2020'"""
+    return datetime.fromisoformat(iso_date).strftime('%d/%m/%Y')
+
+
+def _correlation_line(x, y, pearson, spearman):
+    """Línea de una pareja; p, el intervalo o ρ pueden ser None en el JSON (n/d)"""
+    p = pearson.get('p')
+    p_value = 'p = n/d' if p is None else 'p < 0.001' if p < 0.001 else f"p = {p:.3f}"
+    interval = ''
+    if pearson.get('ci_low') is not None and pearson.get('ci_high') is not None:
+        interval = f" [{pearson['ci_low']:.3f}, {pearson['ci_high']:.3f}]"
+    rho = 'n/d' if spearman.get('r') is None else f"{spearman['r']:.3f}"
+    return f"• <b>{x} / {y}:</b> r = {pearson['r']:.3f}{interval}, {p_value}; ρ = {rho}<br/>"
+
+
+@functools.lru_cache(maxsize=None)
+def report_styles():
+    """Estilos de párrafo de los informes (se construyen una vez por proceso)"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
+
+    base = getSampleStyleSheet()
+
+    # Crear estilos personalizados
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=base['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        textColor=colors.darkblue,
+        fontName='Helvetica-Bold'
+    )
+
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=base['Heading2'],
+        fontSize=16,
+        spaceBefore=20,
+        spaceAfter=12,
+        textColor=colors.darkblue,
+        fontName='Helvetica-Bold'
+    )
+
+    subheading_style = ParagraphStyle(
+        'CustomSubHeading',
+        parent=base['Heading3'],
+        fontSize=14,
+        spaceBefore=15,
+        spaceAfter=10,
+        textColor=colors.darkred,
+        fontName='Helvetica-Bold'
+    )
+
+    body_style = ParagraphStyle(
+        'CustomBody',
+        parent=base['Normal'],
+        fontSize=11,
+        spaceAfter=12,
+        alignment=TA_JUSTIFY,
+        fontName='Helvetica'
+    )
+
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=base['Normal'],
+        fontSize=9,
+        alignment=TA_CENTER,
+        textColor=colors.grey
+    )
+
+    return {'title': title_style, 'heading': heading_style, 'subheading': subheading_style,
+            'body': body_style, 'footer': footer_style}
+
+
+def create_covid_report(output_path=REPORT_PDF, images_dir=IMAGES_DIR, summary_path=SUMMARY_JSON):
+    """
+    Generar informe PDF completo del análisis COVID-19
+
+    Args:
+        output_path (str): Ruta del PDF a generar
+        images_dir (str): Directorio con las visualizaciones a incluir
+        summary_path (str): Resumen estadístico generado por la etapa analyze
+
+    Returns:
+        bool: True si el PDF se generó correctamente
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
+    from reportlab.lib.units import inch
+
+    print("📄 GENERANDO INFORME PDF EJECUTIVO...")
+
+    summary = load_summary(summary_path)
+
+    # Crear directorio de reportes si no existe
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    # Configurar el documento PDF
+    doc = SimpleDocTemplate(
+        output_path,
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=18
+    )
+
+    # Estilos compartidos con los informes por región (covid_eda/batch_report.py)
+    styles = report_styles()
+    title_style, heading_style = styles['title'], styles['heading']
+    subheading_style, body_style = styles['subheading'], styles['body']
+
+    # Lista de elementos del documento
+    story = []
+
+    # ==============================================================================
+    # PORTADA
+    # ==============================================================================
+
+    # Título principal
+    story.append(Spacer(1, 50))
+    story.append(Paragraph("📊 ANÁLISIS EXPLORATORIO DE DATOS", title_style))
+    story.append(Paragraph("COVID-19 ESTADOS UNIDOS", title_style))
+    story.append(Spacer(1, 30))
+
+    # Subtítulo
+    story.append(Paragraph("Informe Ejecutivo Completo", heading_style))
+    story.append(Spacer(1, 20))
+
+    # Información del proyecto
+    period = "Enero 2020 - Marzo 2023"
+    if summary and summary.get('national'):
+        national = summary['national']
+        period = f"{_format_date(national['start_date'])} - {_format_date(national['end_date'])}"
+    project_info = f"""
+    <b>Fecha del Análisis:</b> {datetime.now().strftime('%d de %B, %Y')}<br/>
+    <b>Período de Datos:</b> {period}<br/>
+    <b>Fuente de Datos:</b> Disease.sh API (Johns Hopkins University)<br/>
+    <b>Metodología:</b> Análisis Exploratorio de Datos (EDA)<br/>
+    <b>Herramientas:</b> Python, Pandas, Matplotlib, Seaborn, Plotly
+    """
+    story.append(Paragraph(project_info, body_style))
+    story.append(Spacer(1, 40))
+
+    # Resumen ejecutivo
+    story.append(Paragraph("RESUMEN EJECUTIVO", heading_style))
+
+    executive_summary = """
+    Este informe presenta un análisis exhaustivo de los datos de COVID-19 en Estados Unidos,
+    basado en información oficial de la Universidad Johns Hopkins. El análisis abarca desde
+    los primeros casos reportados en enero de 2020 hasta marzo de 2023, proporcionando
+    insights valiosos sobre la evolución de la pandemia, patrones geográficos y tendencias
+    estadísticas clave que pueden informar la toma de decisiones estratégicas.
+    """
+    story.append(Paragraph(executive_summary, body_style))
+
+    story.append(PageBreak())
+
+    # ==============================================================================
+    # METODOLOGÍA Y OBJETIVOS
+    # ==============================================================================
+
+    story.append(Paragraph("1. OBJETIVOS DEL ANÁLISIS", heading_style))
+
+    objectives = """
+    <b>Objetivo Principal:</b> Extraer insights valiosos de los datos de COVID-19 en Estados Unidos
+    mediante técnicas de análisis exploratorio de datos.<br/><br/>
+
+    <b>Objetivos Específicos:</b><br/>
+    • Analizar la evolución temporal de casos, muertes y recuperaciones<br/>
+    • Identificar patrones geográficos y diferencias entre estados<br/>
+    • Calcular métricas clave como tasas de letalidad y casos per cápita<br/>
+    • Generar visualizaciones impactantes para comunicar hallazgos<br/>
+    • Proporcionar conclusiones basadas en evidencia para la toma de decisiones
+    """
+    story.append(Paragraph(objectives, body_style))
+
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("2. METODOLOGÍA", heading_style))
+
+    methodology = """
+    <b>Fase 1: Extracción de Datos</b><br/>
+    • Consumo de API pública Disease.sh (datos de Johns Hopkins)<br/>
+    • Obtención de series temporales nacionales y datos por estados<br/><br/>
+
+    <b>Fase 2: Limpieza y Preprocesamiento</b><br/>
+    • Validación de integridad de datos<br/>
+    • Cálculo de métricas derivadas (casos diarios, tasas de letalidad)<br/>
+    • Tratamiento de valores faltantes y outliers<br/><br/>
+
+    <b>Fase 3: Análisis Exploratorio</b><br/>
+    • Análisis univariado: estadísticas descriptivas<br/>
+    • Análisis bivariado: correlaciones entre variables<br/>
+    • Análisis temporal: tendencias y estacionalidad<br/>
+    • Análisis geográfico: comparaciones entre estados<br/><br/>
+
+    <b>Fase 4: Visualización y Reporting</b><br/>
+    • Generación de gráficos estáticos e interactivos<br/>
+    • Creación de dashboard ejecutivo<br/>
+    • Documentación de hallazgos y conclusiones
+    """
+    story.append(Paragraph(methodology, body_style))
+
+    story.append(PageBreak())
+
+    # ==============================================================================
+    # CARGAR Y MOSTRAR ESTADÍSTICAS
+    # ==============================================================================
+
+    story.append(Paragraph("3. ESTADÍSTICAS CLAVE", heading_style))
+
+    # Las cifras salen del resumen de la etapa analyze: el informe no lee los datasets
+    national = summary.get('national') if summary else None
+    states = summary.get('states') if summary else None
+    if national and states:
+        most_affected = states['most_affected']
+        start_date, end_date = _format_date(national['start_date']), _format_date(national['end_date'])
+
+        stats_text = f"""
+        <b>RESUMEN ESTADÍSTICO NACIONAL</b><br/><br/>
+
+        • <b>Casos Totales:</b> {national['total_cases']:,} casos confirmados<br/>
+        • <b>Muertes Totales:</b> {national['total_deaths']:,} fallecimientos<br/>
+        • <b>Casos Recuperados:</b> {national['total_recovered']:,} recuperaciones<br/>
+        • <b>Tasa de Letalidad:</b> {national['fatality_rate']:.2f}%<br/>
+        • <b>Estados Analizados:</b> {states['count']} estados y territorios<br/>
+        • <b>Período de Análisis:</b> {start_date} al {end_date}<br/><br/>
+
+        <b>ESTADO MÁS AFECTADO</b><br/>
+        • <b>Estado:</b> {most_affected['state']}<br/>
+        • <b>Casos Totales:</b> {most_affected['cases']:,}<br/>
+        """
+
+        story.append(Paragraph(stats_text, body_style))
+
+        correlations = states.get('correlations')
+        if correlations:
+            from covid_eda.correlation import pair, strongest_pairs
+
+            confidence = round(correlations['confidence'] * 100)
+            lines = [f"<b>CORRELACIONES MÁS FUERTES ENTRE ESTADOS</b> (Pearson r con IC {confidence}% "
+                     f"bootstrap; Spearman ρ)<br/>"]
+            for x, y, pearson in strongest_pairs(correlations):
+                lines.append(_correlation_line(x, y, pearson, pair(correlations, x, y, 'spearman')))
+            story.append(Spacer(1, 10))
+            story.append(Paragraph(''.join(lines), body_style))
+
+        anomalies = national.get('anomalies')
+        if anomalies:
+            lines = ["<b>ANOMALÍAS EN LAS SERIES DIARIAS</b> (picos y caídas frente a la mediana móvil "
+                     "o al patrón semanal, correcciones negativas y cambios de nivel)<br/>"]
+            for column, counts in anomalies['counts'].items():
+                lines.append(f"• <b>{column}:</b> " + ', '.join(f"{method} {n}" for method, n in counts.items())
+                             + "<br/>")
+            for row in anomalies['top'][:5]:
+                lines.append(f"• <b>{_format_date(row['date'])}</b> {row['column']}: {row['value']:,.0f} "
+                             f"(esperado {row['expected'] or 0:,.0f}; z = {row['score']:+.1f}, "
+                             f"{row['method']})<br/>")
+            shifts = [row for row in anomalies['change_points'] if row['column'] == 'new_cases']
+            if shifts:
+                lines.append("• <b>Cambios de nivel en casos diarios:</b> " + '; '.join(
+                    f"{_format_date(row['date'])} ({row['expected']:,.0f} → {row['value']:,.0f})"
+                    for row in shifts) + "<br/>")
+            story.append(Spacer(1, 10))
+            story.append(Paragraph(''.join(lines), body_style))
+    else:
+        story.append(Paragraph("⚠️ Resumen estadístico no disponible: ejecuta primero la etapa "
+                               "analyze (data/summary_stats.json)", body_style))
+
+    story.append(PageBreak())
+
+    # ==============================================================================
+    # VISUALIZACIONES
+    # ==============================================================================
+
+    story.append(Paragraph("4. ANÁLISIS VISUAL", heading_style))
+
+    # Las figuras se escalan a su tamaño en la página (en paralelo y con caché)
+    image_paths = [os.path.join(images_dir, filename) for filename, _, _ in REPORT_FIGURES]
+    prepared = prepare_images(image_paths, REPORT_IMAGE_BOX)
+
+    for image_path, (_, title, description) in zip(image_paths, REPORT_FIGURES):
+        if image_path in prepared:
+            scaled_path, (width, height) = prepared[image_path]
+            story.append(Paragraph(title, subheading_style))
+            story.append(Paragraph(description, body_style))
+            story.append(Spacer(1, 10))
+
+            # Agregar imagen (ajustada al ancho de página, sin deformarla)
+            img = Image(scaled_path, width=width*inch, height=height*inch)
+            story.append(img)
+            story.append(Spacer(1, 20))
+            story.append(PageBreak())
+        else:
+            story.append(Paragraph(f"⚠️ Imagen no encontrada: {image_path}", body_style))
+
+    # ==============================================================================
+    # CONCLUSIONES Y RECOMENDACIONES
+    # ==============================================================================
+
+    story.append(Paragraph("5. CONCLUSIONES Y HALLAZGOS CLAVE", heading_style))
+
+    conclusions = """
+    <b>HALLAZGOS PRINCIPALES:</b><br/><br/>
+
+    <b>1. Evolución Temporal:</b><br/>
+    • La pandemia mostró múltiples olas con picos diferenciados<br/>
+    • La tasa de letalidad ha disminuido progresivamente desde los primeros meses<br/>
+    • Los casos diarios mostraron alta variabilidad estacional<br/><br/>
+
+    <b>2. Distribución Geográfica:</b><br/>
+    • Existe una gran heterogeneidad en el impacto entre estados<br/>
+    • Los estados más poblados tienden a tener más casos absolutos<br/>
+    • Sin embargo, los casos per cápita muestran patrones diferentes<br/><br/>
+
+    <b>3. Correlaciones Identificadas:</b><br/>
+    • Fuerte correlación positiva entre casos y muertes (esperado)<br/>
+    • Correlaciones significativas entre población y casos totales<br/>
+    • Las métricas per cápita proporcionan mejor comparabilidad<br/><br/>
+
+    <b>IMPLICACIONES ESTRATÉGICAS:</b><br/><br/>
+
+    • Los datos sugieren la necesidad de enfoques diferenciados por región<br/>
+    • La mejora en la tasa de letalidad indica progreso en el tratamiento<br/>
+    • La alta variabilidad requiere monitoreo continuo y capacidad de respuesta adaptativa<br/>
+    • Las correlaciones identificadas pueden informar modelos predictivos futuros
+    """
+    story.append(Paragraph(conclusions, body_style))
+
+    story.append(PageBreak())
+
+    # ==============================================================================
+    # INFORMACIÓN TÉCNICA
+    # ==============================================================================
+
+    story.append(Paragraph("6. INFORMACIÓN TÉCNICA", heading_style))
+
+    technical_info = """
+    <b>FUENTES DE DATOS:</b><br/>
+    • Disease.sh API (https://disease.sh/)<br/>
+    • Datos originales: Johns Hopkins University CSSE<br/>
+    • Actualización: Datos históricos desde enero 2020<br/><br/>
+
+    <b>HERRAMIENTAS Y TECNOLOGÍAS:</b><br/>
+    • Python 3.8+ como lenguaje principal<br/>
+    • Pandas y NumPy para manipulación de datos<br/>
+    • Matplotlib y Seaborn para visualización estática<br/>
+    • Plotly para visualizaciones interactivas<br/>
+    • ReportLab para generación de este informe PDF<br/><br/>
+
+    <b>LIMITACIONES DEL ANÁLISIS:</b><br/>
+    • Los datos dependen de la precisión del reporte por jurisdicción<br/>
+    • Posibles subregistros en períodos de alta demanda del sistema sanitario<br/>
+    • Criterios de reporte pueden haber variado entre estados y períodos<br/>
+    • El análisis es descriptivo, no incluye modelado predictivo<br/><br/>
+
+    <b>REPRODUCIBILIDAD:</b><br/>
+    • Todo el código está disponible en el repositorio del proyecto<br/>
+    • Los datos se obtienen mediante API pública y se archivan localmente<br/>
+    • La metodología está completamente documentada<br/>
+    • El entorno de desarrollo está especificado en requirements.txt
+    """
+    story.append(Paragraph(technical_info, body_style))
+
+    # ==============================================================================
+    # PIE DE PÁGINA
+    # ==============================================================================
+
+    story.append(Spacer(1, 40))
+
+    footer_text = f"""
+    <b>Informe generado automáticamente el {datetime.now().strftime('%d de %B de %Y a las %H:%M')}</b><br/>
+    Proyecto: COVID-19 Exploratory Data Analysis<br/>
+    Repositorio: https://github.com/Pal-cloud/proyecto4_EDA_Pal<br/>
+    Metodología EDA siguiendo mejores prácticas de ciencia de datos
+    """
+
+    footer_style = styles['footer']
+
+    story.append(Paragraph(footer_text, footer_style))
+
+    # ==============================================================================
+    # GENERAR PDF
+    # ==============================================================================
+
+    try:
+        doc.build(story)
+        print(f"✅ Informe PDF generado exitosamente: {output_path}")
+        return True
+    except Exception as e:
+        print(f"❌ Error al generar PDF: {str(e)}")
+        return False
@@ -0,0 +1,98 @@
+# ==============================================================================
+# IMÁGENES DEL INFORME - PREESCALADO, CACHÉ Y PREPARACIÓN EN PARALELO
+# ==============================================================================
+#
+# Las figuras de images/ se guardan a 300 dpi (~6000 x 4700 px). Incrustarlas
+# tal cual obliga a ReportLab a decodificar y recomprimir cada bitmap completo
+# en cada doc.build() y el PDF acaba pesando varios MB. Antes de construir el
+# informe cada figura se reduce al tamaño que ocupa en la página a
+# REPORT_IMAGE_DPI, se aplana sobre fondo blanco (sin canal alfa, que ReportLab
+# incrustaría como una segunda imagen) y se guarda en data/cache/report/ con el
+# hash de su contenido y de los parámetros de escalado en el nombre. Si la
+# figura no cambia, la siguiente ejecución reutiliza la versión escalada.
+#
+# Las imágenes son independientes entre sí y Pillow libera el GIL al escalar y
+# comprimir, así que se preparan en un pool de hilos.
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from covid_eda.config import REPORT_IMAGE_CACHE_DIR, REPORT_IMAGE_DPI
+
+# Cambiar si cambia la forma de escalar: invalida las imágenes cacheadas
+_SCALING_VERSION = 1
+
+
+def fit_size(size, box):
+    """Tamaño (ancho, alto) que cabe en `box` conservando la proporción de `size`"""
+    width, height = size
+    scale = min(box[0] / width, box[1] / height)
+    return width * scale, height * scale
+
+
+def _digest(path, box_inches, dpi):
+    digest = hashlib.sha256(f"{_SCALING_VERSION}:{box_inches}:{dpi}".encode('utf-8'))
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def prepare_image(path, box_inches, dpi=REPORT_IMAGE_DPI, cache_dir=REPORT_IMAGE_CACHE_DIR):
+    """
+    Versión de una figura escalada a su tamaño de impresión
+
+    Args:
+        path (str): PNG original
+        box_inches (tuple): (ancho, alto) máximos en la página, en pulgadas
+        dpi (int): Resolución de impresión
+        cache_dir (str): Directorio de las imágenes escaladas
+
+    Returns:
+        tuple: (ruta escalada, (ancho, alto) en pulgadas, reutilizada)
+    """
+    from PIL import Image
+
+    cached = os.path.join(cache_dir, f"{_digest(path, box_inches, dpi)}.png")
+    with Image.open(path) as image:
+        width, height = fit_size(image.size, box_inches)
+        if os.path.exists(cached):
+            return cached, (width, height), True
+
+        pixels = (max(round(width * dpi), 1), max(round(height * dpi), 1))
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        if pixels[0] < image.width:
+            # reducing_gap: reducción entera rápida antes del filtro Lanczos
+            image = image.resize(pixels, Image.LANCZOS, reducing_gap=2.0)
+        flat = Image.new('RGB', image.size, 'white')
+        flat.paste(image, mask=image.getchannel('A'))
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cached}.{os.getpid()}.tmp"
+    flat.save(tmp_path, format='PNG')
+    os.replace(tmp_path, cached)
+    return cached, (width, height), False
+
+
+def prepare_images(paths, box_inches, dpi=REPORT_IMAGE_DPI, cache_dir=REPORT_IMAGE_CACHE_DIR,
+                   workers=None):
+    """
+    Preparar varias figuras en paralelo (las que no existen se omiten)
+
+    Returns:
+        dict: ruta original -> (ruta escalada, (ancho, alto) en pulgadas)
+    """
+    existing = [path for path in dict.fromkeys(paths) if os.path.exists(path)]
+    if not existing:
+        return {}
+    workers = max(1, min(workers or os.cpu_count() or 1, len(existing)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda path: prepare_image(path, box_inches, dpi, cache_dir),
+                                existing))
+
+    reused = sum(result[2] for result in results)
+    print(f"🖼️ Imágenes del informe: {len(results) - reused} escaladas a {dpi} dpi, "
+          f"{reused} reutilizadas")
+    return {path: result[:2] for path, result in zip(existing, results)}
@@ -0,0 +1,224 @@
+# ==============================================================================
+# ESQUEMA CANÓNICO - COLUMNAS, TIPOS Y MAPEO DESDE LA API
+# ==============================================================================
+#
+# Única definición de las columnas de cada dataset limpio. De aquí salen los
+# tipos de Parquet (covid_eda.storage), los de memoria (covid_eda.compact) y
+# el mapeo de los campos de la API a nombres canónicos (API_FIELDS).
+#
+# Cada columna declara:
+#   tipo     'datetime', 'category', 'count' (entero sin nulos) o 'rate'
+#            (float32, admite NaN pero no infinitos)
+#   origen   'api' (sale del payload) o 'derived' (la calcula la etapa
+#            transform una sola vez y se guarda con el dataset)
+#   required si el dataset no es válido sin ella. Las columnas 'api'
+#            opcionales (recovered, active, tests...) dependen de lo que
+#            devuelva la API; las derivadas siempre son obligatorias
+#
+# read_dataset valida cada dataset al cargarlo (validate): si falta una
+# columna obligatoria o tiene otro tipo se lanza SchemaError en vez de dejar
+# que cada consumidor la recalcule por su cuenta.
+
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------------------------
+# Columnas por dataset: nombre -> (tipo, origen, obligatoria)
+# ------------------------------------------------------------------------------
+
+_HISTORY = {
+    'date': ('datetime', 'api', True),
+    'cases': ('count', 'api', True),
+    'deaths': ('count', 'api', True),
+    'new_cases': ('count', 'derived', True),
+    'new_deaths': ('count', 'derived', True),
+    'cases_7day_avg': ('rate', 'derived', True),
+    'deaths_7day_avg': ('rate', 'derived', True),
+    'cases_7day_trailing_avg': ('rate', 'derived', True),
+    'deaths_7day_trailing_avg': ('rate', 'derived', True),
+    'cases_growth_rate': ('rate', 'derived', True),
+    'deaths_growth_rate': ('rate', 'derived', True),
+    'cases_doubling_time': ('rate', 'derived', True),
+    'deaths_doubling_time': ('rate', 'derived', True),
+    'fatality_rate': ('rate', 'derived', True),
+}
+
+_STATES = {
+    'state': ('category', 'api', True),
+    'updated': ('count', 'api', False),       # ms desde epoch en que la API publicó la fila
+    'cases': ('count', 'api', True),
+    'deaths': ('count', 'api', True),
+    'recovered': ('count', 'api', False),
+    'active': ('count', 'api', False),
+    'tests': ('count', 'api', False),
+    'population': ('count', 'api', True),
+    'cases_per_million': ('rate', 'api', False),
+    'deaths_per_million': ('rate', 'api', False),
+    'tests_per_million': ('rate', 'api', False),
+    'cases_per_100k': ('rate', 'derived', True),
+    'deaths_per_100k': ('rate', 'derived', True),
+    'fatality_rate': ('rate', 'derived', True),
+}
+
+COLUMNS = {
+    'us_historical': _HISTORY,
+    'countries_historical': {'region': ('category', 'api', True), **_HISTORY},
+    'us_states_historical': {'region': ('category', 'api', True), **_HISTORY},
+    'states': _STATES,
+    # Histórico de fotos del endpoint states (covid_eda.snapshots): la clave es (state, updated)
+    'states_snapshots': {column: (kind, origin, required or column == 'updated')
+                         for column, (kind, origin, required) in _STATES.items()},
+}
+
+# Campo de la API -> columna canónica. Los campos que no aparecen (todayCases,
+# critical, ...) no entran en los datasets.
+API_FIELDS = {
+    'states': {
+        'state': 'state',
+        'updated': 'updated',
+        'cases': 'cases',
+        'deaths': 'deaths',
+        'recovered': 'recovered',
+        'active': 'active',
+        'tests': 'tests',
+        'population': 'population',
+        'casesPerOneMillion': 'cases_per_million',
+        'deathsPerOneMillion': 'deaths_per_million',
+        'testsPerOneMillion': 'tests_per_million',
+    },
+    # timeline de historical/...: {'cases': {fecha: n}, 'deaths': {...}}
+    'timeline': {'cases': 'cases', 'deaths': 'deaths'},
+}
+
+# Nombres antiguos que aún pueden aparecer en datasets guardados
+ALIASES = {
+    **{field: column for field, column in API_FIELDS['states'].items() if field != column},
+    'daily_cases': 'new_cases',
+    'daily_deaths': 'new_deaths',
+}
+
+
+class SchemaError(ValueError):
+    """Un dataset no cumple su esquema canónico"""
+
+
+def kinds(name):
+    """columna -> tipo lógico de un dataset"""
+    return {column: spec[0] for column, spec in COLUMNS[name].items()}
+
+
+def required_columns(name, origin=None):
+    """Columnas obligatorias de un dataset (opcionalmente sólo las de un origen)"""
+    return [column for column, (_, column_origin, required) in COLUMNS[name].items()
+            if required and origin in (None, column_origin)]
+
+
+def derived_columns(name):
+    """Columnas que calcula la etapa transform"""
+    return [column for column, (_, origin, _) in COLUMNS[name].items() if origin == 'derived']
+
+
+# ==============================================================================
+# MAPEO DESDE LA API
+# ==============================================================================
+
+def from_api(records, name='states'):
+    """
+    DataFrame con nombres canónicos a partir de los registros de la API
+
+    Args:
+        records (list): Registros del endpoint (una fila por estado)
+        name (str): Clave de API_FIELDS
+
+    Returns:
+        pd.DataFrame: Sólo los campos mapeados, en el orden del esquema
+    """
+    df = pd.DataFrame(records)
+    fields = {field: column for field, column in API_FIELDS[name].items() if field in df.columns}
+    df = df[list(fields)].rename(columns=fields)
+    missing = [column for column in required_columns(name, 'api') if column not in df.columns]
+    if missing:
+        raise SchemaError(f"{name}: la API no devolvió {', '.join(missing)}")
+    return df
+
+
+# ==============================================================================
+# CONFORMAR Y VALIDAR
+# ==============================================================================
+
+def conform(df, name):
+    """
+    Renombrar alias, convertir cada columna a su tipo y ordenar según el esquema
+
+    Las columnas que no pertenecen al esquema se descartan (salvo 'year', la
+    partición de los históricos).
+    """
+    df = df.rename(columns={old: new for old, new in ALIASES.items()
+                            if old in df.columns and new not in df.columns})
+    columns = {}
+    for column, (kind, _, _) in COLUMNS[name].items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if kind == 'datetime':
+            columns[column] = series if series.dtype.kind == 'M' else pd.to_datetime(series)
+        elif kind == 'count':
+            columns[column] = series if series.dtype == np.int64 else series.fillna(0).astype('int64')
+        elif kind == 'rate':
+            columns[column] = series if series.dtype == np.float32 else series.astype('float32')
+        else:
+            columns[column] = series if isinstance(series.dtype, pd.CategoricalDtype) \
+                else series.astype('category')
+    if 'year' in df.columns:
+        columns['year'] = df['year']
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _kind_matches(series, kind):
+    dtype = series.dtype
+    if kind == 'datetime':
+        return dtype.kind == 'M'
+    if kind == 'category':
+        return isinstance(dtype, pd.CategoricalDtype) or dtype == object
+    if kind == 'count':
+        return dtype.kind in 'iu'
+    return dtype.kind == 'f'
+
+
+def validate(df, name, columns=None):
+    """
+    Comprobar que un dataset cumple su esquema
+
+    Args:
+        df (pd.DataFrame): Dataset cargado (o a punto de guardarse)
+        name (str): Clave de COLUMNS
+        columns (list): Proyección leída (None = el dataset completo)
+
+    Raises:
+        SchemaError: Con todas las columnas ausentes, de otro tipo o con
+            valores no válidos
+    """
+    if df.empty:
+        return df
+    schema = COLUMNS[name]
+    expected = required_columns(name) if columns is None else columns
+    problems = [f"falta '{column}'" for column in expected if column not in df.columns]
+    problems += [f"'{column}' no es del esquema" for column in expected
+                 if column not in schema and column != 'year']
+
+    for column in df.columns:
+        if column not in schema:
+            continue
+        kind = schema[column][0]
+        series = df[column]
+        if not _kind_matches(series, kind):
+            problems.append(f"'{column}' es {series.dtype}, se esperaba {kind}")
+        elif kind == 'count' and series.isna().any():
+            problems.append(f"'{column}' tiene nulos")
+        elif kind == 'rate' and np.isinf(series.to_numpy()).any():
+            problems.append(f"'{column}' tiene infinitos")
+
+    if problems:
+        raise SchemaError(f"{name}: {'; '.join(problems)}. "
+                          f"Vuelve a ejecutar la etapa transform para regenerarlo")
+    return df
@@ -0,0 +1,281 @@
+# ==============================================================================
+# HISTÓRICO DE FOTOS DEL ENDPOINT STATES
+# ==============================================================================
+#
+# El endpoint states sólo devuelve la foto actual de cada estado y el instante
+# en que la API la publicó (updated, ms desde epoch). data/parquet/states y
+# states_clean.csv guardan sólo la última; este almacén las guarda todas:
+#
+#   data/snapshots/states/
+#     index.json           último updated de cada estado y lista de segmentos
+#     seg-<n>.parquet      uno por ingesta con filas nuevas (sólo se añade)
+#     compact-<n>.parquet  segmentos ya fusionados, ordenados por (state, updated)
+#
+# La clave es (state, updated). Una fila cuyo updated no es posterior al último
+# guardado para su estado ya está en el almacén y se descarta consultando sólo
+# index.json, sin leer segmentos. Con has_new() la etapa transform sabe, antes
+# de procesar nada, si la API ha publicado algo desde la última ejecución.
+#
+# Cuando se acumulan SNAPSHOT_COMPACT_SEGMENTS segmentos, un hilo en segundo
+# plano los fusiona en uno. Cada archivo se escribe con tmp + rename y sólo
+# después se actualiza el índice, que es la referencia: un segmento que no
+# figura en él (una ingesta interrumpida) se descarta al abrir el almacén. Un
+# lock serializa dentro del proceso escrituras, lecturas y compactaciones.
+#
+# Sin pyarrow los segmentos se guardan en CSV con el mismo esquema.
+
+import json
+import os
+import re
+import threading
+
+import pandas as pd
+
+from covid_eda.cache import _atomic_write
+from covid_eda.config import SNAPSHOT_COMPACT_SEGMENTS, STATES_SNAPSHOT_DIR
+from covid_eda.schema import conform, validate
+from covid_eda.storage import _arrow_schema, apply_filters, has_pyarrow
+
+INDEX_FILE = 'index.json'
+INDEX_VERSION = 1
+# Archivos que escribe el almacén (los únicos que puede borrar al abrirlo)
+SEGMENT_FILE = re.compile(r'(seg|compact)-\d+\.(parquet|csv)(\.tmp)?')
+
+
+class SnapshotStore:
+    """
+    Almacén de fotos del endpoint states, deduplicado por (state, updated)
+
+    Args:
+        path (str): Directorio del almacén
+        compact_segments (int): Segmentos sin compactar que disparan la compactación
+    """
+
+    name = 'states_snapshots'
+
+    def __init__(self, path=STATES_SNAPSHOT_DIR, compact_segments=SNAPSHOT_COMPACT_SEGMENTS):
+        self.path = path
+        self.compact_segments = compact_segments
+        self.extension = 'parquet' if has_pyarrow() else 'csv'
+        self._lock = threading.RLock()
+        self._compaction = None
+        self.index = self._load_index()
+
+    # --------------------------------------------------------------------------
+    # Índice
+    # --------------------------------------------------------------------------
+
+    def _index_path(self):
+        return os.path.join(self.path, INDEX_FILE)
+
+    def _load_index(self):
+        index = {'version': INDEX_VERSION, 'latest': {}, 'files': [], 'next': 0}
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == INDEX_VERSION:
+                index = stored
+        except (OSError, ValueError):
+            pass
+        # Archivos que el índice no conoce: ingestas o compactaciones interrumpidas
+        known = {entry['name'] for entry in index['files']}
+        if os.path.isdir(self.path):
+            for entry in os.scandir(self.path):
+                if entry.name not in known and SEGMENT_FILE.fullmatch(entry.name):
+                    os.remove(entry.path)
+        return index
+
+    def _save_index(self):
+        _atomic_write(self._index_path(), json.dumps(self.index, indent=2).encode('utf-8'))
+
+    @property
+    def rows(self):
+        """Filas guardadas en el almacén"""
+        return sum(entry['rows'] for entry in self.index['files'])
+
+    @property
+    def segments(self):
+        """Segmentos pendientes de compactar"""
+        return sum(entry['kind'] == 'seg' for entry in self.index['files'])
+
+    def last_updated(self):
+        """Instante de la foto más reciente guardada (None si el almacén está vacío)"""
+        latest = self.index['latest']
+        return pd.to_datetime(max(latest.values()), unit='ms') if latest else None
+
+    # --------------------------------------------------------------------------
+    # Escritura
+    # --------------------------------------------------------------------------
+
+    def has_new(self, records):
+        """
+        Indica si algún registro del endpoint es posterior a lo guardado
+
+        Args:
+            records (list): Respuesta cruda del endpoint states (no hace falta procesarla)
+        """
+        latest = self.index['latest']
+        return any(record.get('updated') is None or record['updated'] > latest.get(str(record['state']), -1)
+                   for record in records or [])
+
+    def _write(self, df, kind):
+        """Escribir un segmento (tmp + rename) y devolver su entrada del índice"""
+        name = f"{kind}-{self.index['next']:06d}.{self.extension}"
+        self.index['next'] += 1
+        path = os.path.join(self.path, name)
+        tmp_path = f"{path}.tmp"
+        if self.extension == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, schema=_arrow_schema(df, self.name), preserve_index=False)
+            pq.write_table(table, tmp_path, compression='zstd')
+        else:
+            df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        return {'name': name, 'rows': len(df), 'kind': kind}
+
+    def append(self, df):
+        """
+        Añadir las filas de una foto que aún no estén en el almacén
+
+        Args:
+            df (pd.DataFrame): Datos por estado ya procesados (process_states_data)
+
+        Returns:
+            int: Filas nuevas guardadas (0 si la foto ya estaba)
+        """
+        if df.empty:
+            return 0
+        if 'updated' not in df.columns:
+            print("⚠️ La API no devolvió 'updated': la foto no se guarda en el histórico")
+            return 0
+
+        with self._lock:
+            df = validate(conform(df, self.name), self.name)
+            previous = df['state'].astype(str).map(self.index['latest']).fillna(-1)
+            new = df[df['updated'] > previous].drop_duplicates(['state', 'updated'], keep='last')
+            if new.empty:
+                return 0
+
+            os.makedirs(self.path, exist_ok=True)
+            self.index['files'].append(self._write(new.reset_index(drop=True), 'seg'))
+            latest = new.groupby(new['state'].astype(str), observed=True)['updated'].max()
+            self.index['latest'].update({state: int(updated) for state, updated in latest.items()})
+            self._save_index()
+
+        if self.segments >= self.compact_segments:
+            self.compact_in_background()
+        return len(new)
+
+    # --------------------------------------------------------------------------
+    # Compactación
+    # --------------------------------------------------------------------------
+
+    def compact(self):
+        """
+        Fusionar todos los segmentos en uno, ordenado por (state, updated)
+
+        Returns:
+            int: Segmentos fusionados (0 si no había nada que fusionar)
+        """
+        with self._lock:
+            entries = list(self.index['files'])
+        if len(entries) < 2:
+            return 0
+
+        # Los segmentos no cambian una vez escritos: se leen sin bloquear las ingestas
+        merged = self._read([entry['name'] for entry in entries])
+        merged = merged.sort_values(['state', 'updated'], kind='stable').drop_duplicates(
+            ['state', 'updated'], keep='last').reset_index(drop=True)
+
+        with self._lock:
+            entry = self._write(merged, 'compact')
+            names = {old['name'] for old in entries}
+            self.index['files'] = [entry] + [old for old in self.index['files'] if old['name'] not in names]
+            self._save_index()
+            # Con el lock tomado ningún lector está usando los segmentos fusionados
+            for name in names:
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError:
+                    pass
+        return len(entries)
+
+    def _compact_quietly(self):
+        try:
+            self.compact()
+        except Exception as exc:    # en segundo plano: avisar sin romper el pipeline
+            print(f"⚠️ Compactación del histórico de estados fallida: {exc}")
+
+    def compact_in_background(self):
+        """Compactar en un hilo (no daemon: el proceso espera a que termine al salir)"""
+        if self._compaction is None or not self._compaction.is_alive():
+            self._compaction = threading.Thread(target=self._compact_quietly, name='snapshot-compaction')
+            self._compaction.start()
+        return self._compaction
+
+    def wait(self):
+        """Esperar a la compactación en curso, si la hay"""
+        if self._compaction is not None:
+            self._compaction.join()
+
+    # --------------------------------------------------------------------------
+    # Lectura
+    # --------------------------------------------------------------------------
+
+    def _read(self, names, columns=None, filters=None):
+        paths = [os.path.join(self.path, name) for name in names]
+        if self.extension == 'parquet':
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+            import pyarrow.parquet as pq
+
+            # Las columnas opcionales pueden faltar en los segmentos más antiguos
+            schema = pa.unify_schemas([pq.read_schema(path) for path in paths])
+            stored = None if columns is None else [column for column in columns if column in schema.names]
+            expression = pq.filters_to_expression(filters) if filters else None
+            df = ds.dataset(paths, schema=schema, format='parquet').to_table(
+                columns=stored, filter=expression).to_pandas()
+        else:
+            df = pd.concat([pd.read_csv(path) for path in paths], ignore_index=True)
+            df = apply_filters(df, filters)
+            if columns is not None:
+                df = df[[column for column in columns if column in df.columns]]
+        return conform(df, self.name)
+
+    def history(self, states=None, columns=None, start=None, end=None):
+        """
+        Serie de fotos por estado
+
+        Args:
+            states (list): Estados a leer (None = todos)
+            columns (list): Columnas además de state y updated (None = todas)
+            start, end: Rango (inclusivo) de fechas de publicación
+
+        Returns:
+            pd.DataFrame: Ordenado por (state, updated), con snapshot_at (datetime)
+        """
+        filters = []
+        if states:
+            filters.append(('state', 'in', [str(state) for state in states]))
+        if start is not None:
+            filters.append(('updated', '>=', int(pd.Timestamp(start).value // 10 ** 6)))
+        if end is not None:
+            filters.append(('updated', '<=', int(pd.Timestamp(end).value // 10 ** 6)))
+        if columns is not None:
+            columns = ['state', 'updated', *[column for column in columns if column not in ('state', 'updated')]]
+
+        with self._lock:
+            names = [entry['name'] for entry in self.index['files']]
+            if not names:
+                return pd.DataFrame(columns=columns or ['state', 'updated'])
+            df = self._read(names, columns, filters)
+        df = df.sort_values(['state', 'updated'], kind='stable').reset_index(drop=True)
+        df['snapshot_at'] = pd.to_datetime(df['updated'], unit='ms')
+        return df
+
+    def latest(self, columns=None):
+        """Última foto guardada de cada estado"""
+        df = self.history(columns=columns)
+        return df.drop_duplicates('state', keep='last').reset_index(drop=True)
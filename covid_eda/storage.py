@@ -0,0 +1,479 @@
+# ==============================================================================
+# ALMACENAMIENTO COLUMNAR - PARQUET CON ESQUEMAS EXPLÍCITOS
+# ==============================================================================
+#
+# Cada dataset limpio se guarda como Parquet con su esquema canónico
+# (covid_eda.schema: conteos int64, fecha datetime64, tasas float32,
+# estado/región como categoría) para que los lectores no tengan que volver a
+# inferir tipos ni parsear fechas. Al leer, cada dataset se valida contra ese
+# esquema; a un histórico guardado por una versión anterior (sin alguna
+# columna derivada) se le recalculan esas columnas una sola vez al leerlo. Las
+# series históricas se particionan por año (data/parquet/<dataset>/year=YYYY/)
+# y los lectores pueden proyectar columnas y filtrar por fechas sin leer el
+# resto de archivos.
+#
+# pyarrow es una dependencia opcional: sin él, todo se sigue guardando en CSV.
+
+import os
+import shutil
+
+import pandas as pd
+
+from covid_eda.config import DATA_DIR, PARQUET_DIR
+from covid_eda.schema import (ALIASES, COLUMNS, SchemaError, conform, derived_columns, kinds,
+                              required_columns, validate)
+
+# Datasets particionados por año (columna 'year' derivada de 'date')
+PARTITIONED = {'us_historical', 'countries_historical', 'us_states_historical'}
+
+# Orden canónico de las filas (las particiones se leen año a año)
+SORT_KEYS = {
+    'us_historical': ['date'],
+    'countries_historical': ['region', 'date'],
+    'us_states_historical': ['region', 'date'],
+}
+
+# CSV equivalentes (formato de intercambio y respaldo sin pyarrow)
+CSV_FILES = {
+    'us_historical': 'us_historical_clean.csv',
+    'states': 'states_clean.csv',
+    'countries_historical': 'countries_historical_clean.csv',
+    'us_states_historical': 'us_states_historical_clean.csv',
+}
+
+
+def has_pyarrow():
+    """Indica si pyarrow está instalado (necesario para Parquet)"""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def dataset_path(name, parquet_dir=PARQUET_DIR):
+    return os.path.join(parquet_dir, name)
+
+
+def csv_path(name, data_dir=DATA_DIR):
+    return os.path.join(data_dir, CSV_FILES[name])
+
+
+def _arrow_schema(df, name):
+    """Esquema Arrow explícito: categorías como diccionario, fecha en ns"""
+    import pyarrow as pa
+
+    types = {'datetime': pa.timestamp('ns'), 'count': pa.int64(), 'rate': pa.float32(),
+             'category': pa.dictionary(pa.int32(), pa.string())}
+    declared = kinds(name)
+    inferred = pa.Schema.from_pandas(df, preserve_index=False)
+    fields = [pa.field(field.name, types[declared[field.name]]) if field.name in declared else field
+              for field in inferred]
+    return pa.schema(fields)
+
+
+def write_dataset(df, name, parquet_dir=PARQUET_DIR):
+    """
+    Guardar un dataset limpio en Parquet con su esquema explícito
+
+    La escritura se hace en un directorio temporal que sustituye al anterior,
+    para que un lector nunca vea un dataset a medio escribir.
+
+    Args:
+        df (pd.DataFrame): Dataset a guardar
+        name (str): Nombre del dataset (clave de covid_eda.schema.COLUMNS)
+        parquet_dir (str): Directorio raíz de los datasets Parquet
+
+    Returns:
+        str: Ruta del dataset escrito
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = validate(conform(df, name), name)
+    if name in PARTITIONED:
+        df['year'] = df['date'].dt.year.astype('int32')
+
+    table = pa.Table.from_pandas(df, schema=_arrow_schema(df, name), preserve_index=False)
+
+    path = dataset_path(name, parquet_dir)
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    if name in PARTITIONED:
+        pq.write_to_dataset(table, tmp_path, partition_cols=['year'], compression='zstd')
+    else:
+        os.makedirs(tmp_path, exist_ok=True)
+        pq.write_table(table, os.path.join(tmp_path, 'part-0.parquet'), compression='zstd')
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+class DatasetWriter:
+    """
+    Escritura incremental de un dataset, trozo a trozo (modo streaming)
+
+    Cada trozo se escribe como un archivo Parquet más dentro de su partición
+    por año, así que la memoria no depende del tamaño total del dataset. Como
+    write_dataset, se escribe en un directorio temporal que sólo sustituye al
+    anterior al cerrar sin errores.
+
+    Args:
+        name (str): Nombre del dataset (clave de covid_eda.schema.COLUMNS)
+        export_csv (bool): Escribir además el CSV equivalente en data/
+    """
+
+    def __init__(self, name, export_csv=False, parquet_dir=PARQUET_DIR, data_dir=DATA_DIR):
+        self.name = name
+        self.parquet = has_pyarrow()
+        self.csv = export_csv or not self.parquet
+        self.path = dataset_path(name, parquet_dir)
+        self.tmp_path = f"{self.path}.tmp"
+        self.csv_file = csv_path(name, data_dir)
+        self.rows = 0
+        self._parts = 0
+        self._schema = None
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path, exist_ok=True)
+        if self.csv:
+            os.makedirs(data_dir, exist_ok=True)
+
+    def write(self, df):
+        """Añadir un trozo de filas al dataset"""
+        if df.empty:
+            return
+        df = validate(conform(df, self.name), self.name)
+        if self.parquet:
+            self._write_parquet(df)
+        if self.csv:
+            df.to_csv(f"{self.csv_file}.tmp", mode='w' if self.rows == 0 else 'a',
+                      header=self.rows == 0, index=False)
+        self.rows += len(df)
+
+    def _write_parquet(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.name in PARTITIONED:
+            groups = df.groupby(df['date'].dt.year, sort=True)
+        else:
+            groups = [(None, df)]
+        for year, part in groups:
+            # Todos los archivos comparten el esquema del primer trozo
+            table = pa.Table.from_pandas(part, preserve_index=False)
+            if self._schema is None:
+                self._schema = _arrow_schema(part, self.name)
+            table = table.cast(self._schema)
+            directory = self.tmp_path if year is None else os.path.join(self.tmp_path, f"year={year}")
+            os.makedirs(directory, exist_ok=True)
+            pq.write_table(table, os.path.join(directory, f"part-{self._parts:05d}.parquet"),
+                           compression='zstd')
+            self._parts += 1
+
+    def close(self):
+        """Publicar el dataset escrito (sin filas no se toca el anterior)"""
+        if self.rows == 0:
+            self.abort()
+            return None
+        if self.parquet:
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.replace(self.tmp_path, self.path)
+        else:
+            shutil.rmtree(self.tmp_path, ignore_errors=True)
+        if self.csv:
+            os.replace(f"{self.csv_file}.tmp", self.csv_file)
+        return self.path
+
+    def abort(self):
+        """Descartar lo escrito y dejar el dataset anterior intacto"""
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        if os.path.exists(f"{self.csv_file}.tmp"):
+            os.remove(f"{self.csv_file}.tmp")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def replace_tail(df, name, parquet_dir=PARQUET_DIR, data_dir=DATA_DIR):
+    """
+    Sustituir el final de una serie guardada (una fila por fecha) por `df`
+
+    Las filas desde la primera fecha de `df` se reemplazan sin reescribir el
+    resto: en Parquet sólo se reescriben las particiones de los años tocados y
+    el CSV se recorta en esa fecha y se le añaden las filas nuevas. Si el
+    Parquet no existe todavía o tiene otras columnas (versión anterior), se
+    escribe entero.
+
+    Args:
+        df (pd.DataFrame): Filas nuevas o recalculadas, ordenadas por fecha
+        name (str): Nombre del dataset (clave de SORT_KEYS con clave ['date'])
+    """
+    df = validate(conform(df, name), name)
+    since = df['date'].iloc[0]
+    columns = list(df.columns)
+
+    if has_pyarrow():
+        if os.path.isdir(dataset_path(name, parquet_dir)) and dataset_columns(name, parquet_dir) == columns:
+            _replace_partitions(df, name, since, parquet_dir)
+        else:
+            # Sólo había CSV, o el Parquet tiene otras columnas: se escribe entero una vez
+            head = read_dataset(name, filters=[('date', '<', since)], parquet_dir=parquet_dir,
+                                data_dir=data_dir)
+            write_dataset(pd.concat([head, df], ignore_index=True), name, parquet_dir)
+
+    path = csv_path(name, data_dir)
+    if os.path.exists(path) and list(pd.read_csv(path, nrows=0).columns) == columns:
+        with open(path, 'r+b') as handle:
+            handle.truncate(_csv_offset(path, since))
+        df.to_csv(path, mode='a', header=False, index=False)
+    elif os.path.exists(path):
+        head = conform(pd.read_csv(path), name)
+        pd.concat([head[head['date'] < since], df], ignore_index=True).to_csv(path, index=False)
+
+
+def _replace_partitions(df, name, since, parquet_dir=PARQUET_DIR):
+    """Reescribir las particiones por año desde `since` con las filas anteriores + df"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = dataset_path(name, parquet_dir)
+    head = read_dataset(name, start=pd.Timestamp(year=since.year, month=1, day=1),
+                        filters=[('date', '<', since)], parquet_dir=parquet_dir)
+    df = pd.concat([head, df], ignore_index=True)
+    for year, part in df.groupby(df['date'].dt.year, sort=True):
+        # Directorio temporal fuera del dataset, para que los lectores no lo vean
+        directory = os.path.join(path, f"year={year}")
+        tmp_path = f"{path}.tmp-year={year}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        table = pa.Table.from_pandas(part, schema=_arrow_schema(part, name), preserve_index=False)
+        pq.write_table(table, os.path.join(tmp_path, 'part-0.parquet'), compression='zstd')
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_path, directory)
+
+
+def _csv_offset(path, since, block=1 << 16):
+    """
+    Byte en que empieza la primera fila con fecha >= since de un CSV ordenado
+    por fecha (primera columna), leyendo sólo el final del archivo
+    """
+    since = pd.Timestamp(since)
+    size = os.path.getsize(path)
+    with open(path, 'rb') as handle:
+        while True:
+            start = max(size - block, 0)
+            handle.seek(start)
+            tail = handle.read()
+            # La primera línea del bloque está cortada, o es la cabecera
+            skip = tail.find(b'\n') + 1 if b'\n' in tail else len(tail)
+            offset = start + skip
+            lines = tail[skip:].splitlines(keepends=True)
+            for i, line in enumerate(lines):
+                if pd.Timestamp(line.split(b',', 1)[0].decode()) >= since:
+                    if i > 0 or start == 0:
+                        return offset
+                    break
+                offset += len(line)
+            else:
+                if lines or start == 0:
+                    return offset
+            block *= 2
+
+
+def _date_filters(name, start=None, end=None):
+    """Filtros de fecha con poda de particiones por año"""
+    filters = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        filters.append(('date', '>=', start))
+        if name in PARTITIONED:
+            filters.append(('year', '>=', start.year))
+    if end is not None:
+        end = pd.Timestamp(end)
+        filters.append(('date', '<=', end))
+        if name in PARTITIONED:
+            filters.append(('year', '<=', end.year))
+    return filters
+
+
+def check_columns(name, columns):
+    """SchemaError si alguna columna pedida no pertenece al esquema del dataset"""
+    unknown = [column for column in columns if column not in COLUMNS[name] and column != 'year']
+    if unknown:
+        raise SchemaError(f"{name}: {', '.join(unknown)} no son columnas del esquema")
+
+
+def legacy_names(name, parquet_dir=PARQUET_DIR):
+    """Columna canónica -> nombre guardado, en un Parquet escrito antes del esquema canónico"""
+    return {ALIASES[column]: column for column in dataset_columns(name, parquet_dir)
+            if column in ALIASES}
+
+
+# Datasets ya revisados por upgrade_dataset en este proceso: lo que se guarde
+# después lo escribe esta versión, así que no hace falta volver a mirarlos
+_UPGRADE_CHECKED = set()
+
+
+def upgrade_dataset(name, parquet_dir=PARQUET_DIR, data_dir=DATA_DIR):
+    """
+    Recalcular las columnas derivadas que falten en un histórico guardado por
+    una versión anterior (p.ej. el CSV del repositorio) y volver a guardarlo
+
+    Se comprueba una vez por proceso y dataset existente.
+
+    Returns:
+        list: Columnas recalculadas (vacía si el dataset ya estaba al día)
+    """
+    key = (name, os.path.abspath(parquet_dir), os.path.abspath(data_dir))
+    if name not in SORT_KEYS or key in _UPGRADE_CHECKED:
+        return []
+    stored = [ALIASES.get(column, column) for column in dataset_columns(name, parquet_dir, data_dir)]
+    if stored:
+        _UPGRADE_CHECKED.add(key)
+    missing = [column for column in derived_columns(name) if column not in stored]
+    if not stored or not missing or any(column not in stored for column in required_columns(name, 'api')):
+        return []
+
+    from covid_eda.metrics import derived_metrics
+
+    path = dataset_path(name, parquet_dir)
+    parquet = has_pyarrow() and os.path.isdir(path)
+    if parquet:
+        import pyarrow.parquet as pq
+        df = pq.read_table(path).to_pandas().drop(columns=['year'], errors='ignore')
+    else:
+        df = pd.read_csv(csv_path(name, data_dir))
+    df = _sorted(conform(df, name), name)
+    by = 'region' if 'region' in df.columns else None
+    df = conform(derived_metrics(df, by=by), name)
+
+    if parquet:
+        write_dataset(df, name, parquet_dir)
+    if os.path.exists(csv_path(name, data_dir)):
+        df.to_csv(csv_path(name, data_dir), index=False)
+    print(f"🔧 {name}: guardado por una versión anterior, se recalculan {', '.join(missing)}")
+    return missing
+
+
+def read_dataset(name, columns=None, filters=None, start=None, end=None,
+                 parquet_dir=PARQUET_DIR, data_dir=DATA_DIR):
+    """
+    Leer un dataset limpio proyectando sólo las columnas necesarias
+
+    Usa Parquet si existe y pyarrow está instalado; si no, el CSV equivalente
+    (aplicando el mismo esquema).
+
+    Args:
+        name (str): Nombre del dataset (clave de covid_eda.schema.COLUMNS)
+        columns (list): Columnas a leer; None = todas
+        filters (list): Filtros de pyarrow, p.ej. [('region', 'in', ['Spain'])]
+        start, end: Rango de fechas (inclusivo) en datasets históricos
+
+    Returns:
+        pd.DataFrame: Dataset con los tipos de covid_eda.schema (vacío si no existe)
+
+    Raises:
+        SchemaError: Si el dataset guardado no cumple su esquema
+    """
+    check_columns(name, columns or [])
+    upgrade_dataset(name, parquet_dir, data_dir)
+    filters = list(filters or []) + _date_filters(name, start, end)
+    path = dataset_path(name, parquet_dir)
+
+    if has_pyarrow() and os.path.isdir(path):
+        import pyarrow.parquet as pq
+
+        stored = columns
+        if columns is not None or filters:
+            legacy = legacy_names(name, parquet_dir)
+            stored = None if columns is None else [legacy.get(column, column) for column in columns]
+            filters = [(legacy.get(column, column), op, value) for column, op, value in filters]
+        table = pq.read_table(path, columns=stored, filters=filters or None)
+        df = table.to_pandas()
+        if columns is None:
+            df = df.drop(columns=['year'], errors='ignore')
+        df = df.rename(columns={old: new for old, new in ALIASES.items() if old in df.columns})
+        return validate(_sorted(df, name), name, columns)
+
+    if not os.path.exists(csv_path(name, data_dir)):
+        return pd.DataFrame()
+
+    # Proyección por nombre canónico, también si el CSV conserva nombres antiguos
+    usecols = None if columns is None else (lambda column: ALIASES.get(column, column) in columns)
+    df = validate(conform(pd.read_csv(csv_path(name, data_dir), usecols=usecols), name), name, columns)
+    return _sorted(apply_filters(df, filters), name)
+
+
+def apply_filters(df, filters):
+    """Filtros con la sintaxis de pyarrow sobre un DataFrame (lectura desde CSV)"""
+    for column, op, value in filters or []:
+        if column not in df.columns:
+            continue
+        if op == 'in':
+            df = df[df[column].isin(value)]
+        elif op == 'not in':
+            df = df[~df[column].isin(value)]
+        else:
+            df = df.query(f"`{column}` {'==' if op == '=' else op} @value")
+    return df
+
+
+def _sorted(df, name):
+    keys = SORT_KEYS.get(name, [])
+    if keys and all(key in df.columns for key in keys):
+        df = df.sort_values(keys, kind='stable')
+    return df.reset_index(drop=True)
+
+
+def dataset_columns(name, parquet_dir=PARQUET_DIR, data_dir=DATA_DIR):
+    """Columnas de un dataset guardado, leyendo sólo el esquema/cabecera"""
+    path = dataset_path(name, parquet_dir)
+    if has_pyarrow() and os.path.isdir(path):
+        import pyarrow.parquet as pq
+        return [column for column in pq.ParquetDataset(path).schema.names if column != 'year']
+    if os.path.exists(csv_path(name, data_dir)):
+        return list(pd.read_csv(csv_path(name, data_dir), nrows=0).columns)
+    return []
+
+
+def dataset_years(name, parquet_dir=PARQUET_DIR, data_dir=DATA_DIR):
+    """Años presentes en un dataset histórico (particiones Parquet o fechas del CSV)"""
+    path = dataset_path(name, parquet_dir)
+    if has_pyarrow() and os.path.isdir(path):
+        return sorted(int(entry.split('=', 1)[1]) for entry in os.listdir(path)
+                      if entry.startswith('year='))
+    dates = read_dataset(name, columns=['date'], parquet_dir=parquet_dir, data_dir=data_dir)
+    if dates.empty:
+        return []
+    return sorted(dates['date'].dt.year.unique().tolist())
+
+
+def dataset_exists(name, parquet_dir=PARQUET_DIR, data_dir=DATA_DIR):
+    """Indica si hay un dataset guardado (Parquet o CSV)"""
+    return ((has_pyarrow() and os.path.isdir(dataset_path(name, parquet_dir)))
+            or os.path.exists(csv_path(name, data_dir)))
+
+
+def save_dataset(df, name, export_csv=False):
+    """
+    Guardar un dataset limpio en Parquet (o en CSV si falta pyarrow)
+
+    Args:
+        df (pd.DataFrame): Dataset a guardar
+        name (str): Nombre del dataset (clave de covid_eda.schema.COLUMNS)
+        export_csv (bool): Escribir además el CSV equivalente en data/
+    """
+    if has_pyarrow():
+        write_dataset(df, name)
+    if export_csv or not has_pyarrow():
+        os.makedirs(DATA_DIR, exist_ok=True)
+        df.to_csv(csv_path(name), index=False)
@@ -0,0 +1,130 @@
+# ==============================================================================
+# PROCESAMIENTO POR TROZOS - HISTÓRICOS MAYORES QUE LA MEMORIA
+# ==============================================================================
+#
+# En lugar de construir el DataFrame completo y sus copias derivadas, el modo
+# streaming recorre los timelines de la API en trozos ordenados por fecha
+# y escribe cada trozo procesado en cuanto está listo.
+#
+# Las ventanas móviles cruzan los límites entre trozos: de cada región se
+# arrastra al trozo siguiente la cola de filas crudas que todavía hace falta,
+# es decir las lookback_rows() anteriores (medias hacia atrás, crecimiento y
+# la variación diaria) más las filas cuya media centrada necesita días que aún
+# no han llegado, que se emiten con el trozo siguiente. Con conteos enteros el
+# resultado es idéntico al del procesamiento en memoria.
+
+from itertools import islice
+
+import pandas as pd
+
+from covid_eda.config import STREAM_CHUNK_DAYS
+from covid_eda.metrics import GROWTH_WINDOW, TRAILING_WINDOW, WINDOW, derived_metrics, lookback_rows
+
+_RAW_COLUMNS = ['date', 'cases', 'deaths']
+
+
+def _timeline_rows(timeline):
+    """Iterador (fecha, casos, muertes) sobre un timeline de la API"""
+    return zip(timeline['cases'].keys(), timeline['cases'].values(), timeline['deaths'].values())
+
+
+def _rows_to_frame(rows, region=None):
+    dates, cases, deaths = zip(*rows)
+    df = pd.DataFrame({'date': pd.to_datetime(dates, format='%m/%d/%y'),
+                       'cases': pd.array(cases, dtype='int64'),
+                       'deaths': pd.array(deaths, dtype='int64')})
+    if region is not None:
+        df.insert(0, 'region', region)
+    return df
+
+
+def iter_timeline_chunks(historical_data, chunk_days=STREAM_CHUNK_DAYS):
+    """Trozos (date, cases, deaths) de chunk_days días de un histórico de la API"""
+    if not historical_data or 'timeline' not in historical_data:
+        return
+    rows = _timeline_rows(historical_data['timeline'])
+    while True:
+        chunk = list(islice(rows, chunk_days))
+        if not chunk:
+            return
+        yield _rows_to_frame(chunk)
+
+
+def iter_regional_chunks(histories, chunk_days=STREAM_CHUNK_DAYS):
+    """
+    Trozos largos (region, date, cases, deaths) ordenados por fecha
+
+    El trozo k contiene, para cada región, sus días k*chunk_days a (k+1)*chunk_days.
+
+    Args:
+        histories (dict): región -> timeline {'cases': {...}, 'deaths': {...}}
+    """
+    iterators = {region: _timeline_rows(timeline) for region, timeline in histories.items()}
+    while iterators:
+        frames = []
+        for region, rows in list(iterators.items()):
+            chunk = list(islice(rows, chunk_days))
+            if chunk:
+                frames.append(_rows_to_frame(chunk, region))
+            if len(chunk) < chunk_days:
+                del iterators[region]
+        if frames:
+            yield pd.concat(frames, ignore_index=True)
+
+
+def stream_metrics(chunks, by=None, window=WINDOW, trailing_window=TRAILING_WINDOW,
+                   growth_window=GROWTH_WINDOW):
+    """
+    Calcular las métricas derivadas trozo a trozo
+
+    Args:
+        chunks (iterable): DataFrames crudos ordenados por fecha (ver iter_*_chunks)
+        by (str): Columna de región (None = serie única)
+        window, trailing_window, growth_window: Ventanas de derived_metrics
+
+    Yields:
+        pd.DataFrame: Filas con sus métricas definitivas, en orden de llegada
+    """
+    windows = {'window': window, 'trailing_window': trailing_window, 'growth_window': growth_window}
+    ahead = (window - 1) // 2
+    keep = lookback_rows(**windows) + ahead
+    raw_columns = ([by] if by else []) + _RAW_COLUMNS
+    carry = None
+
+    for chunk in chunks:
+        chunk = chunk[raw_columns].assign(_emitted=False)
+        frame = chunk if carry is None else pd.concat([carry, chunk], ignore_index=True)
+        frame = derived_metrics(frame, by=by, **windows)
+
+        # Las últimas `ahead` filas de cada región esperan a los días siguientes
+        group = frame.groupby(by, sort=False) if by else frame.groupby(lambda _: 0)
+        ready = (group.cumcount(ascending=False) >= ahead).to_numpy()
+        emit = ready & ~frame['_emitted'].to_numpy()
+        if emit.any():
+            yield frame.loc[emit].drop(columns='_emitted').reset_index(drop=True)
+
+        frame['_emitted'] = frame['_emitted'] | ready
+        carry = group.tail(keep).index
+        carry = frame.loc[carry, raw_columns + ['_emitted']].reset_index(drop=True)
+
+    if carry is not None:
+        # Fin de los datos: las filas pendientes ya tienen su valor definitivo (NaN al final)
+        frame = derived_metrics(carry, by=by, **windows)
+        pending = ~frame['_emitted'].to_numpy()
+        if pending.any():
+            yield frame.loc[pending].drop(columns='_emitted').reset_index(drop=True)
+
+
+def stream_to_dataset(chunks, name, by=None, export_csv=False):
+    """
+    Procesar trozos y escribir cada resultado en el dataset según se produce
+
+    Returns:
+        int: Filas escritas
+    """
+    from covid_eda.storage import DatasetWriter
+
+    with DatasetWriter(name, export_csv=export_csv) as writer:
+        for derived in stream_metrics(chunks, by=by):
+            writer.write(derived)
+    return writer.rows
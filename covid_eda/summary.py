@@ -0,0 +1,182 @@
+# ==============================================================================
+# RESUMEN ESTADÍSTICO - ARTEFACTO COMPARTIDO POR CONSOLA E INFORME
+# ==============================================================================
+#
+# La etapa analyze calcula una sola vez todas las cifras que muestran la
+# consola y el informe PDF (totales, letalidad, estado más afectado, periodo,
+# distribuciones por estado, outliers, asimetría, correlaciones con su
+# significación, ver covid_eda/correlation.py, y anomalías de las series
+# diarias nacionales, ver covid_eda/anomalies.py) y las guarda
+# en data/summary_stats.json. El informe lee sólo este archivo: no vuelve a
+# abrir los datasets.
+#
+# El artefacto lleva la versión de su formato (SUMMARY_VERSION) y el hash de
+# las columnas de las que sale (inputs_hash); si los datos no han cambiado, la
+# etapa analyze reutiliza el resumen guardado.
+
+import json
+import os
+import time
+
+import numpy as np
+
+from covid_eda.cache import _atomic_write
+from covid_eda.config import SUMMARY_JSON
+
+SUMMARY_VERSION = 3
+
+# Columnas de las que sale el resumen (también definen inputs_hash)
+SUMMARY_INPUTS = {
+    'us': ['date', 'cases', 'deaths', 'new_cases', 'new_deaths', 'fatality_rate'],
+    'states': ['state', 'cases', 'deaths', 'recovered', 'population', 'cases_per_100k',
+               'deaths_per_100k', 'fatality_rate'],
+}
+DISTRIBUTION_COLUMNS = ['cases_per_100k', 'deaths_per_100k', 'fatality_rate']
+CORRELATION_COLUMNS = ['cases', 'deaths', 'population', 'cases_per_100k', 'deaths_per_100k',
+                       'fatality_rate']
+
+
+def _number(value):
+    """Escalar de NumPy/pandas -> int/float de Python (NaN -> None) para el JSON"""
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def series_summary(df, total_recovered=0):
+    """
+    Totales, pico diario y periodo de una serie histórica (nacional o de una región)
+
+    Las columnas vienen garantizadas por el esquema (covid_eda.schema). Los
+    históricos no traen recuperados: total_recovered llega aparte (suma de la
+    columna opcional 'recovered' de los datos por estado).
+    """
+    if df.empty:
+        return None
+    last = df.iloc[-1]
+    total_cases, total_deaths = int(last['cases']), int(last['deaths'])
+    peak = df['new_cases'].idxmax()
+    return {
+        'total_cases': total_cases,
+        'total_deaths': total_deaths,
+        'total_recovered': int(total_recovered),
+        'fatality_rate': total_deaths / total_cases * 100 if total_cases else 0.0,
+        'start_date': df['date'].iloc[0].date().isoformat(),
+        'end_date': last['date'].date().isoformat(),
+        'days': len(df),
+        'peak_daily_cases': int(df.loc[peak, 'new_cases']),
+        'peak_date': df.loc[peak, 'date'].date().isoformat(),
+    }
+
+
+def _states_summary(df_states):
+    """Estado más afectado, distribuciones, outliers, asimetría y correlaciones"""
+    from covid_eda.analyze import analyze_skewness
+    from covid_eda.correlation import correlation_matrix
+    from covid_eda.outliers import detect_outliers
+
+    if df_states.empty:
+        return None
+    top = df_states['cases'].idxmax()
+    states = {
+        'count': len(df_states),
+        'most_affected': {'state': str(df_states.loc[top, 'state']),
+                          'cases': int(df_states.loc[top, 'cases'])},
+        'distributions': {},
+    }
+
+    masks, stats = detect_outliers(df_states, columns=DISTRIBUTION_COLUMNS, methods=('iqr', 'zscore'))
+    names = df_states['state'].astype(str)
+    for column in DISTRIBUTION_COLUMNS:
+        row = stats.loc[column]
+        skew, skew_desc = analyze_skewness(df_states[column])
+        states['distributions'][column] = {
+            **{key: _number(row[key]) for key in ('mean', 'median', 'std', 'q1', 'q3',
+                                                   'iqr_lower', 'iqr_upper')},
+            'min': _number(df_states[column].min()),
+            'max': _number(df_states[column].max()),
+            'skew': _number(skew),
+            'skew_desc': skew_desc,
+            'outliers_iqr': names[masks[('iqr', column)]].tolist(),
+            'outliers_zscore': names[masks[('zscore', column)]].tolist(),
+        }
+
+    # Pearson y Spearman con p-valores e intervalos (los mismos que usan las figuras)
+    states['correlations'] = correlation_matrix(df_states, CORRELATION_COLUMNS)
+    return states
+
+
+def summary_inputs_hash(df_us, df_states):
+    """Hash de las columnas de las que sale el resumen"""
+    from covid_eda.figcache import hash_inputs
+
+    return hash_inputs({'us': df_us, 'states': df_states}, SUMMARY_INPUTS)
+
+
+def compute_summary(df_us, df_states, inputs_hash=None):
+    """
+    Calcular el resumen estadístico completo
+
+    Returns:
+        dict: Artefacto con version, generated_at, inputs_hash, national y states
+    """
+    from covid_eda.anomalies import anomaly_summary, detect_anomalies
+
+    recovered = df_states['recovered'].sum() if 'recovered' in df_states.columns else 0
+    national = series_summary(df_us, total_recovered=recovered)
+    if national is not None:
+        national['anomalies'] = anomaly_summary(detect_anomalies(df_us))
+    return {
+        'version': SUMMARY_VERSION,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'inputs_hash': inputs_hash or summary_inputs_hash(df_us, df_states),
+        'national': national,
+        'states': _states_summary(df_states),
+    }
+
+
+def save_summary(summary, path=SUMMARY_JSON):
+    """Guardar el resumen (escritura atómica)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    _atomic_write(path, json.dumps(summary, indent=2, ensure_ascii=False).encode('utf-8'))
+
+
+def load_summary(path=SUMMARY_JSON):
+    """
+    Leer el resumen guardado
+
+    Returns:
+        dict: El resumen, o None si no existe, está dañado o es de otra versión
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if summary.get('version') != SUMMARY_VERSION:
+        return None
+    return summary
+
+
+def build_summary(df_us, df_states, path=SUMMARY_JSON):
+    """
+    Resumen de los datos actuales, reutilizando el guardado si sus entradas no cambian
+
+    Returns:
+        dict: El resumen (guardado en `path`)
+    """
+    stored = load_summary(path)
+    inputs_hash = summary_inputs_hash(df_us, df_states)
+    if stored is not None and stored.get('inputs_hash') == inputs_hash:
+        print("📋 Resumen estadístico sin cambios (reutilizado)")
+        return stored
+
+    summary = compute_summary(df_us, df_states, inputs_hash)
+    save_summary(summary, path)
+    print(f"💾 Resumen estadístico guardado: {path}")
+    return summary
@@ -0,0 +1,251 @@
+# ==============================================================================
+# ETAPA TRANSFORM - LIMPIEZA Y MÉTRICAS DERIVADAS
+# ==============================================================================
+
+import numpy as np
+import pandas as pd
+
+from covid_eda.metrics import derived_metrics, lookback_rows
+from covid_eda.schema import API_FIELDS, from_api
+
+
+def timeline_to_frame(historical_data):
+    """Convertir el timeline de la API en un DataFrame (date, cases, deaths)"""
+    timeline = historical_data['timeline']
+    dates = list(timeline['cases'].keys())
+
+    # La API usa fechas m/d/yy: con formato explícito se evita dateutil fila a fila
+    return pd.DataFrame({
+        'date': pd.to_datetime(dates, format='%m/%d/%y'),
+        **{column: list(timeline[field].values()) for field, column in API_FIELDS['timeline'].items()},
+    })
+
+
+def compute_us_metrics(df, window=7):
+    """Calcular las métricas derivadas de la serie acumulada (ver covid_eda.metrics)"""
+    return derived_metrics(df, window=window)
+
+
+def process_us_data(historical_data):
+    """Procesar datos históricos de EE.UU."""
+    if not historical_data or 'timeline' not in historical_data:
+        return pd.DataFrame()
+
+    return compute_us_metrics(timeline_to_frame(historical_data))
+
+
+def append_us_data(df_old, historical_data, window=7):
+    """
+    Incorporar a la serie guardada una ventana reciente de la API
+
+    Sólo se recalculan las filas cuyas métricas derivadas cambian: los días
+    nuevos (o revisados por la API) y las window // 2 filas anteriores, cuyo
+    promedio móvil centrado pasa a incluir los días nuevos. El resultado es
+    idéntico al de process_us_data sobre el histórico completo.
+
+    Args:
+        df_old (pd.DataFrame): Serie procesada guardada en data/
+        historical_data (dict): Respuesta de historical/USA?lastdays=N
+        window (int): Ventana del promedio móvil
+
+    Returns:
+        tuple: (DataFrame actualizado, número de días nuevos)
+    """
+    if not historical_data or 'timeline' not in historical_data:
+        return df_old, 0
+    df_window = timeline_to_frame(historical_data)
+    if df_old.empty:
+        return compute_us_metrics(df_window, window), len(df_window)
+
+    # Primer día que cambia: nuevo o con acumulados revisados por la API
+    stored = df_old.set_index('date')[['cases', 'deaths']]
+    in_store = df_window['date'].isin(stored.index)
+    overlap = df_window[in_store]
+    revised = overlap[(overlap['cases'].values != stored.loc[overlap['date'], 'cases'].values) |
+                      (overlap['deaths'].values != stored.loc[overlap['date'], 'deaths'].values)]
+    n_new = int((~in_store).sum())
+    if n_new == 0 and revised.empty:
+        return df_old, 0
+    if not revised.empty:
+        print(f"⚠️ La API revisó {len(revised)} días ya guardados: se recalculan")
+
+    candidates = []
+    if n_new:
+        candidates.append(df_window.loc[~in_store, 'date'].min())
+    if not revised.empty:
+        candidates.append(revised['date'].min())
+    first_changed = min(candidates)
+
+    last_stored = df_old['date'].iloc[-1]
+    if df_window['date'].iloc[0] > last_stored + pd.Timedelta(days=1):
+        print(f"⚠️ Hueco entre {last_stored.date()} y {df_window['date'].iloc[0].date()}")
+
+    # Filas intactas + días nuevos/revisados (sólo columnas crudas)
+    n_keep = int((df_old['date'] < first_changed).sum())
+    raw = pd.concat([df_old.iloc[:n_keep][['date', 'cases', 'deaths']],
+                     df_window[df_window['date'] >= first_changed]], ignore_index=True)
+
+    # Recalcular con el contexto justo: las window // 2 filas previas cuya media
+    # centrada cambia, más las filas que necesitan sus ventanas hacia atrás
+    half = window // 2
+    keep_from = max(n_keep - half, 0)
+    start = max(keep_from - lookback_rows(window), 0)
+    segment = compute_us_metrics(raw.iloc[start:].reset_index(drop=True), window)
+
+    df = pd.concat([df_old.iloc[:keep_from], segment.iloc[keep_from - start:]], ignore_index=True)
+    return df.reindex(columns=df_old.columns), n_new
+
+
+def load_us_tail(first_date, window=7):
+    """
+    Final de la serie guardada que necesita append_us_data para incorporar una
+    ventana que empieza en first_date: las filas desde first_date y las
+    window // 2 + lookback_rows(window) anteriores (vacío si no hay serie)
+    """
+    from covid_eda.storage import dataset_years, read_dataset
+
+    years = dataset_years('us_historical')
+    if not years:
+        return pd.DataFrame()
+    context = window // 2 + lookback_rows(window)
+    days = context
+    while True:
+        start = first_date - pd.Timedelta(days=days)
+        df = read_dataset('us_historical', start=start)
+        # Con huecos en la serie, esos días son menos filas: se amplía el rango
+        if int((df['date'] < first_date).sum()) >= context or start.year < years[0]:
+            return df
+        days *= 2
+
+
+def load_last_stored_date():
+    """Fecha del último registro guardado del histórico de EE.UU. (None si no existe)"""
+    from covid_eda.storage import read_dataset
+
+    dates = read_dataset('us_historical', columns=['date'])
+    if dates.empty:
+        return None
+    return dates['date'].max()
+
+
+def clean_states_data(df):
+    """Eliminar valores infinitos y filas sin métricas per cápita"""
+    df = df.replace([np.inf, -np.inf], np.nan)
+    df = df.dropna(subset=['cases_per_100k', 'deaths_per_100k', 'fatality_rate'])
+    return df
+
+
+def process_states_data(states_data):
+    """Procesar datos por estados (campos de la API -> nombres canónicos, ver covid_eda.schema)"""
+    if not states_data:
+        return pd.DataFrame()
+
+    df = from_api(states_data, 'states')
+
+    # Calcular métricas per cápita
+    df['cases_per_100k'] = (df['cases'] / df['population'] * 100000).fillna(0)
+    df['deaths_per_100k'] = (df['deaths'] / df['population'] * 100000).fillna(0)
+    df['fatality_rate'] = (df['deaths'] / df['cases'] * 100).fillna(0)
+
+    # Limpiar valores infinitos
+    return clean_states_data(df)
+
+
+def save_clean_data(df_us, df_states):
+    """Guardar los datasets limpios (Parquet + CSV de intercambio en data/); None = no tocar"""
+    from covid_eda.storage import save_dataset
+
+    if df_us is not None and not df_us.empty:
+        save_dataset(df_us, 'us_historical', export_csv=True)
+        print("💾 Datos históricos EE.UU. guardados")
+
+    if df_states is not None and not df_states.empty:
+        save_dataset(df_states, 'states', export_csv=True)
+        print("💾 Datos por estados guardados")
+
+
+def load_clean_data(us_columns=None, states_columns=None, compact=False):
+    """
+    Cargar los datasets limpios generados por la etapa transform
+
+    Args:
+        us_columns (list): Columnas a leer del histórico de EE.UU. (None = todas)
+        states_columns (list): Columnas a leer de los datos por estado (None = todas)
+        compact (bool): Reducir los tipos en memoria (ver covid_eda.compact)
+
+    Returns:
+        tuple: (df_us, df_states); DataFrames vacíos si no hay datos guardados
+    """
+    from covid_eda.storage import read_dataset
+
+    df_us = read_dataset('us_historical', columns=us_columns)
+    # read_dataset valida el esquema: las métricas derivadas se calcularon y
+    # limpiaron en la etapa transform y no se recalculan aquí
+    df_states = read_dataset('states', columns=states_columns)
+
+    if compact:
+        from covid_eda.compact import compact_frame
+        df_us = compact_frame(df_us, 'us_historical')
+        df_states = compact_frame(df_states, 'states')
+
+    return df_us, df_states
+
+
+# ==============================================================================
+# HISTÓRICOS MULTI-REGIÓN (PAÍSES Y ESTADOS) EN FORMATO LARGO
+# ==============================================================================
+
+def regional_histories_to_frame(histories):
+    """
+    Convertir timelines por región en un DataFrame largo (region, date, cases, deaths)
+
+    Args:
+        histories (dict): región -> timeline {'cases': {...}, 'deaths': {...}}
+
+    Returns:
+        pd.DataFrame: Una fila por región y día, ordenado por región y fecha
+    """
+    frames = []
+    for region, timeline in histories.items():
+        frame = pd.DataFrame({'cases': pd.Series(timeline['cases'], dtype='int64'),
+                              'deaths': pd.Series(timeline['deaths'], dtype='int64')})
+        frame.index = pd.to_datetime(frame.index, format='%m/%d/%y')
+        frame.insert(0, 'region', region)
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=['region', 'date', 'cases', 'deaths'])
+
+    df = pd.concat(frames).rename_axis('date').reset_index()
+    df = df[['region', 'date', 'cases', 'deaths']]
+    return df.sort_values(['region', 'date'], kind='stable').reset_index(drop=True)
+
+
+def sum_county_timelines(county_records):
+    """Sumar los timelines de los condados de un estado en un único timeline"""
+    totals = {}
+    for metric in ('cases', 'deaths'):
+        by_county = pd.DataFrame({i: record['timeline'][metric]
+                                  for i, record in enumerate(county_records)})
+        totals[metric] = by_county.fillna(0).sum(axis=1).astype('int64').to_dict()
+    return totals
+
+
+def compute_regional_metrics(df, window=7):
+    """Métricas derivadas por región sobre un DataFrame largo (region, date, ...)"""
+    return derived_metrics(df, by='region', window=window)
+
+
+def process_country_histories(histories):
+    """Procesar los históricos por país (ver ingest.fetch_country_histories)"""
+    if not histories:
+        return pd.DataFrame()
+    return compute_regional_metrics(regional_histories_to_frame(histories))
+
+
+def process_us_state_histories(state_counties):
+    """Procesar los históricos por estado (ver ingest.fetch_us_state_histories)"""
+    if not state_counties:
+        return pd.DataFrame()
+    histories = {state: sum_county_timelines(records) for state, records in state_counties.items()}
+    return compute_regional_metrics(regional_histories_to_frame(histories))
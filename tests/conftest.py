@@ -0,0 +1,102 @@
+# ==============================================================================
+# FIXTURES COMPARTIDAS DE LOS TESTS
+# ==============================================================================
+#
+# Las rutas de covid_eda.config son relativas (data/, images/...): cada test
+# se ejecuta en un directorio temporal propio para no tocar los datos del
+# repositorio.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Ejecutar cada test dentro de un directorio temporal vacío"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def make_timeline(start='2020-11-01', days=120, seed=0):
+    """Respuesta sintética de historical/USA (acumulados crecientes con ruido)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=days, freq='D')
+    cases = np.cumsum(rng.integers(1_000, 50_000, days))
+    deaths = np.cumsum(rng.integers(0, 800, days))
+    keys = [f"{date.month}/{date.day}/{date:%y}" for date in dates]
+    return {'country': 'USA', 'timeline': {'cases': dict(zip(keys, cases.tolist())),
+                                           'deaths': dict(zip(keys, deaths.tolist()))}}
+
+
+def slice_timeline(timeline, first, last):
+    """Días [first, last) de una respuesta de historical/USA"""
+    return {'country': 'USA', 'timeline': {
+        field: dict(list(values.items())[first:last])
+        for field, values in timeline['timeline'].items()}}
+
+
+# ==============================================================================
+# API LOCAL (http.server) PARA LOS TESTS DE DESCARGA
+# ==============================================================================
+
+class StubAPI:
+    """Rutas servidas: path -> (cuerpo JSON, etag, last_modified)"""
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+
+    def set(self, path, payload, etag=None, last_modified=None):
+        self.routes[path] = (json.dumps(payload).encode('utf-8'), etag, last_modified)
+
+    def statuses(self):
+        return [status for _, status in self.requests]
+
+
+def _handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.lstrip('/')
+            if path not in api.routes:
+                api.requests.append((path, 404))
+                self.send_error(404)
+                return
+            body, etag, last_modified = api.routes[path]
+            if ((etag and self.headers.get('If-None-Match') == etag) or
+                    (not etag and last_modified and self.headers.get('If-Modified-Since') == last_modified)):
+                api.requests.append((path, 304))
+                self.send_response(304)
+                self.end_headers()
+                return
+            api.requests.append((path, 200))
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            if etag:
+                self.send_header('ETag', etag)
+            if last_modified:
+                self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def stub():
+    """(url base, StubAPI) de un servidor HTTP local en un puerto libre"""
+    api = StubAPI()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _handler(api))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", api
+    server.shutdown()
+    server.server_close()
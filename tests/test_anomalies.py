@@ -0,0 +1,61 @@
+# ==============================================================================
+# TESTS - MOTOR DE ANOMALÍAS (covid_eda.anomalies) SOBRE SERIES CONOCIDAS
+# ==============================================================================
+#
+# Una región con ruido de Poisson a la que se inyectan una corrección negativa,
+# un pico aislado y un cambio de nivel, y otra que sólo publica un día por
+# semana: se comprueba exactamente qué días marca cada método.
+
+import numpy as np
+import pandas as pd
+
+from covid_eda.anomalies import detect_anomalies
+
+DAYS = 210
+DATES = pd.date_range('2021-01-01', periods=DAYS)
+CORRECTION, SPIKE, SHIFT = 60, 100, 140
+
+
+def _regions(seed=0):
+    rng = np.random.default_rng(seed)
+    steady = rng.poisson(200, DAYS).astype(float)
+    steady[CORRECTION] = -500
+    steady[SPIKE] = 3000
+    steady[SHIFT:] = rng.poisson(800, DAYS - SHIFT)
+    weekly = np.where(np.arange(DAYS) % 7 == 3, rng.poisson(1400, DAYS), 0).astype(float)
+    return pd.concat([pd.DataFrame({'region': region, 'date': DATES, 'new_cases': values})
+                      for region, values in (('steady', steady), ('weekly', weekly))],
+                     ignore_index=True)
+
+
+def _flagged(flags, method):
+    rows = flags[flags['method'] == method]
+    return sorted(zip(rows['region'], rows['date'], rows['direction']))
+
+
+def test_each_method_flags_exactly_the_injected_days():
+    flags = detect_anomalies(_regions(), columns=['new_cases'], by='region',
+                             methods=('negative', 'seasonal', 'change_point'))
+
+    assert _flagged(flags, 'negative') == [('steady', DATES[CORRECTION], 'down')]
+    # Ni los días junto al pico, ni los del salto de nivel, ni la publicación semanal
+    assert _flagged(flags, 'seasonal') == [('steady', DATES[CORRECTION], 'down'),
+                                           ('steady', DATES[SPIKE], 'up')]
+    assert _flagged(flags, 'change_point') == [('steady', DATES[SHIFT], 'up')]
+
+
+def test_seasonal_expectation_ignores_the_spike():
+    flags = detect_anomalies(_regions(), columns=['new_cases'], by='region', methods=('seasonal',))
+    spike = flags[flags['date'] == DATES[SPIKE]].iloc[0]
+    assert 150 < spike['expected'] < 250
+
+
+def test_seasonal_stays_quiet_on_noise():
+    rng = np.random.default_rng(1)
+    for level in (5, 100, 5000):
+        values = rng.poisson(level, (20, 300)).astype(float)
+        df = pd.DataFrame({'region': np.repeat(np.arange(20), 300),
+                           'date': np.tile(pd.date_range('2021-01-01', periods=300), 20),
+                           'new_cases': values.ravel()})
+        flags = detect_anomalies(df, columns=['new_cases'], by='region', methods=('seasonal',))
+        assert len(flags) <= 2, level
@@ -0,0 +1,27 @@
+# ==============================================================================
+# TESTS - INFORMES PDF POR REGIÓN (covid_eda.batch_report)
+# ==============================================================================
+
+import os
+
+from conftest import make_timeline
+
+from covid_eda.batch_report import _file_names, generate_region_reports
+from covid_eda.storage import save_dataset
+from covid_eda.transform import process_country_histories
+
+
+def test_colliding_slugs_get_a_suffix():
+    names = _file_names(['Cote d Ivoire', "Côte d'Ivoire", 'a', 'a_2', 'A'])
+    assert names == {'Cote d Ivoire': 'cote_d_ivoire.pdf', "Côte d'Ivoire": 'cote_d_ivoire_2.pdf',
+                     'a': 'a.pdf', 'a_2': 'a_2.pdf', 'A': 'a_3.pdf'}
+
+
+def test_two_regions_with_the_same_slug_get_two_reports(workdir):
+    histories = {name: make_timeline(days=60, seed=seed)['timeline']
+                 for seed, name in enumerate(['Cote d Ivoire', "Côte d'Ivoire"])}
+    save_dataset(process_country_histories(histories), 'countries_historical')
+
+    paths = generate_region_reports('countries', output_dir=str(workdir / 'reports'), workers=1)
+    assert [os.path.basename(path) for path in paths] == ['cote_d_ivoire.pdf', 'cote_d_ivoire_2.pdf']
+    assert all(os.path.getsize(path) > 0 for path in paths)
@@ -0,0 +1,40 @@
+# ==============================================================================
+# TESTS - BENCHMARKS CON DATOS SINTÉTICOS (covid_eda.bench)
+# ==============================================================================
+
+import numpy as np
+
+from covid_eda.bench import (compare, run_benchmarks, synthetic_histories, synthetic_regional_frame,
+                             synthetic_states_raw, synthetic_us_raw)
+from covid_eda.transform import process_states_data, process_us_data, regional_histories_to_frame
+
+TINY = {'states': 10, 'days': 60, 'regions': 3, 'raw_regions': 3, 'region_days': 60}
+
+
+def test_generators_are_reproducible_and_valid():
+    assert synthetic_us_raw(30, seed=1) == synthetic_us_raw(30, seed=1)
+    assert synthetic_us_raw(30, seed=1) != synthetic_us_raw(30, seed=2)
+
+    df_us = process_us_data(synthetic_us_raw(90))
+    assert len(df_us) == 90 and (df_us['new_cases'].iloc[1:] >= 0).all()
+    assert len(process_states_data(synthetic_states_raw(20))) == 20
+
+    # Los dos formatos del histórico regional describen los mismos datos
+    long = synthetic_regional_frame(4, 50, seed=3)
+    from_api = regional_histories_to_frame(synthetic_histories(4, 50, seed=3))
+    assert long['cases'].tolist() == from_api['cases'].tolist()
+    assert long['region'].astype(str).tolist() == from_api['region'].tolist()
+    assert (np.diff(long['cases'].to_numpy().reshape(4, 50), axis=1) >= 0).all()
+
+
+def test_selected_benchmarks_run_and_compare():
+    result = run_benchmarks(only=['transform'], repeat=1, memory=False, overrides=TINY)
+    assert result['results'] and {item['stage'] for item in result['results']} == {'transform'}
+    for item in result['results']:
+        assert item['params'] == TINY and item['seconds']['median'] >= 0
+
+    slower = {**result, 'results': [{**item, 'seconds': {**item['seconds'],
+                                                         'median': item['seconds']['median'] * 2 + 1}}
+                                    for item in result['results']]}
+    assert compare(result, slower) == [item['name'] for item in result['results']]
+    assert compare(slower, result) == []
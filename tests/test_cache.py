@@ -0,0 +1,165 @@
+# ==============================================================================
+# TESTS - CACHÉ HTTP (covid_eda.cache) CONTRA UN SERVIDOR LOCAL
+# ==============================================================================
+#
+# El fixture `stub` (tests/conftest.py) hace de API en localhost: sirve JSON
+# con ETag y/o Last-Modified, responde 304 a las peticiones condicionales que
+# coinciden y cuenta las peticiones recibidas.
+
+import json
+import os
+
+from conftest import make_timeline
+
+from covid_eda.cache import ResponseCache
+from covid_eda.config import STATES_RAW, US_HISTORICAL_RAW
+from covid_eda.fetch import fetch_all, get_covid_data, load_raw
+
+LAST_MODIFIED = 'Wed, 21 Oct 2020 07:28:00 GMT'
+
+
+def _get(endpoint, base_url, cache, **kwargs):
+    return get_covid_data(endpoint, cache=cache, base_url=base_url, verbose=False, **kwargs)
+
+
+def test_fresh_hit_does_not_touch_the_network(stub):
+    base_url, api = stub
+    api.set('states', [{'state': 'Ohio'}], etag='"v1"')
+    cache = ResponseCache()
+
+    assert _get('states', base_url, cache) == [{'state': 'Ohio'}]
+    assert _get('states', base_url, cache) == [{'state': 'Ohio'}]
+    assert api.statuses() == [200]
+
+
+def test_stale_entry_is_revalidated_with_etag(stub):
+    base_url, api = stub
+    api.set('states', [{'state': 'Ohio'}], etag='"v1"')
+    cache = ResponseCache(ttl=0)
+
+    _get('states', base_url, cache)
+    fetched_at = cache.lookup(f"{base_url}/states")['fetched_at']
+    assert _get('states', base_url, cache) == [{'state': 'Ohio'}]
+    assert api.statuses() == [200, 304]
+    assert cache.lookup(f"{base_url}/states")['fetched_at'] >= fetched_at
+
+    # Si cambia el ETag, el 200 sustituye el cuerpo guardado
+    api.set('states', [{'state': 'Iowa'}], etag='"v2"')
+    assert _get('states', base_url, cache) == [{'state': 'Iowa'}]
+    assert cache.lookup(f"{base_url}/states")['etag'] == '"v2"'
+    assert api.statuses() == [200, 304, 200]
+
+
+def test_stale_entry_is_revalidated_with_last_modified(stub):
+    base_url, api = stub
+    api.set('states', [{'state': 'Ohio'}], last_modified=LAST_MODIFIED)
+    cache = ResponseCache(ttl=0)
+
+    _get('states', base_url, cache)
+    assert cache.conditional_headers(cache.lookup(f"{base_url}/states")) == {
+        'If-Modified-Since': LAST_MODIFIED}
+    assert _get('states', base_url, cache) == [{'state': 'Ohio'}]
+    assert api.statuses() == [200, 304]
+
+
+def test_offline_serves_stale_entries_only(stub):
+    base_url, api = stub
+    api.set('states', [{'state': 'Ohio'}], etag='"v1"')
+    cache = ResponseCache(ttl=0)
+    _get('states', base_url, cache)
+
+    assert _get('states', base_url, cache, offline=True) == [{'state': 'Ohio'}]
+    assert _get('historical/USA?lastdays=all', base_url, cache, offline=True) is None
+    assert api.statuses() == [200]
+
+
+def test_lru_eviction_keeps_recently_used(stub):
+    base_url, api = stub
+    for name in ('a', 'b', 'c'):
+        api.set(name, {'data': name * 100})
+    size = len(api.routes['a'][0])
+    cache = ResponseCache(max_bytes=2 * size)
+
+    _get('a', base_url, cache)
+    _get('b', base_url, cache)
+    _get('a', base_url, cache)   # acierto: 'a' pasa a ser la más reciente
+    _get('c', base_url, cache)
+
+    assert cache.lookup(f"{base_url}/a") is not None
+    assert cache.lookup(f"{base_url}/b") is None
+    assert cache.lookup(f"{base_url}/c") is not None
+    assert cache.total_bytes() <= cache.max_bytes
+    assert not os.path.exists(cache._body_path(cache.key_for(f"{base_url}/b")))
+
+
+def test_oversized_body_is_not_cached(stub):
+    base_url, api = stub
+    api.set('small', {'data': 'x'})
+    api.set('big', {'data': 'x' * 1000})
+    cache = ResponseCache(max_bytes=500)
+
+    _get('small', base_url, cache)
+    assert _get('big', base_url, cache) == {'data': 'x' * 1000}
+    assert cache.lookup(f"{base_url}/big") is None
+    assert cache.lookup(f"{base_url}/small") is not None
+
+
+def test_hits_save_the_index_once(stub):
+    base_url, api = stub
+    api.set('states', [{'state': 'Ohio'}])
+    cache = ResponseCache()
+    _get('states', base_url, cache)
+    with open(cache.index_path, 'rb') as f:
+        saved = f.read()
+
+    for _ in range(5):
+        _get('states', base_url, cache)
+    with open(cache.index_path, 'rb') as f:
+        assert f.read() == saved
+
+    cache.flush()
+    key = cache.key_for(f"{base_url}/states")
+    with open(cache.index_path, encoding='utf-8') as f:
+        assert json.load(f)[key]['last_access'] > json.loads(saved)[key]['last_access']
+
+
+def test_fetch_all_uses_base_url(stub):
+    base_url, api = stub
+    timeline = make_timeline(days=10)
+    api.set('historical/USA?lastdays=all', timeline, etag='"t1"')
+    api.set('states', [{'state': 'Ohio'}], etag='"s1"')
+
+    us_historical, states = fetch_all(base_url=base_url)
+    assert us_historical == timeline and states == [{'state': 'Ohio'}]
+    assert load_raw(US_HISTORICAL_RAW) == timeline and load_raw(STATES_RAW) == states
+
+    # Segunda ejecución: todo desde la caché, también sin red
+    fetch_all(base_url=base_url)
+    assert fetch_all(base_url=base_url, offline=True) == (timeline, [{'state': 'Ohio'}])
+    assert api.statuses() == [200, 200]
+
+
+def test_open_caches_are_not_kept_alive(stub):
+    import gc
+    import weakref
+
+    from covid_eda.cache import _flush_open_caches, _open_caches
+
+    base_url, api = stub
+    api.set('states', [{'state': 'Ohio'}])
+    cache = ResponseCache()
+    _get('states', base_url, cache)
+    _get('states', base_url, cache)
+    assert cache in _open_caches
+
+    # El hook de salida guarda los aciertos pendientes
+    with open(cache.index_path, 'rb') as f:
+        saved = f.read()
+    _flush_open_caches()
+    with open(cache.index_path, 'rb') as f:
+        assert f.read() != saved
+
+    ref = weakref.ref(cache)
+    del cache
+    gc.collect()
+    assert ref() is None
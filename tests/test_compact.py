@@ -0,0 +1,68 @@
+# ==============================================================================
+# TESTS - COMPACTACIÓN DE TIPOS (covid_eda.compact)
+# ==============================================================================
+
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_timeline
+
+from covid_eda.compact import COMPACT_SCHEMAS, compact_frame, memory_bytes
+from covid_eda.storage import read_dataset, save_dataset
+from covid_eda.transform import process_states_data, process_us_data
+
+STATES = [{'state': state, 'updated': 1_600_000_000_000 + i, 'cases': 1_000 * (i + 1) ** 3,
+           'deaths': 17 * (i + 1), 'population': 500_000 * (i + 1), 'todayCases': i}
+          for i, state in enumerate(['Ohio', 'Iowa', 'Texas', 'Utah'])]
+
+
+@pytest.mark.parametrize('name, df', [('us_historical', lambda: process_us_data(make_timeline())),
+                                      ('states', lambda: process_states_data(STATES))])
+def test_values_and_schema_are_preserved(name, df):
+    df = df()
+    compacted = compact_frame(df, name, report=False)
+
+    assert list(compacted.columns) == [column for column in COMPACT_SCHEMAS[name] if column in df.columns]
+    for column, kind in COMPACT_SCHEMAS[name].items():
+        if column not in df.columns:
+            continue
+        series = compacted[column]
+        if kind == 'count':
+            assert series.dtype.kind == 'i'
+            np.testing.assert_array_equal(series.to_numpy(), df[column].to_numpy())
+        elif kind == 'rate':
+            assert series.dtype == np.float32
+            np.testing.assert_allclose(series.to_numpy(), df[column].to_numpy(), rtol=1e-6)
+        elif kind == 'category':
+            assert isinstance(series.dtype, pd.CategoricalDtype)
+            assert series.astype(str).tolist() == df[column].astype(str).tolist()
+        else:
+            assert series.equals(pd.to_datetime(df[column]))
+
+
+def test_long_series_uses_less_memory():
+    df = process_us_data(make_timeline(days=400))
+    assert memory_bytes(compact_frame(df, 'us_historical', report=False)) < memory_bytes(df)
+
+
+def test_smallest_integer_is_chosen():
+    df = process_states_data(STATES)
+    compacted = compact_frame(df, 'states', report=False)
+    assert compacted['deaths'].dtype == np.int8
+    assert compacted['population'].dtype == np.int32
+
+
+def test_lossy_conversions_raise():
+    df = process_states_data(STATES)
+    with pytest.raises(ValueError, match='decimales'):
+        compact_frame(df.assign(cases=df['cases'] + 0.5), 'states', report=False)
+    with pytest.raises(ValueError, match='nulos'):
+        compact_frame(df.assign(deaths=df['deaths'].where(df.index > 0)), 'states', report=False)
+
+
+def test_compacted_frame_round_trips_through_storage():
+    df = compact_frame(process_us_data(make_timeline()), 'us_historical', report=False)
+    save_dataset(df, 'us_historical')
+    stored = read_dataset('us_historical')
+    pd.testing.assert_frame_equal(stored[df.columns].reset_index(drop=True), df.reset_index(drop=True),
+                                  check_dtype=False)
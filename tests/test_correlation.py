@@ -0,0 +1,85 @@
+# ==============================================================================
+# TESTS - MOTOR DE CORRELACIONES (covid_eda.correlation) FRENTE A SCIPY
+# ==============================================================================
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from covid_eda.correlation import clear_memo, compute_correlations, correlation_matrix, pair
+
+
+def _values(n=51, seed=0, nan_fraction=0.0):
+    """Columnas con distinta relación entre sí (lineal, monótona, ruido, empates)"""
+    rng = np.random.default_rng(seed)
+    x = rng.lognormal(10, 1, n)
+    values = np.column_stack([x, 2 * x + rng.normal(0, x.std(), n), np.log(x) + rng.normal(0, 0.3, n),
+                              rng.normal(size=n), rng.integers(0, 5, n).astype(float)])
+    if nan_fraction:
+        values[rng.random(values.shape) < nan_fraction] = np.nan
+    return values
+
+
+def _assert_pairs_equal(result, values, method, scipy_method):
+    columns = values.shape[1]
+    for i in range(columns):
+        for j in range(i + 1, columns):
+            valid = ~np.isnan(values[:, i]) & ~np.isnan(values[:, j])
+            expected = scipy_method(values[valid, i], values[valid, j])
+            assert result[method]['r'][i, j] == pytest.approx(expected[0], abs=1e-5)
+            assert result[method]['p'][i, j] == pytest.approx(expected[1], rel=1e-3, abs=1e-9)
+            assert result['n'][i, j] == valid.sum()
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_pearson_and_spearman_equal_scipy(seed):
+    values = _values(seed=seed)
+    result = compute_correlations(values, bootstrap=0)
+    _assert_pairs_equal(result, values, 'pearson', stats.pearsonr)
+    _assert_pairs_equal(result, values, 'spearman', stats.spearmanr)
+    assert np.all(np.diag(result['pearson']['r']) == 1)
+
+
+def test_pearson_with_missing_values_uses_pairwise_rows():
+    values = _values(n=200, nan_fraction=0.15)
+    result = compute_correlations(values, methods=('pearson',), bootstrap=0)
+    _assert_pairs_equal(result, values, 'pearson', stats.pearsonr)
+
+
+def test_bootstrap_interval_is_reproducible_and_contains_r():
+    values = _values(n=80)
+    first = compute_correlations(values, bootstrap=200, seed=3)
+    second = compute_correlations(values, bootstrap=200, seed=3)
+    for method in ('pearson', 'spearman'):
+        np.testing.assert_array_equal(first[method]['ci_low'], second[method]['ci_low'])
+        off_diagonal = ~np.eye(values.shape[1], dtype=bool)
+        r = first[method]['r'][off_diagonal]
+        assert np.all(first[method]['ci_low'][off_diagonal] <= r + 1e-6)
+        assert np.all(r <= first[method]['ci_high'][off_diagonal] + 1e-6)
+
+
+def test_correlation_matrix_cache_returns_same_values(workdir):
+    values = _values()
+    df = pd.DataFrame(values, columns=['a', 'b', 'c', 'd', 'e'])
+    computed = correlation_matrix(df, list(df.columns), bootstrap=50)
+    clear_memo()
+    cached = correlation_matrix(df, list(df.columns), bootstrap=50)
+
+    assert cached == computed
+    assert len(list((workdir / 'data' / 'cache' / 'correlations').iterdir())) == 1
+    expected = stats.pearsonr(df['a'], df['b'])
+    assert pair(cached, 'a', 'b')['r'] == pytest.approx(expected[0], abs=1e-5)
+
+
+def test_report_line_tolerates_missing_statistics():
+    """El JSON puede traer None en p, el intervalo o ρ (p.ej. columnas constantes)"""
+    from covid_eda.report import _correlation_line
+
+    full = _correlation_line('cases', 'deaths', {'r': 0.9, 'p': 0.0001, 'ci_low': 0.8, 'ci_high': 0.95},
+                             {'r': 0.85})
+    assert 'r = 0.900 [0.800, 0.950], p < 0.001; ρ = 0.850' in full
+
+    missing = _correlation_line('cases', 'deaths', {'r': 0.9, 'p': None, 'ci_low': None, 'ci_high': None},
+                                {'r': None})
+    assert 'r = 0.900, p = n/d; ρ = n/d' in missing
@@ -0,0 +1,68 @@
+# ==============================================================================
+# TESTS - EXPORTADOR DEL DASHBOARD (covid_eda.dashboard)
+# ==============================================================================
+
+import base64
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from covid_eda.dashboard import ASSETS_DIR, _encode_array, export_dashboard, figure_spec
+
+DTYPES = {'i1': np.int8, 'i2': np.int16, 'i4': np.int32, 'f4': np.float32, 'f8': np.float64}
+
+
+def _decode(value):
+    """Lo mismo que hace la página con un typed array"""
+    return np.frombuffer(base64.b64decode(value['b64']), dtype=DTYPES[value['__typed__']])
+
+
+def _figure(df):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df['date'], y=df['cases_7day_avg'], name='media'))
+    fig.add_trace(go.Bar(x=df['date'], y=df['new_cases'], name='casos'))
+    return fig
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'date': pd.date_range('2020-01-22', periods=300),
+                         'new_cases': rng.integers(0, 200_000, 300),
+                         'cases_7day_avg': rng.normal(50_000, 5_000, 300)})
+
+
+def test_typed_arrays_decode_to_the_source_columns():
+    df = _frame()
+    spec = json.loads(figure_spec(_figure(df)))
+    line, bars = spec['data']
+
+    dates = df['date'].to_numpy().astype('datetime64[ms]').astype('int64')
+    np.testing.assert_array_equal(_decode(line['x']), dates)
+    np.testing.assert_array_equal(_decode(line['y']), df['cases_7day_avg'].to_numpy())
+    assert bars['y']['__typed__'] == 'i4'
+    np.testing.assert_array_equal(_decode(bars['y']), df['new_cases'].to_numpy())
+    assert spec['layout']['xaxis']['type'] == 'date'
+
+
+def test_smallest_integer_type_is_chosen():
+    for values, code in (([1, -2, 3], 'i1'), ([300, 0], 'i2'), ([70_000], 'i4'), ([2 ** 40], 'f8')):
+        encoded = _encode_array(np.array(values))
+        assert encoded['__typed__'] == code
+        np.testing.assert_array_equal(_decode(encoded), values)
+    assert _encode_array(np.array(['a', 'b'])) is None
+
+
+def test_export_writes_one_file_per_panel_and_a_shared_plotly(workdir):
+    df = _frame()
+    page = workdir / 'dashboard.html'
+    written = export_dashboard([('cases', _figure(df)), ('again', _figure(df))], str(page), 'COVID')
+
+    panels = workdir / ASSETS_DIR / 'panels'
+    assert sorted(os.listdir(panels)) == ['again.js', 'cases.js']
+    assert len([name for name in os.listdir(workdir / ASSETS_DIR) if name.startswith('plotly-')]) == 1
+    assert str(page) in written
+    assert f'{ASSETS_DIR}/panels/' in page.read_text(encoding='utf-8')
@@ -0,0 +1,60 @@
+# ==============================================================================
+# TESTS - DECIMACIÓN DE SERIES (covid_eda.decimate)
+# ==============================================================================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from covid_eda.decimate import decimate, lttb_indices, minmax_indices
+
+
+def _series(n=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = pd.Series(pd.date_range('2020-01-22', periods=n))
+    y = pd.Series(np.cumsum(rng.normal(0, 10, n)) + 1_000)
+    return x, y
+
+
+def test_lttb_keeps_endpoints_and_global_extrema():
+    x, y = _series()
+    y.iloc[1_234] = 50_000          # pico aislado
+    y.iloc[77] = -50_000
+    indices = lttb_indices(x, y, 200)
+
+    assert len(indices) <= 202
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert {1_234, 77} <= set(indices)
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_skips_nan_and_short_series():
+    x, y = _series(n=50)
+    y.iloc[[0, 10]] = np.nan
+    assert lttb_indices(x, y, 100).tolist() == [i for i in range(50) if i not in (0, 10)]
+    indices = lttb_indices(x, y, 10)
+    assert indices[0] == 1 and 10 not in indices
+
+
+def test_minmax_envelope_keeps_each_bucket_extremes():
+    _, y = _series()
+    n_buckets = 100
+    indices = minmax_indices(y, n_buckets)
+    size = -(-len(y) // n_buckets)
+
+    kept = y.iloc[indices]
+    for start in range(0, len(y), size):
+        bucket = y.iloc[start:start + size]
+        assert bucket.max() in kept.values and bucket.min() in kept.values
+    assert len(indices) <= 2 * n_buckets
+    assert kept.max() == y.max() and kept.min() == y.min()
+
+
+def test_decimate_returns_input_when_short_and_rejects_unknown_method():
+    x, y = _series(n=100)
+    assert decimate(x, y, 500)[1] is y
+    assert decimate(x, y, 500, method='minmax')[1] is y
+    dx, dy = decimate(x, y, 20, method='minmax')
+    assert len(dx) == len(dy) <= 20
+    with pytest.raises(ValueError):
+        decimate(x, y, 20, method='average')
@@ -0,0 +1,97 @@
+# ==============================================================================
+# TESTS - CACHÉ DE FIGURAS (covid_eda.figcache)
+# ==============================================================================
+
+import json
+import os
+
+from covid_eda import figcache
+from covid_eda.figcache import REASON_DATA, REASON_MISSING, REASON_SPEC, RenderManifest, hash_spec
+
+
+def _plot():
+    return True
+
+
+def _helper_v1():
+    return 1
+
+
+def _helper_v2():
+    return 2
+
+
+def test_spec_covers_helpers_and_version(monkeypatch):
+    """Cambiar un helper o FIGURE_SPEC_VERSION cambia la spec de la figura"""
+    args = ('figure', 'figure.png', _plot, {'us': ['date']}, 100, {'palette': 'husl'})
+    base = hash_spec(*args, helpers=(_helper_v1,))
+
+    assert hash_spec(*args, helpers=(_helper_v1,)) == base
+    assert hash_spec(*args, helpers=(_helper_v2,)) != base
+    monkeypatch.setattr(figcache, 'FIGURE_SPEC_VERSION', figcache.FIGURE_SPEC_VERSION + 1)
+    assert hash_spec(*args, helpers=(_helper_v1,)) != base
+
+
+def test_missing_asset_forces_rebuild(workdir):
+    """Una figura con su archivo principal pero sin sus recursos se regenera"""
+    page = workdir / 'dashboard.html'
+    asset = workdir / 'dashboard' / 'plotly-2.0.min.js'
+    os.makedirs(asset.parent)
+    page.write_text('<html></html>')
+    asset.write_text('')
+    assets = [str(workdir / 'dashboard' / 'plotly-*.min.js')]
+
+    manifest = RenderManifest(str(workdir))
+    manifest.record('dashboard', str(page), 'data', 'spec', status='rebuilt')
+    assert manifest.check('dashboard', str(page), 'data', 'spec', assets=assets) is None
+    assert manifest.check('dashboard', str(page), 'data', 'other', assets=assets) == REASON_SPEC
+
+    asset.unlink()
+    assert manifest.check('dashboard', str(page), 'data', 'spec', assets=assets) == REASON_MISSING
+
+
+def _frames():
+    import pandas as pd
+
+    df_us = pd.DataFrame({'date': pd.date_range('2021-01-01', periods=5), 'new_cases': [1, 2, 3, 4, 5]})
+    df_states = pd.DataFrame({'state': ['Ohio', 'Iowa', 'Utah'], 'cases': [10, 20, 30],
+                              'deaths': [1, 2, 3], 'population': [100, 200, 300],
+                              'cases_per_100k': [1.0, 2.0, 3.0], 'deaths_per_100k': [0.1, 0.2, 0.3],
+                              'fatality_rate': [10.0, 10.0, 10.0]})
+    return df_us, df_states
+
+
+def test_render_reuses_unchanged_figures(workdir, monkeypatch):
+    """Sin cambios en las columnas de entrada no se llama a la función de la figura"""
+    from covid_eda import render
+
+    calls = []
+
+    def plot(df_us, df_states, path, dpi=100):
+        calls.append(path)
+        with open(path, 'w') as f:
+            f.write(str(len(calls)))
+        return True
+
+    filename, _, phase = render.FIGURES['correlation_heatmap']
+    monkeypatch.setitem(render.FIGURES, 'correlation_heatmap', (filename, plot, phase))
+    df_us, df_states = _frames()
+
+    def run():
+        return render.render_figures(df_us, df_states, names=['correlation_heatmap'],
+                                     output_dir=str(workdir / 'images'), workers=1)
+
+    paths = run()
+    assert len(calls) == 1
+    assert run() == paths and len(calls) == 1
+
+    # Una columna que la figura no lee no cuenta; una celda de las que lee, sí
+    df_us.loc[0, 'new_cases'] = 100
+    run()
+    assert len(calls) == 1
+    df_states.loc[1, 'deaths'] = 5
+    run()
+    assert len(calls) == 2
+    with open(workdir / 'images' / figcache.MANIFEST_FILE, encoding='utf-8') as f:
+        last_run = json.load(f)['last_run']['figures']
+    assert last_run['correlation_heatmap']['reason'] == REASON_DATA
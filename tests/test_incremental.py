@@ -0,0 +1,113 @@
+# ==============================================================================
+# TESTS - INGESTA INCREMENTAL DEL HISTÓRICO DE EE.UU. (covid_eda.pipeline)
+# ==============================================================================
+
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from conftest import make_timeline, slice_timeline
+
+from covid_eda.compact import compact_frame
+from covid_eda.config import US_HISTORICAL_CSV
+from covid_eda.pipeline import _update_us_incremental
+from covid_eda.storage import has_pyarrow, read_dataset
+from covid_eda.transform import process_us_data, save_clean_data
+
+
+def _full_build(timeline):
+    save_clean_data(compact_frame(process_us_data(timeline), 'us_historical', report=False), None)
+    with open(US_HISTORICAL_CSV, 'rb') as handle:
+        return read_dataset('us_historical'), handle.read()
+
+
+@pytest.mark.parametrize('stored, window_from', [(70, 65), (62, 55), (119, 100)])
+def test_incremental_equals_full_rebuild(stored, window_from):
+    """Añadir la ventana al final guardado da lo mismo que reconstruir la serie"""
+    timeline = make_timeline()
+    expected, expected_csv = _full_build(timeline)
+
+    # Serie guardada hasta `stored` y ventana que solapa desde `window_from` (cruza el año)
+    save_clean_data(compact_frame(process_us_data(slice_timeline(timeline, 0, stored)),
+                                  'us_historical', report=False), None)
+    window = slice_timeline(timeline, window_from, 120)
+    n_new = _update_us_incremental({'us_window_raw': window})
+
+    assert n_new == 120 - stored
+    pd.testing.assert_frame_equal(read_dataset('us_historical'), expected)
+    with open(US_HISTORICAL_CSV, 'rb') as handle:
+        assert handle.read() == expected_csv
+
+
+def test_incremental_picks_up_revisions():
+    """Un día ya guardado que la API revisa se recalcula con sus vecinos"""
+    timeline = make_timeline()
+    save_clean_data(compact_frame(process_us_data(slice_timeline(timeline, 0, 100)),
+                                  'us_historical', report=False), None)
+
+    # La API corrige el día 95 y publica 20 días más
+    revised = make_timeline()
+    day = list(revised['timeline']['cases'])[95]
+    revised['timeline']['cases'][day] += 500
+    window = slice_timeline(revised, 90, 120)
+    _update_us_incremental({'us_window_raw': window})
+    updated = read_dataset('us_historical')
+
+    rebuilt = compact_frame(process_us_data(revised), 'us_historical', report=False)
+    save_clean_data(rebuilt, None)
+    pd.testing.assert_frame_equal(updated, read_dataset('us_historical'))
+
+
+@pytest.mark.skipif(not has_pyarrow(), reason='Parquet requiere pyarrow')
+def test_incremental_rewrites_only_touched_years(workdir):
+    """Las particiones por año anteriores a la ventana no se reescriben"""
+    timeline = make_timeline(start='2020-06-01', days=260)
+    save_clean_data(compact_frame(process_us_data(slice_timeline(timeline, 0, 250)),
+                                  'us_historical', report=False), None)
+    partition = workdir / 'data' / 'parquet' / 'us_historical' / 'year=2020'
+    before = {path.name: path.stat().st_mtime_ns for path in partition.iterdir()}
+
+    _update_us_incremental({'us_window_raw': slice_timeline(timeline, 245, 260)})
+
+    assert {path.name: path.stat().st_mtime_ns for path in partition.iterdir()} == before
+
+
+def test_csv_only_series_gets_a_full_parquet_dataset(workdir):
+    """Con sólo el CSV guardado (p.ej. el del repositorio), el Parquet se escribe completo"""
+    timeline = make_timeline()
+    expected, expected_csv = _full_build(timeline)
+    save_clean_data(compact_frame(process_us_data(slice_timeline(timeline, 0, 100)),
+                                  'us_historical', report=False), None)
+    shutil.rmtree(workdir / 'data' / 'parquet')
+
+    _update_us_incremental({'us_window_raw': slice_timeline(timeline, 95, 120)})
+
+    pd.testing.assert_frame_equal(read_dataset('us_historical'), expected)
+    with open(US_HISTORICAL_CSV, 'rb') as handle:
+        assert handle.read() == expected_csv
+
+
+def test_without_stored_series_falls_back():
+    """Sin serie guardada no hay nada que actualizar: el pipeline hace la descarga completa"""
+    assert _update_us_incremental({'us_window_raw': make_timeline(days=10)}) is None
+
+
+def test_legacy_csv_is_upgraded_once(workdir, monkeypatch):
+    """Un CSV de una versión anterior (sin métricas derivadas) se completa al leerlo, una sola vez"""
+    from covid_eda import storage
+
+    timeline = make_timeline()
+    expected = process_us_data(timeline)
+    os.makedirs(os.path.dirname(US_HISTORICAL_CSV), exist_ok=True)
+    expected[['date', 'cases', 'deaths']].to_csv(US_HISTORICAL_CSV, index=False)
+
+    df = read_dataset('us_historical')
+    pd.testing.assert_frame_equal(df[expected.columns], expected, check_dtype=False)
+    assert 'cases_7day_avg' in pd.read_csv(US_HISTORICAL_CSV, nrows=0).columns
+
+    # Las lecturas siguientes del proceso no vuelven a mirar el esquema guardado
+    calls = []
+    monkeypatch.setattr(storage, 'dataset_columns', lambda *args: calls.append(args) or [])
+    read_dataset('us_historical', columns=['date'])
+    assert calls == []
@@ -0,0 +1,80 @@
+# ==============================================================================
+# TESTS - INGESTA CONCURRENTE (covid_eda.ingest) CONTRA EL SERVIDOR LOCAL
+# ==============================================================================
+
+import time
+
+from covid_eda.ingest import RateLimiter, fetch_country_histories
+
+
+def _record(country, days=3):
+    keys = [f"1/{day}/21" for day in range(1, days + 1)]
+    return {'country': country, 'timeline': {'cases': dict.fromkeys(keys, 1),
+                                             'deaths': dict.fromkeys(keys, 0)}}
+
+
+def _histories(base_url, countries, batch_size):
+    return fetch_country_histories(countries, batch_size=batch_size, base_url=base_url,
+                                   max_workers=2, retries=0)
+
+
+def test_countries_missing_from_a_batch_are_retried_one_by_one(stub):
+    base_url, api = stub
+    # La API devuelve el lote sin 'Chile' (y con otro nombre en mayúsculas)
+    api.set('historical/Spain,Chile,france?lastdays=all', [_record('Spain'), _record('France')])
+    api.set('historical/Chile?lastdays=all', _record('Chile'))
+
+    histories = _histories(base_url, ['Spain', 'Chile', 'france'], batch_size=3)
+    assert sorted(histories) == ['Chile', 'France', 'Spain']
+    assert [path for path, _ in api.requests] == ['historical/Spain,Chile,france?lastdays=all',
+                                                  'historical/Chile?lastdays=all']
+
+
+def test_failed_batch_is_retried_one_by_one(stub):
+    base_url, api = stub
+    # El lote da 404 (un nombre desconocido lo tumba): se recuperan los demás
+    api.set('historical/Spain?lastdays=all', _record('Spain'))
+    api.set('historical/Chile?lastdays=all', _record('Chile'))
+
+    histories = _histories(base_url, ['Spain', 'Chile', 'Atlantis'], batch_size=3)
+    assert sorted(histories) == ['Chile', 'Spain']
+    assert sorted(path for path, status in api.requests if status == 200) == [
+        'historical/Chile?lastdays=all', 'historical/Spain?lastdays=all']
+
+
+def test_complete_batches_are_not_retried(stub):
+    base_url, api = stub
+    api.set('historical/Spain,Chile?lastdays=all', [_record('Spain'), _record('Chile')])
+    api.set('historical/Peru?lastdays=all', _record('Peru'))
+
+    assert sorted(_histories(base_url, ['Spain', 'Chile', 'Peru'], batch_size=2)) == [
+        'Chile', 'Peru', 'Spain']
+    assert len(api.requests) == 2
+
+
+def test_rate_limiter_spaces_requests_after_the_burst():
+    limiter = RateLimiter(rate=50, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.05
+
+    for _ in range(10):
+        limiter.acquire()
+    # 10 peticiones más a 50/s: al menos 0.2 s
+    assert time.monotonic() - start >= 0.19
+
+
+def test_rate_limiter_is_shared_between_threads():
+    import threading
+
+    limiter = RateLimiter(rate=100, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=lambda: [limiter.acquire() for _ in range(5)])
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 20 tokens con ráfaga de 1 a 100/s: ~0.19 s en total, no 0.04 s por hilo
+    assert time.monotonic() - start >= 0.18
@@ -0,0 +1,86 @@
+# ==============================================================================
+# TESTS - INSTRUMENTACIÓN DEL PIPELINE (covid_eda.instrument)
+# ==============================================================================
+
+import json
+
+import pytest
+from conftest import make_timeline
+
+from covid_eda.config import RUN_MANIFEST
+from covid_eda.pipeline import run_pipeline
+
+STAGES = ['fetch', 'transform', 'analyze']
+STATES = [{'state': state, 'updated': 1_600_000_000_000, 'cases': 1_000 * (i + 1) ** 2,
+           'deaths': 20 * (i + 1) + i ** 2, 'recovered': 0, 'population': 400_000 * (i + 1)}
+          for i, state in enumerate(['Ohio', 'Iowa', 'Texas', 'Utah'])]
+
+
+@pytest.fixture
+def api(stub):
+    base_url, api = stub
+    api.set('historical/USA?lastdays=all', make_timeline())
+    api.set('states', STATES)
+    return base_url
+
+
+def _events(manifest):
+    with open(manifest['events'], encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_manifest_has_one_event_per_stage(api):
+    ctx = run_pipeline(stages=STAGES, base_url=api, use_cache=False)
+    manifest = ctx['run_manifest']
+
+    with open(RUN_MANIFEST, encoding='utf-8') as f:
+        assert json.load(f)['run_id'] == manifest['run_id']
+    assert manifest['status'] == 'ok'
+    assert list(manifest['stages']) == STAGES
+    stage_events = [event['name'] for event in _events(manifest) if event['kind'] == 'stage']
+    assert stage_events == STAGES
+    for metrics in manifest['stages'].values():
+        assert metrics['status'] == 'ok' and metrics['wall_s'] >= 0 and metrics['cpu_s'] >= 0
+
+    # La ejecución siguiente se compara con esta
+    second = run_pipeline(stages=['transform'], base_url=api, use_cache=False)['run_manifest']
+    assert second['previous_run'] == manifest['run_id']
+    assert list(second['vs_previous']) == ['transform']
+
+
+def test_failed_stage_is_recorded(api, monkeypatch):
+    from covid_eda import pipeline
+
+    def broken(ctx):
+        raise RuntimeError('boom')
+
+    monkeypatch.setitem(pipeline.STAGE_FUNCTIONS, 'analyze', broken)
+    with pytest.raises(RuntimeError):
+        run_pipeline(stages=STAGES, base_url=api, use_cache=False)
+
+    with open(RUN_MANIFEST, encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert manifest['status'] == 'error'
+    assert {name: metrics['status'] for name, metrics in manifest['stages'].items()} == {
+        'fetch': 'ok', 'transform': 'ok', 'analyze': 'error'}
+
+
+def test_profiles_are_listed_per_stage(api):
+    import os
+    import pstats
+
+    manifest = run_pipeline(stages=STAGES, base_url=api, use_cache=False,
+                            profile='cprofile', profile_memory=True)['run_manifest']
+
+    assert list(manifest['profiles']) == STAGES
+    for stage, files in manifest['profiles'].items():
+        assert all(os.path.exists(path) for path in files)
+        assert pstats.Stats(files[0]).total_calls > 0
+        if stage in ('transform', 'analyze'):
+            assert [os.path.basename(path) for path in files] == [
+                f'{stage}.prof', f'{stage}.tracemalloc', f'{stage}.alloc.folded']
+            with open(files[2], encoding='utf-8') as f:
+                stack, size = f.readline().rstrip('\n').rsplit(' ', 1)
+            assert stack and int(size) > 0
+        else:
+            assert len(files) == 1
@@ -0,0 +1,71 @@
+# ==============================================================================
+# TESTS - KERNEL DE MÉTRICAS DERIVADAS (covid_eda.metrics) FRENTE A PANDAS
+# ==============================================================================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from covid_eda.metrics import derived_metrics
+
+
+def _long_frame(lengths, seed=0):
+    """Regiones de longitudes dadas, con las filas de las regiones intercaladas"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, length in enumerate(lengths):
+        cases = np.cumsum(rng.integers(0, 1_000, length))
+        deaths = np.cumsum(rng.integers(0, 20, length))
+        # Algún acumulado a cero para cubrir los casos sin crecimiento definido
+        cases[:min(2, length)] = 0
+        frames.append(pd.DataFrame({'region': f'r{i}',
+                                    'date': pd.date_range('2021-01-01', periods=length),
+                                    'cases': cases, 'deaths': deaths}))
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values(['date', 'region'], kind='stable').reset_index(drop=True)
+
+
+def _reference(df, by, window, trailing_window, growth_window):
+    """Las mismas métricas con groupby/rolling de pandas, región a región"""
+    out = {}
+    groups = df.groupby(by, sort=False) if by else [(None, df)]
+    for _, group in groups:
+        for column in ('cases', 'deaths'):
+            values = group[column].astype('float64')
+            new = values.diff().fillna(0)
+            previous = values.shift(growth_window)
+            ratio = (values / previous).where((previous > 0) & (values > 0))
+            columns = {
+                f'new_{column}': new,
+                f'{column}_{window}day_avg': new.rolling(window, center=True).mean(),
+                f'{column}_{trailing_window}day_trailing_avg': new.rolling(trailing_window).mean(),
+                f'{column}_growth_rate': (ratio ** (1 / growth_window) - 1) * 100,
+                f'{column}_doubling_time': (growth_window * np.log(2) / np.log(ratio)).where(ratio > 1),
+            }
+            for name, series in columns.items():
+                out.setdefault(name, []).append(series)
+    return {name: pd.concat(parts).sort_index() for name, parts in out.items()}
+
+
+@pytest.mark.parametrize('lengths', [[40], [1, 2, 3, 6, 7, 8, 30], [5, 5, 5]])
+@pytest.mark.parametrize('window, trailing_window, growth_window', [(7, 7, 7), (4, 3, 5), (1, 1, 1)])
+def test_kernel_equals_pandas_rolling(lengths, window, trailing_window, growth_window):
+    df = _long_frame(lengths)
+    by = 'region' if len(lengths) > 1 else None
+    result = derived_metrics(df.copy(), by=by, window=window, trailing_window=trailing_window,
+                             growth_window=growth_window)
+    expected = _reference(df, by, window, trailing_window, growth_window)
+
+    for name, series in expected.items():
+        np.testing.assert_allclose(result[name].to_numpy(dtype='float64'), series.to_numpy(),
+                                   rtol=1e-5, equal_nan=True, err_msg=name)
+    np.testing.assert_allclose(result['fatality_rate'],
+                               (df['deaths'] / df['cases'] * 100).fillna(0), rtol=1e-5)
+
+
+def test_series_shorter_than_window_is_all_nan():
+    df = _long_frame([3])
+    result = derived_metrics(df.copy(), window=7)
+    assert result['cases_7day_avg'].isna().all()
+    assert result['cases_7day_trailing_avg'].isna().all()
+    assert result['new_cases'].tolist() == df['cases'].diff().fillna(0).astype('int64').tolist()
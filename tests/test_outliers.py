@@ -0,0 +1,89 @@
+# ==============================================================================
+# TESTS - MOTOR DE OUTLIERS (covid_eda.outliers) FRENTE A PANDAS
+# ==============================================================================
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from covid_eda.outliers import MAD_SCALE, METHODS, MODIFIED_Z_SCALE, detect_outliers
+
+
+def _frame(seed=0):
+    """Columnas con colas pesadas, NaN sueltos, una constante y una vacía"""
+    rng = np.random.default_rng(seed)
+    n = 300
+    df = pd.DataFrame({
+        'region': rng.choice(['a', 'b', 'c', 'd'], n),
+        'cases': rng.standard_t(2, n) * 1_000,
+        'deaths': rng.lognormal(3, 1, n),
+        'flat': np.full(n, 5.0),
+        'empty': np.full(n, np.nan),
+    })
+    df.loc[rng.choice(n, 20, replace=False), 'cases'] = np.nan
+    # Un grupo de una sola fila
+    df.loc[n] = ['e', 1.0, 2.0, 5.0, np.nan]
+    return df
+
+
+def _reference(series, iqr_k=1.5, z_threshold=2, mad_threshold=3, modified_z_threshold=3.5):
+    """Máscaras de una serie con los estadísticos de pandas"""
+    q1, median, q3 = series.quantile([0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    std = series.std(ddof=0)
+    deviation = (series - median).abs()
+    mad = deviation.median()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'iqr': (series < q1 - iqr_k * iqr) | (series > q3 + iqr_k * iqr),
+            'zscore': ((series - series.mean()).abs() / std > z_threshold) if std > 0 else series * False,
+            'mad': (deviation / (MAD_SCALE * mad) > mad_threshold) if mad > 0 else series * False,
+            'modified_z': (MODIFIED_Z_SCALE * deviation / mad > modified_z_threshold)
+            if mad > 0 else series * False,
+        }
+
+
+def _check(masks, expected, method, column):
+    np.testing.assert_array_equal(masks[(method, column)].to_numpy(),
+                                  expected.fillna(False).astype(bool).to_numpy(),
+                                  err_msg=f"{method}/{column}")
+
+
+# La mediana de pandas de la columna vacía avisa de 'Mean of empty slice'
+@pytest.mark.filterwarnings('ignore:Mean of empty slice')
+def test_ungrouped_equals_pandas():
+    df = _frame()
+    columns = ['cases', 'deaths', 'flat', 'empty']
+    masks, stats = detect_outliers(df, columns=columns)
+
+    for column in columns:
+        expected = _reference(df[column])
+        for method in METHODS:
+            _check(masks, expected[method], method, column)
+        assert stats.loc[column, 'median'] == pytest.approx(df[column].median(), nan_ok=True)
+        assert stats.loc[column, 'q1'] == pytest.approx(df[column].quantile(0.25), nan_ok=True)
+        assert stats.loc[column, 'count'] == df[column].count()
+
+
+def test_grouped_equals_pandas_groupby():
+    df = _frame(seed=1)
+    columns = ['cases', 'deaths', 'flat']
+    masks, stats = detect_outliers(df, columns=columns, by='region')
+
+    for column in columns:
+        for method in METHODS:
+            expected = pd.concat([_reference(group[column])[method]
+                                  for _, group in df.groupby('region', sort=False)]).reindex(df.index)
+            _check(masks, expected, method, column)
+        medians = df.groupby('region', sort=False)[column].median()
+        np.testing.assert_allclose(stats.xs(column, level='column')['median'].to_numpy(),
+                                   medians.to_numpy())
+
+
+def test_thresholds_are_applied():
+    df = _frame(seed=2)
+    masks, _ = detect_outliers(df, columns=['deaths'], methods=('iqr', 'zscore'), iqr_k=3, z_threshold=3)
+    expected = _reference(df['deaths'], iqr_k=3, z_threshold=3)
+    _check(masks, expected['iqr'], 'iqr', 'deaths')
+    _check(masks, expected['zscore'], 'zscore', 'deaths')
+    assert list(masks.columns.get_level_values('method').unique()) == ['iqr', 'zscore']
@@ -0,0 +1,83 @@
+# ==============================================================================
+# TESTS - CONSULTAS POR LOTES (covid_eda.query) FRENTE A PANDAS
+# ==============================================================================
+#
+# Con batch_rows pequeño cada consulta combina muchos lotes parciales: el
+# resultado tiene que ser el mismo que el de pandas sobre el dataset entero.
+
+import pandas as pd
+import pytest
+from conftest import make_timeline
+
+from covid_eda.query import aggregate, parse_where, query, ranking, top, windowed
+from covid_eda.storage import read_dataset, save_dataset
+from covid_eda.transform import process_country_histories
+
+NAME = 'countries_historical'
+BATCH = 97
+REGIONS = ['Chile', 'Italy', 'Peru', 'Spain']
+
+
+@pytest.fixture
+def stored(workdir):
+    """Histórico de cuatro países que cruza un cambio de año"""
+    histories = {region: make_timeline(start='2020-10-01', days=200, seed=seed)['timeline']
+                 for seed, region in enumerate(REGIONS)}
+    save_dataset(process_country_histories(histories), NAME)
+    return read_dataset(NAME)
+
+
+def test_aggregate_matches_pandas(stored):
+    metrics = ['cases', 'new_cases', 'fatality_rate']
+    result = aggregate(NAME, metrics, by=['region'], batch_rows=BATCH)
+    expected = stored.groupby('region', observed=True)[metrics].agg(['count', 'sum', 'mean', 'min', 'max'])
+    expected.columns = [f'{metric}_{how}' for metric, how in expected.columns]
+    expected = expected.reset_index()
+    expected['region'] = expected['region'].astype(str)
+    result['region'] = result['region'].astype(str)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+    total = aggregate(NAME, ['deaths'], how=('sum', 'max'), batch_rows=BATCH)
+    assert total.iloc[0].tolist() == [stored['deaths'].sum(), stored['deaths'].max()]
+
+
+def test_windowed_matches_pandas(stored):
+    result = windowed(NAME, ['new_cases'], freq='M', how=('mean', 'sum'), batch_rows=BATCH)
+    period = stored['date'].dt.to_period('M').dt.start_time.rename('period')
+    expected = stored.groupby([stored['region'].astype(str), period])['new_cases'].agg(['mean', 'sum'])
+    expected = expected.add_prefix('new_cases_').reset_index()
+    result['region'] = result['region'].astype(str)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_ranking_matches_pandas(stored):
+    result = ranking(NAME, 'cases', k=3, batch_rows=BATCH)
+    last = stored.sort_values('date').drop_duplicates('region', keep='last')
+    expected = last.nlargest(3, 'cases')
+    assert result['region'].astype(str).tolist() == expected['region'].astype(str).tolist()
+    assert result['cases'].tolist() == expected['cases'].tolist()
+
+
+def test_top_matches_pandas_up_to_ties(stored):
+    k = 25
+    result = top(NAME, 'new_cases', k=k, batch_rows=BATCH)
+    expected = stored.nlargest(k, 'new_cases')
+    # Mismos valores; entre empates el orden (y la fila elegida) puede cambiar
+    assert result['new_cases'].tolist() == expected['new_cases'].tolist()
+    keys = set(zip(stored['region'].astype(str), stored['date'], stored['new_cases']))
+    assert all(row in keys for row in zip(result['region'].astype(str), result['date'], result['new_cases']))
+
+    lowest = top(NAME, 'fatality_rate', k=k, ascending=True, batch_rows=BATCH)
+    assert lowest['fatality_rate'].tolist() == stored.nsmallest(k, 'fatality_rate')['fatality_rate'].tolist()
+
+
+def test_parse_where_in_and_not_in(stored):
+    assert parse_where(NAME, 'region in Spain, Italy') == ('region', 'in', ['Spain', 'Italy'])
+    assert parse_where(NAME, 'region not in Peru') == ('region', 'not in', ['Peru'])
+    assert parse_where(NAME, 'cases >= 10') == ('cases', '>=', 10)
+    with pytest.raises(ValueError):
+        parse_where(NAME, 'region among Spain')
+
+    kept = query(NAME, ['region'], [parse_where(NAME, 'region not in Peru,Chile')], batch_rows=BATCH)
+    assert sorted(kept['region'].astype(str).unique()) == ['Italy', 'Spain']
+    assert len(kept) == (~stored['region'].isin(['Peru', 'Chile'])).sum()
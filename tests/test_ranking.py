@@ -0,0 +1,92 @@
+# ==============================================================================
+# TESTS - ÍNDICE DE RANKINGS (covid_eda.ranking) FRENTE A FUERZA BRUTA
+# ==============================================================================
+#
+# Tras cada foto (pocas regiones cambiadas: recolocación con searchsorted;
+# muchas: reordenación completa) el índice debe responder lo mismo que
+# ordenar desde cero con pandas.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from covid_eda.ranking import RankingIndex
+
+METRICS = ['cases', 'rate']
+
+
+def _snapshot(keys, rng):
+    """Foto con empates (valores enteros pequeños) y algún NaN"""
+    frame = pd.DataFrame({'state': keys,
+                          'cases': rng.integers(0, 40, len(keys)).astype(float),
+                          'rate': rng.normal(size=len(keys))})
+    frame.loc[rng.random(len(keys)) < 0.05, 'rate'] = np.nan
+    return frame
+
+
+def _assert_matches(index, current):
+    """Comparar el índice con rankings calculados desde cero sobre `current`"""
+    current = current.set_index('state').loc[list(index.keys)]
+    for metric in METRICS:
+        values = current[metric]
+        expected_ranks = values.rank(method='min', ascending=False)
+        np.testing.assert_array_equal(index.ranks(metric), expected_ranks.to_numpy())
+
+        valid = values.dropna()
+        expected_pct = values.apply(lambda v: (valid <= v).sum() / len(valid) * 100).where(values.notna())
+        np.testing.assert_allclose(index.percentiles(metric).to_numpy(), expected_pct.to_numpy())
+
+        for ascending in (False, True):
+            top = index.top(metric, k=10, ascending=ascending)
+            expected = valid.sort_values(ascending=ascending).head(10)
+            np.testing.assert_array_equal(top[metric].to_numpy(), expected.to_numpy())
+            np.testing.assert_array_equal(top[metric].to_numpy(), values.loc[top['state']].to_numpy())
+            np.testing.assert_array_equal(top['rank'].to_numpy(),
+                                          expected_ranks.loc[top['state']].to_numpy())
+
+        where = [('cases', '>=', 20), ('state', 'not in', ['s0', 's1'])]
+        filtered = valid[(current.loc[valid.index, 'cases'] >= 20) & ~valid.index.isin(['s0', 's1'])]
+        top = index.top(metric, k=5, where=where)
+        np.testing.assert_array_equal(top[metric].to_numpy(),
+                                      filtered.sort_values(ascending=False).head(5).to_numpy())
+
+        key = index.keys[3]
+        assert index.rank(key, metric) == (None if np.isnan(values[key]) else expected_ranks[key])
+
+
+@pytest.mark.parametrize('changed', [1, 3, 60])
+def test_updates_match_brute_force(changed):
+    rng = np.random.default_rng(changed)
+    keys = [f"s{i}" for i in range(60)]
+    current = _snapshot(keys, rng)
+    index = RankingIndex(current, 'state', METRICS, label='d0')
+    _assert_matches(index, current)
+
+    history = {'d0': current.copy()}
+    for day in range(1, 15):
+        rows = rng.choice(len(current), changed, replace=False)
+        current.loc[rows, METRICS] = _snapshot(current['state'].iloc[rows].tolist(), rng)[METRICS].to_numpy()
+        if day == 7:
+            # Una región nueva a mitad del histórico
+            current = pd.concat([current, _snapshot(['new'], rng)], ignore_index=True)
+        index.update(current.iloc[rng.permutation(len(current))], label=f"d{day}")
+        history[f"d{day}"] = current.copy()
+        _assert_matches(index, current)
+
+    for since in ('d0', 'd10', None):
+        label = since or 'd13'
+        before = history[label].set_index('state')['cases'].rank(method='min', ascending=False)
+        now = current.set_index('state')['cases'].rank(method='min', ascending=False)
+        expected = (before.reindex(now.index) - now).dropna()
+        changes = index.rank_changes('cases', since=since).set_index('state')['change']
+        pd.testing.assert_series_equal(changes.sort_index(), expected.sort_index(), check_names=False)
+
+
+def test_from_history_equals_last_day():
+    rng = np.random.default_rng(7)
+    days = pd.date_range('2021-01-01', periods=5)
+    frames = [_snapshot([f"s{i}" for i in range(20)], rng).assign(date=day) for day in days]
+    index = RankingIndex.from_history(pd.concat(frames, ignore_index=True), 'state', METRICS)
+
+    assert index.labels == [day.date().isoformat() for day in days]
+    _assert_matches(index, frames[-1].drop(columns='date'))
@@ -0,0 +1,89 @@
+# ==============================================================================
+# TESTS - HISTÓRICO DE FOTOS DEL ENDPOINT STATES (covid_eda.snapshots)
+# ==============================================================================
+
+import os
+
+from covid_eda.snapshots import INDEX_FILE, SnapshotStore
+from covid_eda.transform import process_states_data
+
+STATES = ['Ohio', 'Iowa', 'Texas']
+
+
+def _records(updated, states=STATES):
+    """Respuesta cruda del endpoint states publicada en el instante `updated`"""
+    return [{'state': state, 'updated': updated + i, 'cases': 1_000 * (i + 1) + updated,
+             'deaths': 10 * (i + 1), 'population': 1_000_000 * (i + 1)}
+            for i, state in enumerate(states)]
+
+
+def _on_disk(store):
+    return sorted(name for name in os.listdir(store.path) if name != INDEX_FILE)
+
+
+def test_unchanged_snapshot_is_deduplicated(workdir):
+    store = SnapshotStore(path=str(workdir / 'snapshots'))
+    first = _records(1_000)
+    assert store.append(process_states_data(first)) == 3
+    assert store.append(process_states_data(first)) == 0
+    assert store.rows == 3 and store.segments == 1
+
+    # Sólo cambia un estado: sólo se guarda esa fila
+    second = first[:2] + _records(5_000, ['Texas'])
+    assert store.append(process_states_data(second)) == 1
+    history = store.history()
+    assert len(history) == 4
+    assert history[history['state'] == 'Texas']['updated'].tolist() == [1_002, 5_000]
+
+
+def test_has_new_only_checks_the_index(workdir):
+    store = SnapshotStore(path=str(workdir / 'snapshots'))
+    records = _records(1_000)
+    assert store.has_new(records)
+    store.append(process_states_data(records))
+
+    assert not store.has_new(records)
+    assert not store.has_new([])
+    assert store.has_new(_records(2_000, ['Iowa']))
+    assert store.has_new(_records(0, ['Utah']))
+
+    # Otra instancia sobre el mismo directorio ve lo mismo
+    reopened = SnapshotStore(path=store.path)
+    assert not reopened.has_new(records)
+    assert reopened.last_updated() == store.last_updated()
+
+
+def test_background_compaction_alongside_appends(workdir):
+    store = SnapshotStore(path=str(workdir / 'snapshots'), compact_segments=3)
+    for step in range(30):
+        store.append(process_states_data(_records(1_000 * (step + 1))))
+        if step == 10:
+            store.compact_in_background()
+    store.wait()
+    store.compact()
+
+    assert store.rows == 90 and store.segments == 0
+    history = store.history()
+    assert len(history) == 90
+    assert not history.duplicated(['state', 'updated']).any()
+    assert history.groupby('state')['updated'].is_monotonic_increasing.all()
+    assert _on_disk(store) == [entry['name'] for entry in store.index['files']]
+
+
+def test_orphaned_segments_are_removed_on_open(workdir):
+    store = SnapshotStore(path=str(workdir / 'snapshots'))
+    store.append(process_states_data(_records(1_000)))
+    names = [entry['name'] for entry in store.index['files']]
+
+    # Una ingesta interrumpida deja un segmento (y un tmp) que el índice no conoce
+    for orphan in (f"seg-000099.{store.extension}", f"seg-000100.{store.extension}.tmp"):
+        with open(os.path.join(store.path, orphan), 'w') as f:
+            f.write('state,updated\nUtah,1\n')
+    # Otros archivos del directorio no se tocan
+    with open(os.path.join(store.path, 'notes.txt'), 'w') as f:
+        f.write('keep me')
+
+    reopened = SnapshotStore(path=store.path)
+    assert _on_disk(reopened) == sorted(names + ['notes.txt'])
+    assert reopened.rows == 3
+    assert 'Utah' not in reopened.history()['state'].tolist()
@@ -0,0 +1,50 @@
+# ==============================================================================
+# TESTS - PROCESAMIENTO POR TROZOS (covid_eda.stream) FRENTE AL DE MEMORIA
+# ==============================================================================
+
+import pandas as pd
+import pytest
+from conftest import make_timeline
+
+from covid_eda.config import US_HISTORICAL_CSV
+from covid_eda.storage import read_dataset, save_dataset
+from covid_eda.stream import iter_regional_chunks, iter_timeline_chunks, stream_metrics, stream_to_dataset
+from covid_eda.transform import process_country_histories, process_us_data
+
+
+def _histories():
+    """Regiones de longitudes distintas (alguna más corta que la ventana)"""
+    lengths = {'Spain': 90, 'Peru': 45, 'Chad': 5, 'Fiji': 1}
+    return {region: make_timeline(start='2020-12-15', days=days, seed=i)['timeline']
+            for i, (region, days) in enumerate(lengths.items())}
+
+
+@pytest.mark.parametrize('chunk_days', [1, 3, 7, 50, 500])
+def test_stream_equals_in_memory(chunk_days):
+    timeline = make_timeline()
+    streamed = pd.concat(stream_metrics(iter_timeline_chunks(timeline, chunk_days)), ignore_index=True)
+    pd.testing.assert_frame_equal(streamed, process_us_data(timeline))
+
+
+@pytest.mark.parametrize('chunk_days', [1, 4, 30])
+def test_regional_stream_equals_in_memory(chunk_days):
+    histories = _histories()
+    streamed = pd.concat(stream_metrics(iter_regional_chunks(histories, chunk_days), by='region'),
+                         ignore_index=True)
+    streamed = streamed.sort_values(['region', 'date'], kind='stable').reset_index(drop=True)
+    pd.testing.assert_frame_equal(streamed, process_country_histories(histories))
+
+
+def test_stream_to_dataset_equals_saved_dataset(workdir):
+    timeline = make_timeline(start='2020-10-01', days=200)
+    save_dataset(process_us_data(timeline), 'us_historical', export_csv=True)
+    expected = read_dataset('us_historical')
+    with open(US_HISTORICAL_CSV, 'rb') as f:
+        expected_csv = f.read()
+
+    rows = stream_to_dataset(iter_timeline_chunks(timeline, 30), 'us_historical', export_csv=True)
+
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(read_dataset('us_historical'), expected)
+    with open(US_HISTORICAL_CSV, 'rb') as f:
+        assert f.read() == expected_csv
@@ -0,0 +1,75 @@
+# ==============================================================================
+# TESTS - RESUMEN ESTADÍSTICO (covid_eda.summary)
+# ==============================================================================
+
+import json
+
+import pytest
+from conftest import make_timeline
+
+from covid_eda import summary as summary_module
+from covid_eda.summary import SUMMARY_VERSION, build_summary, load_summary
+from covid_eda.transform import process_states_data, process_us_data
+
+STATES = [{'state': state, 'updated': 1_600_000_000_000, 'cases': 1_000 * (i + 1) ** 2 + 37 * i,
+           'deaths': 20 * (i + 1) + i ** 2, 'recovered': 500 * (i + 1), 'population': 400_000 * (i + 1)}
+          for i, state in enumerate(['Ohio', 'Iowa', 'Texas', 'Utah', 'Maine', 'Idaho'])]
+
+
+@pytest.fixture
+def frames():
+    return process_us_data(make_timeline()), process_states_data(STATES)
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    """Llamadas a compute_summary (la parte cara del resumen)"""
+    calls = []
+    original = summary_module.compute_summary
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(summary_module, 'compute_summary', counting)
+    return calls
+
+
+def test_unchanged_inputs_reuse_the_stored_summary(frames, computed, workdir):
+    df_us, df_states = frames
+    path = str(workdir / 'summary.json')
+    first = build_summary(df_us, df_states, path)
+    assert len(computed) == 1 and load_summary(path) == first
+
+    # Columnas que el resumen no lee no cuentan
+    assert build_summary(df_us.assign(cases_7day_avg=0.0), df_states.copy(), path) == first
+    assert len(computed) == 1
+
+
+@pytest.mark.parametrize('change', ['us', 'states'])
+def test_one_changed_input_recomputes(frames, computed, workdir, change):
+    df_us, df_states = frames
+    path = str(workdir / 'summary.json')
+    first = build_summary(df_us, df_states, path)
+
+    if change == 'us':
+        df_us = df_us.copy()
+        df_us.loc[df_us.index[-1], 'new_deaths'] += 1
+    else:
+        df_states = df_states.copy()
+        df_states.loc[df_states.index[0], 'population'] += 1
+    second = build_summary(df_us, df_states, path)
+    assert len(computed) == 2
+    assert second['inputs_hash'] != first['inputs_hash']
+    assert load_summary(path)['inputs_hash'] == second['inputs_hash']
+
+
+def test_other_versions_are_ignored(frames, computed, workdir):
+    df_us, df_states = frames
+    path = workdir / 'summary.json'
+    stored = build_summary(df_us, df_states, str(path))
+    path.write_text(json.dumps({**stored, 'version': SUMMARY_VERSION - 1}), encoding='utf-8')
+
+    assert load_summary(str(path)) is None
+    build_summary(df_us, df_states, str(path))
+    assert len(computed) == 2